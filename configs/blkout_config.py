@@ -3,55 +3,65 @@ BLKOUT Research Agent Configuration
 Optimized for Black LGBTQ+ UK community content discovery
 """
 
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Sequence, Tuple, FrozenSet
+
+import ahocorasick
+
+from .frozen import build_keyword_automaton, freeze, freeze_keywords
+
 # =============================================================================
 # MODEL CONFIGURATION - Using Groq Free Tier
 # =============================================================================
 
-llm_config = {
+llm_config = freeze({
     "provider": "groq",
     "model": "llama-3.3-70b-versatile",  # Best free model on Groq
     "fallback_model": "llama-3.1-8b-instant",  # Faster, for simple tasks
     "temperature": 0.3,  # Lower for factual research
     "max_tokens": 4096,
-}
+})
 
 # =============================================================================
 # AGENT CONFIGURATION
 # =============================================================================
 
-planning_agent_config = {
+planning_agent_config = freeze({
     "name": "blkout_planner",
     "description": "Coordinates news and events research for Black LGBTQ+ UK community",
     "max_steps": 10,
     "model": "llama-3.3-70b-versatile",
-}
+})
 
-researcher_agent_config = {
+researcher_agent_config = freeze({
     "name": "blkout_researcher",
     "description": "Deep research on Black queer UK topics",
     "max_depth": 2,
     "max_results_per_search": 10,
     "model": "llama-3.3-70b-versatile",
-}
+})
 
-scraper_agent_config = {
+scraper_agent_config = freeze({
     "name": "blkout_scraper",
     "description": "Extracts structured event data from websites",
     "timeout": 30,
     "model": "llama-3.1-8b-instant",  # Faster model for extraction
-}
+})
 
-analyzer_agent_config = {
+analyzer_agent_config = freeze({
     "name": "blkout_analyzer",
     "description": "Scores content relevance to Black LGBTQ+ UK community",
     "model": "llama-3.3-70b-versatile",
-}
+})
 
 # =============================================================================
 # SEARCH CONFIGURATION
 # =============================================================================
 
-news_search_queries = [
+news_search_queries = freeze([
     # Primary intersectional queries
     "Black queer UK news",
     "Black LGBTQ Britain",
@@ -72,9 +82,9 @@ news_search_queries = [
     # Culture & arts
     "Black queer artists UK",
     "Black LGBTQ film UK",
-]
+])
 
-events_search_queries = [
+events_search_queries = freeze([
     # Direct event searches with explicit event keywords
     "Black LGBTQ events London -wiki -game",
     "QTIPOC parties UK events -wikipedia",
@@ -95,13 +105,44 @@ events_search_queries = [
     # Additional targeted searches
     "Black LGBTQ community gathering UK",
     "QTIPOC nightlife Manchester London Bristol",
-]
+])
+
+
+def _query_shingles(query: str) -> FrozenSet[str]:
+    """Normalized word tokens of a query
+
+    Operators like site: are kept; -exclusions are dropped since they
+    narrow a query rather than change its topic.
+    """
+    return frozenset(t for t in query.lower().split() if not t.startswith("-"))
+
+
+def _dedupe_queries(queries: Sequence[str], threshold: float = 0.8) -> Tuple[str, ...]:
+    """Collapse near-identical queries, keeping the first of each cluster
+
+    Two queries are near-duplicates when the Jaccard similarity of their
+    word sets reaches `threshold` (e.g. the same words reordered). The
+    lists are small, so exact pairwise Jaccard is cheaper than MinHash.
+    """
+    kept: List[Tuple[str, FrozenSet[str]]] = []
+    for query in queries:
+        shingles = _query_shingles(query)
+        if any(
+            len(shingles & other) / len(shingles | other) >= threshold
+            for _, other in kept
+        ):
+            continue
+        kept.append((query, shingles))
+    return tuple(query for query, _ in kept)
+
+
+DEDUPED_NEWS_QUERIES = _dedupe_queries(news_search_queries)
 
 # =============================================================================
 # EVENT PLATFORMS TO SCRAPE
 # =============================================================================
 
-event_platforms = [
+event_platforms = freeze([
     {
         "name": "OutSavvy",
         "base_url": "https://www.outsavvy.com",
@@ -150,39 +191,39 @@ event_platforms = [
             "link": "a",
         }
     },
-]
+])
 
 # =============================================================================
 # RELEVANCE SCORING
 # =============================================================================
 
 # Keywords that indicate HIGH relevance (intersectional Black LGBTQ+ UK)
-high_relevance_keywords = [
+high_relevance_keywords = freeze_keywords([
     "black queer", "black gay", "black lgbtq", "black trans", "black lesbian",
     "qtipoc", "qpoc", "blkout", "blackout uk", "uk black pride",
     "black bisexual", "black nonbinary", "black non-binary",
     "african diaspora lgbtq", "caribbean lgbtq",
     "windrush lgbtq", "black british queer",
-]
+])
 
 # Keywords that indicate MEDIUM relevance (need both Black AND LGBTQ+)
-black_keywords = [
+black_keywords = freeze_keywords([
     "black", "african", "caribbean", "windrush", "diaspora", "afro",
     "nigerian", "jamaican", "ghanaian", "somali",
-]
+])
 
-lgbtq_keywords = [
+lgbtq_keywords = freeze_keywords([
     "lgbtq", "queer", "gay", "lesbian", "trans", "bisexual",
     "pride", "nonbinary", "non-binary", "drag", "same-sex",
-]
+])
 
-uk_keywords = [
+uk_keywords = freeze_keywords([
     "uk", "britain", "british", "london", "manchester", "birmingham",
     "bristol", "leeds", "glasgow", "edinburgh", "cardiff",
-]
+])
 
 # NEGATIVE keywords that indicate IRRELEVANT content (should exclude)
-negative_keywords = [
+negative_keywords = freeze_keywords([
     # Entertainment/celebrity
     "musician", "band", "rapper", "singer", "artist", "actor", "actress",
     "movie", "film", "tv show", "television", "netflix", "bbc drama",
@@ -201,10 +242,76 @@ negative_keywords = [
 
     # Corporate non-community
     "corporate pride", "company announcement", "marketing",
-]
+])
+
+# =============================================================================
+# KEYWORD MATCHING - single-pass Aho-Corasick automaton over all categories
+# =============================================================================
+
+keyword_categories = freeze({
+    "high": high_relevance_keywords,
+    "black": black_keywords,
+    "lgbtq": lgbtq_keywords,
+    "uk": uk_keywords,
+    "negative": negative_keywords,
+})
+
+
+KEYWORD_AUTOMATON, CATEGORY_MASKS = build_keyword_automaton(keyword_categories)
+
+
+def score_text(text: str) -> Dict[str, List[str]]:
+    """Return category -> matched keywords from one linear scan of the text
+
+    Matching is substring-based (same semantics as `kw in text.lower()`),
+    so overlapping hits such as "black queer" / "black" / "queer" are all
+    reported.
+    """
+    hits: Dict[str, List[str]] = {}
+    for _, (kw, categories, _) in KEYWORD_AUTOMATON.iter(text.lower()):
+        for category in categories:
+            hits.setdefault(category, []).append(kw)
+    return hits
+
+
+def keyword_mask(text: str) -> int:
+    """Bitmask with one bit set per distinct keyword found in the text
+
+    Test categories with `mask & CATEGORY_MASKS[category]`.
+    """
+    mask = 0
+    for _, (_, _, bit) in KEYWORD_AUTOMATON.iter(text.lower()):
+        mask |= 1 << bit
+    return mask
+
+
+_DOC_SEPARATOR = "\x1f"  # never part of a keyword, so hits can't span documents
+
+
+def keyword_masks(texts: Sequence[str], lowered: bool = False) -> List[int]:
+    """keyword_mask() for a whole batch from a single automaton scan
+
+    Texts are lowercased individually (lowercasing can change length)
+    unless the caller already did so (`lowered=True`), joined with a
+    separator, scanned once, and each hit is mapped back to its document
+    by bisecting the cumulative end offsets.
+    """
+    if not lowered:
+        texts = [text.lower() for text in texts]
+    ends = list(accumulate(len(text) + 1 for text in texts))
+    masks = [0] * len(texts)
+    for end_index, (_, _, bit) in KEYWORD_AUTOMATON.iter(_DOC_SEPARATOR.join(texts)):
+        masks[bisect_right(ends, end_index)] |= 1 << bit
+    return masks
+
+
+def category_counts(mask: int) -> Dict[str, int]:
+    """Number of distinct keywords hit per category for a keyword_mask()"""
+    return {category: (mask & cat_mask).bit_count() for category, cat_mask in CATEGORY_MASKS.items()}
+
 
 # Domain BLACKLIST - explicitly reject sources
-domain_blacklist = [
+domain_blacklist = freeze([
     "wikipedia.org", "en.wikipedia.org",
     "reddit.com", "www.reddit.com",
     "imdb.com", "www.imdb.com",
@@ -215,10 +322,10 @@ domain_blacklist = [
     "wiki.fandom.com",
     "gamepedia.com",
     "twitch.tv",
-]
+])
 
 # Domain WHITELIST - trusted sources for news/events
-domain_whitelist = [
+domain_whitelist = freeze([
     # News organizations (UK-focused)
     "bbc.co.uk", "bbc.com",
     "theguardian.com",
@@ -254,7 +361,138 @@ domain_whitelist = [
     "facebook.com",
     "twitter.com",
     "x.com",
-]
+])
+
+
+def _split_domain_list(domains: Sequence[str]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Split a domain list into exact hostnames and ".suffix" matchers
+
+    Bare entries match the host itself and any subdomain of it;
+    "*." entries only match subdomains.
+    """
+    exact = set()
+    suffixes = set()
+    for entry in domains:
+        entry = entry.lower()
+        if entry.startswith("*."):
+            suffixes.add(entry[1:])
+            continue
+        if entry.startswith("www."):
+            entry = entry[4:]
+        exact.add(entry)
+        suffixes.add("." + entry)
+    return frozenset(exact), tuple(sorted(suffixes))
+
+
+_EXACT_BLACKLIST, _SUFFIX_BLACKLIST = _split_domain_list(domain_blacklist)
+_EXACT_WHITELIST, _SUFFIX_WHITELIST = _split_domain_list(domain_whitelist)
+
+
+# scheme://[userinfo@][www.]host[:port][/?#...] -> host
+_DOMAIN_RE = re.compile(r"^[a-z][a-z0-9+.-]*://(?:[^@/?#]*@)?(?:www\.)?([^/:?#@]+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def extract_domain(url: str) -> str:
+    """Lowercased host of a URL without a leading "www.", or "" if none"""
+    match = _DOMAIN_RE.match(url)
+    return match.group(1).lower() if match else ""
+
+
+def classify_domain(url: str) -> str:
+    """Classify a URL's host against the domain lists
+
+    Returns:
+        "block": host is (a subdomain of) a blacklisted domain
+        "allow": host is (a subdomain of) a whitelisted domain
+        "unknown": neither list matched
+    """
+    return classify_host(extract_domain(url))
+
+
+@lru_cache(maxsize=4096)
+def classify_host(host: str) -> str:
+    """classify_domain() for an already-extracted host
+
+    Memoized: the same hosts (eventbrite, bbc, ...) recur across results
+    and runs, and the decision depends only on the host.
+    """
+    if not host:
+        return "unknown"
+
+    if host in _EXACT_BLACKLIST or host.endswith(_SUFFIX_BLACKLIST):
+        return "block"
+    if host in _EXACT_WHITELIST or host.endswith(_SUFFIX_WHITELIST):
+        return "allow"
+    return "unknown"
+
+
+# Host fragments the events agent always accepts: event platforms
+# (strongly preferred) and social platforms used for announcements.
+# Matched as substrings of the host, so "eventbrite" covers every TLD.
+event_source_fragments = freeze([
+    "outsavvy", "eventbrite", "moonlight", "londonlgbtq",
+    "designmynight", "eventim", "ticketmaster",
+    "instagram", "facebook", "twitter", "x.com",
+])
+
+
+def _build_fragment_automaton(fragments: Sequence[str]) -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for fragment in fragments:
+        automaton.add_word(fragment, fragment)
+    automaton.make_automaton()
+    return automaton
+
+
+EVENT_SOURCE_AUTOMATON = _build_fragment_automaton(event_source_fragments)
+
+
+@lru_cache(maxsize=4096)
+def is_event_source(domain: str) -> bool:
+    """True if any event/social platform fragment occurs in the host"""
+    return next(EVENT_SOURCE_AUTOMATON.iter(domain), None) is not None
+
+
+# Quick-score adjustment per source, applied to borderline news before
+# deciding whether it is worth an LLM call. Keys match the host and any
+# subdomain of it.
+source_trust = freeze({
+    # Black and/or LGBTQ+ community outlets
+    "pinknews.co.uk": 10,
+    "attitude.co.uk": 10,
+    "gaytimes.co.uk": 10,
+    "voice-online.co.uk": 10,
+    "gal-dem.com": 10,
+    "blkout.com": 10,
+    "blackout.lgbt": 10,
+    "black-pride.org": 10,
+    "ukblackpride.org.uk": 10,
+    "stonewall.org.uk": 10,
+    "londonlgbtqcentre.org": 10,
+
+    # Aggregators and syndication mirrors
+    "msn.com": -20,
+    "yahoo.com": -20,
+    "news.google.com": -20,
+    "flipboard.com": -20,
+    "newsbreak.com": -20,
+    "ground.news": -20,
+    "inkl.com": -20,
+    "pressreader.com": -20,
+})
+
+
+@lru_cache(maxsize=4096)
+def source_trust_bonus(host: str) -> int:
+    """source_trust adjustment for a host (0 when unlisted)"""
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        bonus = source_trust.get(".".join(labels[i:]))
+        if bonus is not None:
+            return bonus
+    return 0
+
 
 # Minimum relevance score to include content (0-100)
 # Raised from 70 to be stricter on intersectional requirements
@@ -263,22 +501,26 @@ relevance_threshold = 75
 # Event-specific thresholds (even stricter)
 event_relevance_threshold = 80
 
+# Borderline news needs at least this trust-adjusted quick score to be
+# sent to the LLM; anything lower is rejected on keywords alone
+llm_review_threshold = 55
+
 # =============================================================================
 # OUTPUT CONFIGURATION
 # =============================================================================
 
-output_config = {
+output_config = freeze({
     "news_table": "news_articles",
     "events_table": "events",
     "batch_size": 50,
     "dedupe_field": "url_hash",
-}
+})
 
 # =============================================================================
 # SCHEDULING
 # =============================================================================
 
-schedule_config = {
+schedule_config = freeze({
     "news_research": {
         "frequency": "daily",
         "time": "06:00",
@@ -295,4 +537,4 @@ schedule_config = {
         "time": "03:00",
         "timezone": "Europe/London",
     },
-}
+})
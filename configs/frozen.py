@@ -0,0 +1,60 @@
+"""
+Helpers for declaring configuration as import-time constants
+"""
+
+import sys
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Sequence, Tuple
+
+import ahocorasick
+
+
+def freeze(value: Any) -> Any:
+    """Recursively freeze config data
+
+    dicts become read-only MappingProxyType views, lists/tuples become
+    tuples and strings are interned so keyword comparisons can short-circuit
+    on identity.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({
+            sys.intern(k) if isinstance(k, str) else k: freeze(v)
+            for k, v in value.items()
+        })
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def freeze_keywords(words: Iterable[str]) -> Tuple[str, ...]:
+    """Freeze a keyword list, lowercased and deduplicated once at import
+
+    Matchers lowercase each document once and compare against these
+    directly, so no keyword is ever lowercased per document.
+    """
+    return tuple(dict.fromkeys(sys.intern(w.lower()) for w in words))
+
+
+def build_keyword_automaton(
+    categories: Mapping[str, Sequence[str]],
+) -> Tuple[ahocorasick.Automaton, Mapping[str, int]]:
+    """Build one automaton over all keywords plus a bitmask per category
+
+    Each distinct keyword gets one bit position; its automaton value is
+    (keyword, categories it belongs to, bit).
+    """
+    automaton = ahocorasick.Automaton()
+    masks = {category: 0 for category in categories}
+    for category, keywords in categories.items():
+        for kw in keywords:
+            kw = kw.lower()
+            if kw in automaton:
+                _, found_in, bit = automaton.get(kw)
+            else:
+                found_in, bit = (), len(automaton)
+            automaton.add_word(kw, (kw, found_in + (category,), bit))
+            masks[category] |= 1 << bit
+    automaton.make_automaton()
+    return automaton, freeze(masks)
@@ -10,8 +10,13 @@ Targets funders aligned with:
 - UK racial equity
 """
 
+from typing import Mapping
+
+from .blkout_config import extract_domain
+from .frozen import build_keyword_automaton, freeze, freeze_keywords
+
 # Search queries for discovering grant opportunities
-grant_search_queries = [
+grant_search_queries = freeze([
     # LGBTQ+ Specific
     "LGBTQ+ grants UK 2024 2025",
     "queer community funding UK",
@@ -75,10 +80,10 @@ grant_search_queries = [
     "mental health community grants UK",
     "wellbeing funding LGBTQ",
     "health equity grants UK",
-]
+])
 
 # Known funder websites to monitor
-funder_websites = [
+funder_websites = freeze([
     # LGBTQ+ Funders
     {"name": "Elton John AIDS Foundation", "url": "https://www.eltonjohnaidsfoundation.org/what-we-do/grant-making/"},
     {"name": "LGBT Foundation", "url": "https://lgbt.foundation/"},
@@ -111,10 +116,15 @@ funder_websites = [
     # Media
     {"name": "Media Trust", "url": "https://mediatrust.org/"},
     {"name": "JRF Journalism", "url": "https://www.jrf.org.uk/"},
-]
+])
+
+# Funder website host -> funder name (first listing wins for shared hosts)
+FUNDER_DOMAINS: Mapping[str, str] = freeze({
+    extract_domain(funder["url"]): funder["name"] for funder in reversed(funder_websites)
+})
 
 # Funder type categories
-funder_types = [
+funder_types = freeze([
     "trust_foundation",
     "lottery",
     "arts_council",
@@ -125,10 +135,10 @@ funder_types = [
     "media_journalism",
     "corporate",
     "government",
-]
+])
 
 # Program areas BLKOUT is eligible for
-program_areas = [
+program_areas = freeze([
     "community_development",
     "arts_culture",
     "health_wellbeing",
@@ -141,10 +151,10 @@ program_areas = [
     "mental_health",
     "capacity_building",
     "core_costs",
-]
+])
 
 # Keywords indicating high relevance for BLKOUT
-high_relevance_keywords = [
+high_relevance_keywords = freeze_keywords([
     "black lgbtq",
     "black queer",
     "qtipoc",
@@ -158,29 +168,50 @@ high_relevance_keywords = [
     "community ownership",
     "participatory",
     "co-creation",
-]
+])
 
 # Keywords for filtering
-lgbtq_keywords = [
+lgbtq_keywords = freeze_keywords([
     "lgbtq", "lgbt", "queer", "gay", "trans", "transgender",
     "pride", "sexual orientation", "gender identity", "nonbinary",
-]
+])
 
-black_keywords = [
+black_keywords = freeze_keywords([
     "black", "african", "caribbean", "afro", "diaspora",
     "ethnic minority", "bame", "people of colour", "poc",
     "global majority", "racialised",
-]
+])
 
-arts_keywords = [
+arts_keywords = freeze_keywords([
     "arts", "culture", "creative", "participatory", "co-creation",
     "storytelling", "media", "film", "music", "performance",
-]
+])
 
-community_wealth_keywords = [
+community_wealth_keywords = freeze_keywords([
     "cooperative", "co-op", "community ownership", "social enterprise",
     "community wealth", "democratic", "mutual", "worker-owned",
-]
+])
+
+
+# One automaton over every scoring category, built once at import.
+# Test categories with `grant_keyword_mask(text) & GRANT_CATEGORY_MASKS[category]`.
+GRANT_KEYWORD_AUTOMATON, GRANT_CATEGORY_MASKS = build_keyword_automaton({
+    "high": high_relevance_keywords,
+    "lgbtq": lgbtq_keywords,
+    "black": black_keywords,
+    "arts": arts_keywords,
+    "community_wealth": community_wealth_keywords,
+    "active": ("open", "deadline", "apply"),
+})
+
+
+def grant_keyword_mask(text_lower: str) -> int:
+    """Bitmask of the keywords found in already-lowercased text, from one scan"""
+    mask = 0
+    for _, (_, _, bit) in GRANT_KEYWORD_AUTOMATON.iter(text_lower):
+        mask |= 1 << bit
+    return mask
+
 
 # Relevance scoring threshold
 relevance_threshold = 60
@@ -8,12 +8,13 @@ Usage:
     python main.py --run-now events   # Run events discovery immediately
     python main.py --run-now weekly   # Run weekly deep research immediately
     python main.py --run-now grants   # Run grant research immediately
+    python main.py --run-now daily grants  # Run several jobs concurrently
+                                      # (queued on the daemon if one is running)
     python main.py --test             # Test mode (no database writes)
 """
 
 import asyncio
 import argparse
-import os
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,13 +23,15 @@ load_dotenv()
 
 def check_config():
     """Verify required configuration"""
-    required = ["GROQ_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY"]
-    missing = [var for var in required if not os.getenv(var)]
+    from pydantic import ValidationError
+    from src.settings import get_settings
 
-    if missing:
-        print("Missing required environment variables:")
-        for var in missing:
-            print(f"  - {var}")
+    try:
+        get_settings()
+    except ValidationError as e:
+        print("Invalid or missing environment variables:")
+        for error in e.errors():
+            print(f"  - {'.'.join(str(loc) for loc in error['loc']).upper()}: {error['msg']}")
         print("\nCopy .env.template to .env and fill in your values.")
         return False
     return True
@@ -42,25 +45,26 @@ async def run_test():
     print("BLKOUT Research Agent - Test Mode")
     print("=" * 60)
 
-    # Test news research
-    print("\n[TEST] News Research Agent")
-    print("-" * 40)
+    # News research and events search are independent - run them together
+    # (events search only, no scraping in test)
     news_agent = NewsResearchAgent()
-    articles = await news_agent.research(time_range="w")
+    events_agent = EventsDiscoveryAgent()
+    articles, events = await asyncio.gather(
+        news_agent.research(time_range="w"),
+        events_agent.discover_from_search(),
+    )
 
+    print("\n[TEST] News Research Agent")
+    print("-" * 40)
     print(f"\nFound {len(articles)} relevant articles:")
     for i, article in enumerate(articles[:10], 1):
         print(f"\n{i}. [{article.relevance_score}] {article.title[:60]}...")
         print(f"   Source: {article.source}")
         print(f"   URL: {article.url[:80]}...")
 
-    # Test events discovery (search only, no scraping in test)
     print("\n" + "=" * 60)
     print("[TEST] Events Discovery Agent (Search Only)")
     print("-" * 40)
-    events_agent = EventsDiscoveryAgent()
-    events = await events_agent.discover_from_search()
-
     print(f"\nFound {len(events)} events:")
     for i, event in enumerate(events[:10], 1):
         print(f"\n{i}. {event.name[:60]}...")
@@ -72,12 +76,25 @@ async def run_test():
     print("=" * 60)
 
 
-async def run_immediate(job_type: str):
-    """Run a specific job immediately"""
+def queue_on_daemon(job_types: list) -> bool:
+    """Hand jobs to a running daemon; False if none is listening"""
+    from src.control import send_jobs
+
+    accepted = asyncio.run(send_jobs(job_types))
+    if accepted is None:
+        return False
+    print(f"[Main] Queued on running daemon: {', '.join(accepted) or 'nothing'}")
+    return True
+
+
+async def run_immediate(job_types: list):
+    """Run one or more jobs immediately, concurrently"""
     from src.scheduler import DiscoveryScheduler
 
     scheduler = DiscoveryScheduler()
-    await scheduler.run_now(job_type)
+    await scheduler.run_many(job_types)
+    # Discovery logs are written in the background; don't exit before them
+    await scheduler.agent.db.flush_logs()
 
 
 async def run_daemon():
@@ -106,8 +123,9 @@ def main():
     parser = argparse.ArgumentParser(description="BLKOUT Research Agent")
     parser.add_argument(
         "--run-now",
+        nargs="+",
         choices=["daily", "events", "weekly", "grants"],
-        help="Run a specific job immediately",
+        help="Run one or more jobs immediately (concurrently)",
     )
     parser.add_argument(
         "--test",
@@ -116,7 +134,11 @@ def main():
     )
 
     args = parser.parse_args()
-    print(f"[Main] Mode: {'test' if args.test else 'run_now: ' + args.run_now if args.run_now else 'daemon'}")
+    print(f"[Main] Mode: {'test' if args.test else 'run_now: ' + ', '.join(args.run_now) if args.run_now else 'daemon'}")
+
+    # A running daemon already has agents loaded - let it do the work
+    if args.run_now and queue_on_daemon(args.run_now):
+        return 0
 
     # Check configuration
     if not args.test and not check_config():
@@ -131,7 +153,7 @@ def main():
             print("[Main] Starting test mode...")
             asyncio.run(run_test())
         elif args.run_now:
-            print(f"[Main] Running immediate job: {args.run_now}")
+            print(f"[Main] Running immediate jobs: {', '.join(args.run_now)}")
             asyncio.run(run_immediate(args.run_now))
         else:
             print("[Main] Starting daemon mode...")
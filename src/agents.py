@@ -3,34 +3,37 @@ Research Agents - Coordinated agents for news and events discovery
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-
-from .llm import get_llm_client, LLMClient
-from .search import SearchAgent, EventSearchAgent, SearchResult
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import asdict, dataclass, field, replace
+from operator import attrgetter
+from datetime import date, datetime, timedelta
+
+from .llm import batch_api_enabled, get_llm_client, LLMClient
+from .rate_limit import QuotaExceeded
+from .search import SearchAgent, EventSearchAgent, SearchResult, canonical_url
 from .scraper import ScraperAgent, ScrapedEvent
 from .database import get_database, DatabaseClient
 from .ivor_sync import IVORSync
+from .dedup import SimHashIndex, simhash
 
-import sys
-sys.path.append("..")
 from configs.blkout_config import (
-    news_search_queries,
-    events_search_queries,
-    high_relevance_keywords,
-    black_keywords,
-    lgbtq_keywords,
-    uk_keywords,
-    negative_keywords,
-    domain_blacklist,
-    domain_whitelist,
+    DEDUPED_NEWS_QUERIES,
+    keyword_mask,
+    keyword_masks,
+    CATEGORY_MASKS,
+    classify_domain,
+    classify_host,
+    extract_domain,
+    is_event_source,
+    source_trust_bonus,
     relevance_threshold,
     event_relevance_threshold,
+    llm_review_threshold,
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiscoveredArticle:
     title: str
     url: str
@@ -43,7 +46,7 @@ class DiscoveredArticle:
     reasoning: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiscoveredEvent:
     name: str
     url: str
@@ -58,9 +61,101 @@ class DiscoveredEvent:
     tags: List[str] = None
 
 
+_ISO_DATE_RE = re.compile(r"(?<!\d)(20\d{2})[-/](\d{1,2})[-/](\d{1,2})(?!\d)")
+_DAY_MONTH_RE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s+(20\d{2})\b",
+    re.IGNORECASE,
+)
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+
+
+def _regex_event_date(text: str, today: Optional[date] = None) -> Optional[str]:
+    """Earliest upcoming unambiguous date (2026-01-07, /2026/01/07/, 7th January 2026)
+
+    Returns None when there is none, leaving relative or yearless dates
+    ("Sat 7 Feb", "next Friday") to the LLM.
+    """
+    found = [(int(y), int(m), int(d)) for y, m, d in _ISO_DATE_RE.findall(text)]
+    found += [(int(y), _MONTHS[mon.lower()], int(d)) for d, mon, y in _DAY_MONTH_RE.findall(text)]
+
+    today = today or date.today()
+    upcoming = []
+    for parts in found:
+        try:
+            candidate = date(*parts)
+        except ValueError:
+            continue
+        if candidate >= today:
+            upcoming.append(candidate)
+    return min(upcoming).isoformat() if upcoming else None
+
+
+_MERGEABLE_EVENT_FIELDS = ("venue", "city", "date", "price", "description", "source_platform", "tags")
+
+
+def _merge_event(existing: DiscoveredEvent, other: DiscoveredEvent) -> DiscoveredEvent:
+    """Fill fields `existing` lacks from another listing of the same URL"""
+    missing = {
+        field: value
+        for field in _MERGEABLE_EVENT_FIELDS
+        if getattr(existing, field) is None and (value := getattr(other, field)) is not None
+    }
+    return replace(existing, **missing) if missing else existing
+
+
+def _unique_by_url(results: List[SearchResult], seen_urls: Optional[set] = None) -> List[SearchResult]:
+    """Drop repeated URLs before any scoring work
+
+    URL variants (tracking params, www., trailing slash) count as repeats.
+    Within a batch the first occurrence wins but picks up a longer snippet
+    or a missing published_date from its repeats. Pass the same
+    `seen_urls` set to deduplicate across several batches.
+    """
+    seen_urls = set() if seen_urls is None else seen_urls
+    by_url: Dict[str, SearchResult] = {}
+    for r in results:
+        key = canonical_url(r.url)
+        if key in by_url:
+            kept = by_url[key]
+            by_url[key] = replace(
+                kept,
+                snippet=max(kept.snippet or "", r.snippet or "", key=len),
+                published_date=kept.published_date or r.published_date,
+            )
+        elif key not in seen_urls:
+            seen_urls.add(key)
+            by_url[key] = r
+    return list(by_url.values())
+
+
+@dataclass(slots=True)
+class NewsResearchRun:
+    """Outcome of one research pass
+
+    Returned per call rather than kept on the shared agent, so overlapping
+    runs (a triggered daily alongside the weekly) can't reset each other's.
+    """
+    articles: List[DiscoveredArticle] = field(default_factory=list)
+    # Borderline candidates left unscored for the Batch API (defer_llm=True)
+    deferred: List[Tuple[SearchResult, int]] = field(default_factory=list)
+    # LLM quota ran out part-way; the rest were kept on keyword scores
+    quota_exhausted: bool = False
+
+
 class NewsResearchAgent:
     """Agent for discovering news relevant to Black LGBTQ+ UK community"""
 
+    # LLM workers analysing borderline candidates at once
+    llm_concurrency = 10
+
+    # Borderline candidates scored per LLM request
+    llm_batch_size = 15
+
+    # Articles per insert while research_and_save streams results to the DB
+    save_batch_size = 50
+
     def __init__(self):
         self.llm = get_llm_client()
         self.search = SearchAgent(max_results=10)
@@ -68,68 +163,46 @@ class NewsResearchAgent:
 
     def _is_domain_acceptable(self, url: str) -> bool:
         """Check if domain is acceptable for news/events content"""
-        url_lower = url.lower()
-        domain = self._extract_domain(url_lower)
-
-        # REJECT blacklisted domains
-        for blacklisted in domain_blacklist:
-            if blacklisted in domain:
-                return False
-
-        # WHITELIST sources (preferred)
-        for whitelisted in domain_whitelist:
-            whitelisted_clean = whitelisted.replace("*.", "")
-            if whitelisted_clean in domain or domain.endswith(whitelisted_clean):
-                return True
+        # REJECT blacklisted domains, whitelisted sources are preferred
+        if classify_domain(url) == "block":
+            return False
 
         # Accept other sources IF they pass keyword checks (less preferred)
         # This allows legitimate news sources not in whitelist
         return True
 
-    def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace("www.", "").lower()
-            return domain
-        except:
-            return ""
-
-    def _quick_relevance_check(self, text: str, url: str = "") -> int:
+    def _quick_relevance_check(self, text: str, url: str = "", mask: Optional[int] = None) -> int:
         """Fast keyword-based relevance check before LLM analysis
 
+        `mask` is the text's keyword_mask(), when already computed for a batch.
+
         Returns:
             -1: Rejected (domain blacklist, negative keywords)
             0-45: Too low relevance
             46-74: Borderline (needs LLM review)
             75+: High confidence match
         """
-        text_lower = text.lower()
-
         # FIRST: Domain-based rejection
         if url and not self._is_domain_acceptable(url):
             return -1  # Signal rejection
 
+        if mask is None:
+            mask = keyword_mask(text)
+        has_high_relevance = bool(mask & CATEGORY_MASKS["high"])
+
         # SECOND: Negative keywords (should exclude)
-        for neg_term in negative_keywords:
-            if neg_term in text_lower:
-                # Unless overridden by high-relevance keywords
-                has_high_relevance = any(
-                    term in text_lower for term in high_relevance_keywords
-                )
-                if not has_high_relevance:
-                    return 15  # Very low, likely false positive
+        # Unless overridden by high-relevance keywords
+        if mask & CATEGORY_MASKS["negative"] and not has_high_relevance:
+            return 15  # Very low, likely false positive
 
         # Check for high-relevance intersectional terms (strongest signal)
-        for term in high_relevance_keywords:
-            if term in text_lower:
-                return 95  # Definitely relevant
+        if has_high_relevance:
+            return 95  # Definitely relevant
 
         # Check for Black + LGBTQ+ combination (must have BOTH + UK)
-        has_black = any(kw in text_lower for kw in black_keywords)
-        has_lgbtq = any(kw in text_lower for kw in lgbtq_keywords)
-        has_uk = any(kw in text_lower for kw in uk_keywords)
+        has_black = bool(mask & CATEGORY_MASKS["black"])
+        has_lgbtq = bool(mask & CATEGORY_MASKS["lgbtq"])
+        has_uk = bool(mask & CATEGORY_MASKS["uk"])
 
         # Require UK location for news (high confidence)
         if has_black and has_lgbtq and has_uk:
@@ -148,203 +221,390 @@ class NewsResearchAgent:
 
         return 10  # No relevant keywords
 
-    async def research(self, time_range: str = "w") -> List[DiscoveredArticle]:
-        """Execute news research across all configured queries"""
-        print(f"[NewsAgent] Starting research with {len(news_search_queries)} queries...")
+    async def _analyze_candidates(
+        self, items: List[Tuple[SearchResult, int]]
+    ) -> List[Optional[DiscoveredArticle]]:
+        """Use the LLM to decide on a batch of borderline quick-filter candidates"""
+        try:
+            analyses = await self.llm.analyze_relevance_batch([
+                {"title": r.title, "content": r.snippet, "source": r.source, "url": r.url}
+                for r, _ in items
+            ])
+        except QuotaExceeded:
+            raise
+        except Exception as e:
+            print(f"[NewsAgent] LLM analysis error: {e}")
+            return [self._fallback_article(*item) for item in items]
 
-        # Phase 1: Search
-        all_results = await self.search.multi_search(
-            news_search_queries,
-            search_type="news",
-            time_range=time_range,
-        )
-        print(f"[NewsAgent] Found {len(all_results)} raw results")
+        return [
+            self._article_from_analysis(result, quick_score, analysis)
+            for (result, quick_score), analysis in zip(items, analyses)
+        ]
 
-        # Phase 2: Quick filter with domain and keyword validation
-        candidates = []
-        rejected = []
-        for result in all_results:
-            combined_text = f"{result.title} {result.snippet}"
-            quick_score = self._quick_relevance_check(combined_text, url=result.url)
+    def _article_from_analysis(
+        self, result: SearchResult, quick_score: int, analysis: Dict[str, Any]
+    ) -> Optional[DiscoveredArticle]:
+        """Article for a candidate the LLM scored at or above the threshold"""
+        if not analysis:
+            # Left out of the LLM response - treat like a failed call
+            return self._fallback_article(result, quick_score)
+        score = analysis.get("relevance_score", 0)
+        if score < relevance_threshold:
+            return None
+        return DiscoveredArticle(
+            title=result.title,
+            url=result.url,
+            source=result.source,
+            snippet=result.snippet,
+            published_date=result.published_date,
+            relevance_score=score,
+            category=analysis.get("suggested_category", "news"),
+            tags=analysis.get("suggested_tags", []),
+            reasoning=analysis.get("reasoning", ""),
+        )
 
-            if quick_score == -1:
-                # Domain rejection
-                rejected.append((result, "domain_blacklist"))
-            elif quick_score >= 45:  # Significantly stricter than before (was 40)
-                # Worth deeper analysis
-                candidates.append((result, quick_score))
-            else:
-                rejected.append((result, f"low_score_{quick_score}"))
+    def _fallback_article(self, result: SearchResult, quick_score: int) -> Optional[DiscoveredArticle]:
+        """Keep a candidate on its quick score alone when the LLM is unavailable"""
+        if quick_score >= relevance_threshold:
+            return DiscoveredArticle(
+                title=result.title,
+                url=result.url,
+                source=result.source,
+                snippet=result.snippet,
+                relevance_score=quick_score,
+            )
+        return None
 
-        print(f"[NewsAgent] {len(candidates)} candidates passed quick filter")
-        print(f"[NewsAgent] {len(rejected)} results rejected (domain/keywords)")
+    async def research(self, time_range: str = "w", skip_stored: bool = False) -> List[DiscoveredArticle]:
+        """Execute news research across all configured queries"""
+        return (await self._research(time_range, skip_stored=skip_stored)).articles
+
+    async def _research(
+        self,
+        time_range: str = "w",
+        skip_stored: bool = False,
+        defer_llm: bool = False,
+        sink: Optional[asyncio.Queue] = None,
+    ) -> NewsResearchRun:
+        """One research pass, returning its articles and per-run state
+
+        With `skip_stored`, results already in the database are dropped
+        before any filtering or LLM work. With `defer_llm`, borderline
+        candidates are left unscored in the run's `deferred` for the Batch
+        API. Each article is also put on `sink` as soon as it is accepted.
+        """
+        print(f"[NewsAgent] Starting research with {len(DEDUPED_NEWS_QUERIES)} queries...")
 
-        # Phase 3: LLM relevance analysis for borderline cases
+        # Search, filter and LLM phases are pipelined: each query's results
+        # are filtered as soon as they arrive, and borderline candidates are
+        # queued for LLM analysis in batches of llm_batch_size (one request
+        # each), so LLM calls overlap with the remaining searches
         discovered = []
-        for result, quick_score in candidates:
-            if quick_score >= 80:
-                # High confidence, skip LLM
-                discovered.append(DiscoveredArticle(
-                    title=result.title,
-                    url=result.url,
-                    source=result.source,
-                    snippet=result.snippet,
-                    published_date=result.published_date,
-                    relevance_score=quick_score,
-                    reasoning="High-confidence keyword match",
-                ))
-            else:
-                # Use LLM for deeper analysis
-                try:
-                    analysis = await self.llm.analyze_relevance(
-                        title=result.title,
-                        content=result.snippet,
-                        source=result.source,
-                        url=result.url,
-                    )
-                    score = analysis.get("relevance_score", 0)
-                    if score >= relevance_threshold:
-                        discovered.append(DiscoveredArticle(
+        rejected = []
+        candidates = 0
+        found = 0
+        already_stored = 0
+        seen_urls = set()
+        llm_queue: asyncio.Queue = asyncio.Queue()
+
+        run = NewsResearchRun(articles=discovered)
+
+        pending: List[Tuple[SearchResult, int]] = []
+
+        def accept(article: Optional[DiscoveredArticle]):
+            if article is not None:
+                discovered.append(article)
+                if sink is not None:
+                    sink.put_nowait(article)
+
+        async def llm_worker():
+            while (items := await llm_queue.get()) is not None:
+                if run.quota_exhausted:
+                    articles = [self._fallback_article(*item) for item in items]
+                else:
+                    try:
+                        articles = await self._analyze_candidates(items)
+                    except QuotaExceeded as e:
+                        # Stop calling the LLM; the rest ride on quick scores
+                        print(f"[NewsAgent] {e} - finishing on keyword scores")
+                        run.quota_exhausted = True
+                        articles = [self._fallback_article(*item) for item in items]
+                for article in articles:
+                    accept(article)
+
+        workers = [asyncio.create_task(llm_worker()) for _ in range(self.llm_concurrency)]
+
+        try:
+            # Near-duplicate queries were collapsed at config load
+            async for batch in self.search.multi_search_stream(
+                DEDUPED_NEWS_QUERIES,
+                search_type="news",
+                time_range=time_range,
+            ):
+                # Overlapping queries return the same article - score it only once
+                batch = _unique_by_url(batch, seen_urls)
+                found += len(batch)
+                if skip_stored:
+                    unseen = await self.db.filter_unseen_urls("news_articles", [r.url for r in batch])
+                    already_stored += len(batch) - len(unseen)
+                    batch = [r for r in batch if r.url in unseen]
+                texts = [f"{r.title} {r.snippet}".lower() for r in batch]
+                # One automaton pass over the whole batch instead of one per result
+                masks = keyword_masks(texts, lowered=True)
+                for result, text, mask in zip(batch, texts, masks):
+                    quick_score = self._quick_relevance_check(text, url=result.url, mask=mask)
+
+                    if quick_score == -1:
+                        # Domain rejection
+                        rejected.append((result, "domain_blacklist"))
+                    elif quick_score >= 80:
+                        # High confidence, skip LLM
+                        candidates += 1
+                        accept(DiscoveredArticle(
                             title=result.title,
                             url=result.url,
                             source=result.source,
                             snippet=result.snippet,
                             published_date=result.published_date,
-                            relevance_score=score,
-                            category=analysis.get("suggested_category", "news"),
-                            tags=analysis.get("suggested_tags", []),
-                            reasoning=analysis.get("reasoning", ""),
-                        ))
-                except Exception as e:
-                    print(f"[NewsAgent] LLM analysis error: {e}")
-                    # Fall back to quick score if high enough
-                    if quick_score >= relevance_threshold:
-                        discovered.append(DiscoveredArticle(
-                            title=result.title,
-                            url=result.url,
-                            source=result.source,
-                            snippet=result.snippet,
                             relevance_score=quick_score,
+                            reasoning="High-confidence keyword match",
                         ))
+                    elif quick_score + source_trust_bonus(extract_domain(result.url)) >= llm_review_threshold:
+                        # Worth deeper analysis (community outlets get the
+                        # benefit of the doubt, aggregators don't)
+                        candidates += 1
+                        if defer_llm:
+                            run.deferred.append((result, quick_score))
+                            continue
+                        pending.append((result, quick_score))
+                        if len(pending) >= self.llm_batch_size:
+                            llm_queue.put_nowait(pending)
+                            pending = []
+                            await asyncio.sleep(0)  # let an idle worker pick it up now
+                    else:
+                        rejected.append((result, f"low_score_{quick_score}"))
+            if pending:
+                llm_queue.put_nowait(pending)
+        finally:
+            for _ in workers:
+                llm_queue.put_nowait(None)
+            await asyncio.gather(*workers)
+
+        print(f"[NewsAgent] Found {found} raw results ({already_stored} already stored)")
+        print(f"[NewsAgent] {candidates} candidates passed quick filter")
+        print(f"[NewsAgent] {len(rejected)} results rejected (domain/keywords)")
 
         # Sort by relevance
-        discovered.sort(key=lambda x: x.relevance_score, reverse=True)
+        discovered.sort(key=attrgetter("relevance_score"), reverse=True)
         print(f"[NewsAgent] Discovered {len(discovered)} relevant articles")
 
-        return discovered
+        return run
+
+    async def _save_stream(self, queue: asyncio.Queue) -> Dict[str, int]:
+        """Insert articles from `queue` in chunks of save_batch_size until None"""
+        totals: Dict[str, int] = {}
+        buffer: List[DiscoveredArticle] = []
+
+        async def flush(batch: List[DiscoveredArticle]):
+            for key, value in (await self.db.insert_articles_batch(batch)).items():
+                totals[key] = totals.get(key, 0) + value
+
+        while (article := await queue.get()) is not None:
+            buffer.append(article)
+            if len(buffer) >= self.save_batch_size:
+                await flush(buffer)
+                buffer = []
+        if buffer:
+            await flush(buffer)
+        return totals
 
     async def research_and_save(self, time_range: str = "w") -> Dict[str, Any]:
         """Research and save to database"""
-        articles = await self.research(time_range)
-
-        # Convert to dict format for database
-        article_dicts = [
-            {
-                "title": a.title,
-                "source_url": a.url,
-                "source_name": a.source,
-                "excerpt": a.snippet,
-                "published_date": a.published_date,
-                "relevance_score": a.relevance_score,
-                "category": a.category,
-                "tags": a.tags or [],
-            }
-            for a in articles
-        ]
+        # Articles are written while the rest are still being scored, so DB
+        # round-trips overlap LLM calls instead of all landing at the end
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._save_stream(queue))
+        try:
+            # Anything already stored would be skipped on insert anyway
+            run = await self._research(time_range, skip_stored=True, sink=queue)
+        finally:
+            # Even if research fails, write the articles it already accepted
+            # and don't leave the writer task behind
+            queue.put_nowait(None)
+            stats = await writer
+        await self.db.log_discovery_run("news_partial" if run.quota_exhausted else "news", {
+            "total_found": len(run.articles),
+            **stats,
+        })
 
-        stats = await self.db.insert_articles_batch(article_dicts)
+        return {
+            "discovered": len(run.articles),
+            "partial": run.quota_exhausted,
+            **stats,
+        }
+
+    async def research_and_submit_batch(self, time_range: str = "m") -> Dict[str, Any]:
+        """Save keyword-confident articles now; queue borderline ones on the Batch API
+
+        collect_llm_batches() saves the borderline articles once scored.
+        """
+        run = await self._research(time_range, skip_stored=True, defer_llm=True)
+        articles, candidates = run.articles, run.deferred
+        batch_id = None
+
+        if candidates:
+            try:
+                batch_id = await self.llm.submit_relevance_batch([
+                    {"title": r.title, "content": r.snippet, "source": r.source, "url": r.url}
+                    for r, _ in candidates
+                ])
+                await self.db.log_llm_batch(batch_id, [
+                    {**asdict(r), "quick_score": quick_score} for r, quick_score in candidates
+                ])
+            except Exception as e:
+                # Never lose the run: keep borderline candidates on keyword scores
+                print(f"[NewsAgent] Batch submission failed: {e} - using keyword scores")
+                batch_id = None
+                articles.extend(filter(None, (self._fallback_article(*c) for c in candidates)))
+
+        batched = len(candidates) if batch_id else 0
+        stats = await self.db.insert_articles_batch(articles)
         await self.db.log_discovery_run("news", {
             "total_found": len(articles),
+            "batch_id": batch_id,
+            "batched_candidates": batched,
             **stats,
         })
 
         return {
             "discovered": len(articles),
+            "batch_id": batch_id,
+            "batched_candidates": batched,
             **stats,
         }
 
+    async def collect_llm_batches(self) -> Dict[str, Any]:
+        """Save the articles from any finished Batch API submissions"""
+        collected = {"batches": 0, "discovered": 0}
+
+        for pending in await self.db.pending_llm_batches():
+            batch_id = pending["stats"]["batch_id"]
+            analyses = await self.llm.fetch_relevance_batch(batch_id)
+            if analyses is None:
+                continue  # Still running
+
+            candidates = pending["stats"]["candidates"]
+            articles = []
+            for i, candidate in enumerate(candidates):
+                result = SearchResult(**{k: v for k, v in candidate.items() if k != "quick_score"})
+                article = self._article_from_analysis(result, candidate["quick_score"], analyses.get(i, {}))
+                if article is not None:
+                    articles.append(article)
+
+            stats = await self.db.insert_articles_batch(articles)
+            missing = len(candidates) - len(analyses)
+            await self.db.finish_llm_batch(
+                pending["id"],
+                {"batch_id": batch_id, "total_found": len(articles), **stats},
+                [f"{missing} requests had no result; used keyword scores"] if missing else None,
+            )
+            print(f"[NewsAgent] Batch {batch_id}: {len(articles)} articles from {len(candidates)} candidates")
+
+            collected["batches"] += 1
+            collected["discovered"] += len(articles)
+
+        return collected
+
 
 class EventsDiscoveryAgent:
     """Agent for discovering events relevant to Black LGBTQ+ UK community"""
 
+    # Shorter texts (bare titles) are too sparse for a reliable SimHash
+    min_simhash_tokens = 6
+
+    # Date extractions / relevance batches sent to the LLM at once
+    llm_concurrency = 8
+
+    # Events scored per LLM relevance request
+    llm_batch_size = 20
+
+    # Negative indicators (NOT an event)
+    NON_EVENT_TERMS = (
+        "musician", "band", "game", "character",
+        "tv show", "movie", "film", "wikipedia",
+        "tutorial", "guide", "tips", "tricks",
+    )
+    # Clear event indicators that override a negative hit
+    EVENT_OVERRIDE_TERMS = (
+        "event", "party", "night", "club", "gather",
+        "show", "performance", "live", "date:",
+    )
+    # Positive indicators (IS an event)
+    EVENT_TERMS = (
+        "event", "party", "night", "club", "gathering",
+        "show", "performance", "live", "happening", "gig",
+        "club night", "celebration", "festival", "pride",
+    )
+
+    _NON_EVENT_RE = re.compile("|".join(map(re.escape, NON_EVENT_TERMS)))
+    _EVENT_OVERRIDE_RE = re.compile("|".join(map(re.escape, EVENT_OVERRIDE_TERMS)))
+    _EVENT_RE = re.compile("|".join(map(re.escape, EVENT_TERMS)))
+
     def __init__(self):
         self.llm = get_llm_client()
         self.search = EventSearchAgent(max_results=15)
         self.db = get_database()
+        # Long-lived browser injected by PlanningAgent.start(); without one,
+        # each scrape launches (and tears down) its own
+        self.scraper: Optional[ScraperAgent] = None
 
     def _is_domain_acceptable(self, url: str) -> bool:
         """Check if domain is acceptable for events content"""
-        url_lower = url.lower()
-        domain = self._extract_domain(url_lower)
+        domain = extract_domain(url)
 
         # REJECT blacklisted domains (no Wikipedia, gaming, etc)
-        for blacklisted in domain_blacklist:
-            if blacklisted in domain:
-                return False
-
-        # WHITELIST event platforms (strongly preferred)
-        event_whitelist = ["outsavvy", "eventbrite", "moonlight", "londonlgbtq",
-                          "designmynight", "eventim", "ticketmaster"]
-        for whitelisted in event_whitelist:
-            if whitelisted in domain:
-                return True
-
-        # Accept social platforms (Instagram, Facebook for announcements)
-        social = ["instagram", "facebook", "twitter", "x.com"]
-        for soc in social:
-            if soc in domain:
-                return True
+        if classify_host(domain) == "block":
+            return False
+
+        # WHITELIST event and social platforms (one automaton walk)
+        if is_event_source(domain):
+            return True
 
         return True  # Other sources OK if they pass keyword checks
 
-    def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace("www.", "").lower()
-            return domain
-        except:
-            return ""
-
-    def _is_likely_event(self, text: str) -> bool:
-        """Check if content appears to be an actual event"""
-        text_lower = text.lower()
-
-        # Negative indicators (NOT an event)
-        non_event_terms = [
-            "musician", "band", "game", "character",
-            "tv show", "movie", "film", "wikipedia",
-            "tutorial", "guide", "tips", "tricks",
-        ]
-        for term in non_event_terms:
-            if term in text_lower:
-                # Unless it has clear event indicators
-                event_terms = ["event", "party", "night", "club", "gather",
-                              "show", "performance", "live", "date:"]
-                if not any(et in text_lower for et in event_terms):
-                    return False
-
-        # Positive indicators (IS an event)
-        event_terms = [
-            "event", "party", "night", "club", "gathering", "gathering",
-            "show", "performance", "live", "happening", "gig",
-            "club night", "celebration", "festival", "pride",
-        ]
-        return any(term in text_lower for term in event_terms)
+    def _is_likely_event(self, text_lower: str) -> bool:
+        """Check if (already lowercased) content appears to be an actual event
 
-    async def discover_from_search(self) -> List[DiscoveredEvent]:
-        """Discover events via web search"""
+        Needs a positive indicator, and any negative indicator (band, game,
+        ...) must be outweighed by a clear event indicator. Tested positive
+        first so real events rarely reach the negative scan.
+        """
+        if not self._EVENT_RE.search(text_lower):
+            return False
+        if self._EVENT_OVERRIDE_RE.search(text_lower):
+            return True
+        return not self._NON_EVENT_RE.search(text_lower)
+
+    async def discover_from_search(self, skip_stored: bool = False) -> List[DiscoveredEvent]:
+        """Discover events via web search, optionally dropping already-stored URLs first"""
         print("[EventsAgent] Searching for QTIPOC events...")
 
-        results = await self.search.search_qtipoc_events()
+        results = _unique_by_url(await self.search.search_qtipoc_events())
         print(f"[EventsAgent] Found {len(results)} search results")
+        if skip_stored:
+            unseen = await self.db.filter_unseen_urls("events", [r.url for r in results])
+            results = [r for r in results if r.url in unseen]
+            print(f"[EventsAgent] {len(results)} not yet stored")
 
         events = []
+        accepted = []
         rejected = []
 
-        for result in results:
-            combined_text = f"{result.title} {result.snippet}"
+        # Lowercased once per result and shared by every filter below
+        texts = [f"{r.title} {r.snippet}".lower() for r in results]
+        masks = keyword_masks(texts, lowered=True)
+
+        for result, text_lower, mask in zip(results, texts, masks):
 
             # Filter 1: Domain validation
             if not self._is_domain_acceptable(result.url):
@@ -352,34 +612,43 @@ class EventsDiscoveryAgent:
                 continue
 
             # Filter 2: Check if it's actually an event (not a band/musician/game)
-            if not self._is_likely_event(combined_text):
+            if not self._is_likely_event(text_lower):
                 rejected.append((result, "not_event"))
                 continue
 
             # Filter 3: Must contain relevant keywords
-            text_lower = combined_text.lower()
-            has_black = any(kw in text_lower for kw in black_keywords)
-            has_lgbtq = any(kw in text_lower for kw in lgbtq_keywords)
-            has_uk = any(kw in text_lower for kw in uk_keywords)
+            has_black = bool(mask & CATEGORY_MASKS["black"])
+            has_lgbtq = bool(mask & CATEGORY_MASKS["lgbtq"])
+            has_uk = bool(mask & CATEGORY_MASKS["uk"])
 
             # Events need stronger relevance (both Black AND LGBTQ+)
             if not (has_black and has_lgbtq):
                 rejected.append((result, "weak_keywords"))
                 continue
 
-            # Extract date from title, snippet, or URL using LLM
-            extracted_date = await self._extract_date_from_text(
-                f"Title: {result.title}\nURL: {result.url}\nSnippet: {result.snippet}"
-            )
-
             # Determine relevance score based on filters passed
-            if any(kw in text_lower for kw in high_relevance_keywords):
+            if mask & CATEGORY_MASKS["high"]:
                 relevance = 95
             elif has_black and has_lgbtq and has_uk:
                 relevance = 85
             else:
                 relevance = 75
 
+            accepted.append((result, relevance))
+
+        # Extract dates from title, snippet, or URL using LLM - all accepted
+        # results at once instead of one round-trip after another
+        llm_slots = asyncio.Semaphore(self.llm_concurrency)
+
+        async def extract_date(result: SearchResult) -> Optional[str]:
+            async with llm_slots:
+                return await self._extract_date_from_text(
+                    f"Title: {result.title}\nURL: {result.url}\nSnippet: {result.snippet}"
+                )
+
+        dates = await asyncio.gather(*(extract_date(result) for result, _ in accepted))
+
+        for (result, relevance), extracted_date in zip(accepted, dates):
             # Extract basic event info
             events.append(DiscoveredEvent(
                 name=result.title,
@@ -395,7 +664,11 @@ class EventsDiscoveryAgent:
         return events
 
     async def _extract_date_from_text(self, text: str) -> Optional[str]:
-        """Extract event date from text using LLM"""
+        """Extract event date from text, asking the LLM only when no explicit date is present"""
+        explicit = _regex_event_date(text)
+        if explicit:
+            return explicit
+
         try:
             prompt = f"""Extract the event date from this text. Return ONLY the date in ISO format (YYYY-MM-DD) or "none" if no date found.
 
@@ -427,29 +700,33 @@ Date (YYYY-MM-DD or "none"):"""
         """Discover events by scraping platforms"""
         print("[EventsAgent] Scraping event platforms...")
 
-        events = []
-        async with ScraperAgent(headless=True) as scraper:
-            scraped = await scraper.scrape_all_platforms()
-            print(f"[EventsAgent] Scraped {len(scraped)} events")
-
-            for item in scraped:
-                events.append(DiscoveredEvent(
-                    name=item.name,
-                    url=item.url,
-                    venue=item.venue,
-                    date=item.date,
-                    price=item.price,
-                    description=item.description,
-                    source_platform=item.source_platform,
-                    relevance_score=75,  # Platform search pre-filtered
-                ))
-
-        return events
+        if self.scraper is not None and self.scraper.is_running:
+            scraped = await self.scraper.scrape_all_platforms()
+        else:
+            if self.scraper is not None:
+                print("[EventsAgent] Shared browser is down - using a one-off scraper")
+            async with ScraperAgent(headless=True) as scraper:
+                scraped = await scraper.scrape_all_platforms()
+        print(f"[EventsAgent] Scraped {len(scraped)} events")
+
+        return [
+            DiscoveredEvent(
+                name=item.name,
+                url=item.url,
+                venue=item.venue,
+                date=item.date,
+                price=item.price,
+                description=item.description,
+                source_platform=item.source_platform,
+                relevance_score=75,  # Platform search pre-filtered
+            )
+            for item in scraped
+        ]
 
-    async def discover_all(self) -> List[DiscoveredEvent]:
+    async def discover_all(self, skip_stored: bool = False) -> List[DiscoveredEvent]:
         """Discover events from all sources"""
         # Run search and scraping in parallel
-        search_task = self.discover_from_search()
+        search_task = self.discover_from_search(skip_stored=skip_stored)
         scrape_task = self.discover_from_scraping()
 
         search_results, scrape_results = await asyncio.gather(
@@ -468,40 +745,87 @@ Date (YYYY-MM-DD or "none"):"""
         else:
             print(f"[EventsAgent] Scrape error: {scrape_results}")
 
-        # Deduplicate by URL
-        seen_urls = set()
-        unique_events = []
+        # Deduplicate by URL, letting repeat listings fill in details
+        # (e.g. a scraped date) the first one lacked
+        merged: Dict[str, DiscoveredEvent] = {}
         for event in all_events:
-            if event.url not in seen_urls:
-                seen_urls.add(event.url)
-                unique_events.append(event)
+            existing = merged.get(event.url)
+            merged[event.url] = event if existing is None else _merge_event(existing, event)
 
+        # Then drop the same listing paraphrased on another platform
+        # (compared only against events on the same date)
+        near_dupes: Dict[Optional[str], SimHashIndex] = {}
+        unique_events = []
+        skipped = 0
+        for event in merged.values():
+            text = f"{event.name} {event.venue or ''} {event.description or ''}"
+            if len(text.split()) >= self.min_simhash_tokens:
+                fingerprint = simhash(text)
+                index = near_dupes.setdefault(event.date, SimHashIndex(k=3))
+                if fingerprint in index:
+                    skipped += 1
+                    continue
+                index.add(fingerprint)
+
+            unique_events.append(event)
+
+        if skipped:
+            print(f"[EventsAgent] Dropped {skipped} near-duplicate listings")
+
+        unique_events = await self._score_events(unique_events)
         print(f"[EventsAgent] Total unique events: {len(unique_events)}")
         return unique_events
 
+    async def _score_events(self, events: List[DiscoveredEvent]) -> List[DiscoveredEvent]:
+        """LLM relevance pass over discovered events, in concurrent batches
+
+        Events scoring below event_relevance_threshold are dropped. A batch
+        the LLM can't score (quota, API error) keeps its heuristic scores.
+        """
+        llm_slots = asyncio.Semaphore(self.llm_concurrency)
+
+        async def score_batch(batch: List[DiscoveredEvent]) -> List[DiscoveredEvent]:
+            try:
+                async with llm_slots:
+                    analyses = await self.llm.analyze_relevance_batch([
+                        {
+                            "title": e.name,
+                            "content": " ".join(filter(None, (e.date, e.venue, e.description))),
+                            "source": e.source_platform or "",
+                            "url": e.url,
+                        }
+                        for e in batch
+                    ])
+            except Exception as e:
+                print(f"[EventsAgent] LLM relevance error: {e} - keeping heuristic scores")
+                return batch
+
+            scored = []
+            for event, analysis in zip(batch, analyses):
+                if not analysis:
+                    scored.append(event)
+                elif analysis.get("relevance_score", 0) >= event_relevance_threshold:
+                    scored.append(replace(
+                        event,
+                        relevance_score=analysis["relevance_score"],
+                        tags=event.tags or analysis.get("suggested_tags"),
+                    ))
+            return scored
+
+        batches = await asyncio.gather(*(
+            score_batch(events[i:i + self.llm_batch_size])
+            for i in range(0, len(events), self.llm_batch_size)
+        ))
+        kept = [event for batch in batches for event in batch]
+        if len(kept) < len(events):
+            print(f"[EventsAgent] LLM rejected {len(events) - len(kept)} low-relevance events")
+        return kept
+
     async def discover_and_save(self) -> Dict[str, Any]:
         """Discover and save events to database"""
-        events = await self.discover_all()
-
-        # Convert to dict format
-        event_dicts = [
-            {
-                "name": e.name,
-                "url": e.url,
-                "venue": e.venue,
-                "city": e.city,
-                "date": e.date,
-                "price": e.price,
-                "description": e.description,
-                "source_platform": e.source_platform,
-                "relevance_score": e.relevance_score,
-                "event_type": e.event_type,
-                "tags": e.tags or [],
-            }
-            for e in events
-        ]
+        events = await self.discover_all(skip_stored=True)
 
-        stats = await self.db.insert_events_batch(event_dicts)
+        stats = await self.db.insert_events_batch(events)
         await self.db.log_discovery_run("events", {
             "total_found": len(events),
             **stats,
@@ -520,7 +844,28 @@ class PlanningAgent:
         self.news_agent = NewsResearchAgent()
         self.events_agent = EventsDiscoveryAgent()
         self.db = get_database()
-        self.ivor_sync = IVORSync()
+        self.ivor_sync = IVORSync(client=self.db.client)
+        self._scraper: Optional[ScraperAgent] = None
+
+    async def start(self):
+        """Launch the browser once for the life of the daemon"""
+        if self._scraper is None:
+            scraper = ScraperAgent(headless=True)
+            try:
+                await scraper.__aenter__()
+            except BaseException:
+                await scraper.__aexit__(None, None, None)  # Don't leak a half-started driver
+                raise
+            self._scraper = self.events_agent.scraper = scraper
+            print("[PlanningAgent] Browser started")
+
+    async def stop(self):
+        """Close the long-lived browser"""
+        if self._scraper is not None:
+            self.events_agent.scraper = None
+            scraper, self._scraper = self._scraper, None
+            await scraper.__aexit__(None, None, None)
+            print("[PlanningAgent] Browser stopped")
 
     async def run_daily_discovery(self) -> Dict[str, Any]:
         """Run daily news and events discovery"""
@@ -534,19 +879,27 @@ class PlanningAgent:
             "errors": [],
         }
 
-        # Run news research
-        try:
-            results["news"] = await self.news_agent.research_and_save(time_range="d")
-        except Exception as e:
-            results["errors"].append(f"News research failed: {str(e)}")
-            print(f"[PlanningAgent] News error: {e}")
+        # News and events are independent I/O-bound phases; they share the
+        # LLM rate limiter, so running them together can't overrun quota
+        news, events = await asyncio.gather(
+            self.news_agent.research_and_save(time_range="d"),
+            self.events_agent.discover_and_save(),
+            return_exceptions=True,
+        )
 
-        # Run events discovery
-        try:
-            results["events"] = await self.events_agent.discover_and_save()
-        except Exception as e:
-            results["errors"].append(f"Events discovery failed: {str(e)}")
-            print(f"[PlanningAgent] Events error: {e}")
+        if isinstance(news, Exception):
+            results["errors"].append(f"News research failed: {str(news)}")
+            print(f"[PlanningAgent] News error: {news}")
+        else:
+            results["news"] = news
+            if news.get("partial"):
+                results["errors"].append("News research hit the LLM quota; saved partial results")
+
+        if isinstance(events, Exception):
+            results["errors"].append(f"Events discovery failed: {str(events)}")
+            print(f"[PlanningAgent] Events error: {events}")
+        else:
+            results["events"] = events
 
         # Sync to IVOR intelligence - keeps IVOR informed of discoveries
         try:
@@ -557,6 +910,7 @@ class PlanningAgent:
             results["errors"].append(f"IVOR sync failed: {str(e)}")
             print(f"[PlanningAgent] IVOR sync error: {e}")
 
+        print(f"[PlanningAgent] LLM cache: {self.news_agent.llm.cache.stats}")
         print(f"[PlanningAgent] Daily discovery complete: {results}")
         return results
 
@@ -572,7 +926,12 @@ class PlanningAgent:
         }
 
         try:
-            results["news"] = await self.news_agent.research_and_save(time_range="m")
+            if batch_api_enabled():
+                # No latency requirement here: borderline articles are scored
+                # at Batch API prices and saved by collect_llm_batches()
+                results["news"] = await self.news_agent.research_and_submit_batch(time_range="m")
+            else:
+                results["news"] = await self.news_agent.research_and_save(time_range="m")
         except Exception as e:
             results["errors"].append(f"Deep research failed: {str(e)}")
 
@@ -0,0 +1,69 @@
+"""
+Control Socket - Trigger jobs on the running daemon without a cold start
+
+Kept free of agent imports so `main.py --run-now` can hand jobs to the
+daemon before paying for the heavy modules.
+"""
+
+import asyncio
+import json
+import os
+from typing import Callable, List, Optional
+
+JOB_TYPES = ("daily", "events", "weekly", "grants")
+
+
+def control_socket_path() -> str:
+    """Unix socket the daemon listens on for job triggers"""
+    return os.getenv("CONTROL_SOCKET", "/tmp/blkout-research-agent.sock")
+
+
+async def serve_control(
+    trigger: Callable[[List[str]], None],
+    path: Optional[str] = None,
+) -> asyncio.AbstractServer:
+    """Accept `{"jobs": [...]}` lines and hand valid job types to `trigger`"""
+    path = path or control_socket_path()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(await reader.readline())
+            jobs = [j for j in dict.fromkeys(request.get("jobs", [])) if j in JOB_TYPES]
+            if jobs:
+                trigger(jobs)
+            reply = {"accepted": jobs}
+        except (ValueError, AttributeError, TypeError) as e:
+            reply = {"error": f"Bad request: {e}"}
+
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    if os.path.exists(path):
+        if await send_jobs([], path) is not None:
+            raise RuntimeError(f"Another daemon is already listening on {path}")
+        os.unlink(path)  # Stale socket from an unclean shutdown
+
+    server = await asyncio.start_unix_server(handle, path=path)
+    os.chmod(path, 0o600)
+    print(f"[Control] Listening on {path}")
+    return server
+
+
+async def send_jobs(jobs: List[str], path: Optional[str] = None) -> Optional[List[str]]:
+    """Queue jobs on a running daemon
+
+    Returns the jobs it accepted, or None when no daemon is listening.
+    """
+    try:
+        reader, writer = await asyncio.open_unix_connection(path or control_socket_path())
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+    writer.write(json.dumps({"jobs": jobs}).encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline() or b"{}")
+    writer.close()
+    await writer.wait_closed()
+    return reply.get("accepted", [])
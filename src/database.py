@@ -2,25 +2,195 @@
 Database Client - Supabase integration for storing discovered content
 """
 
+import asyncio
 import os
+import re
 import hashlib
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, List, Dict, Any, Optional, Set
 from datetime import datetime
-from supabase import create_client, Client
+
+import httpx
+import orjson
+from supabase import AsyncClient, AsyncClientOptions
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential, wait_random
+
+from .dedup import BloomFilter
+from .rate_limit import CircuitBreaker
+
+if TYPE_CHECKING:
+    from .agents import DiscoveredArticle, DiscoveredEvent
+
+
+# Placeholder text event platforms put where a date should be
+_PLACEHOLDER_DATE_RE = re.compile("select|tba|tbd|coming soon|date not set", re.IGNORECASE)
+
+
+@lru_cache(maxsize=100_000)
+def _url_hash(url: str) -> str:
+    """md5 of the normalised URL; memoised since the same URLs recur across queries and runs
+
+    Mirrors the news_articles.url_hash generated column,
+    md5(lower(btrim(source_url))), so seen-filter probes match stored rows.
+    """
+    return hashlib.md5(url.strip(" ").lower().encode()).hexdigest()
+
+
+class _OrjsonHTTPClient(httpx.AsyncClient):
+    """httpx client that encodes `json=` bodies with orjson
+
+    PostgREST builders pass row payloads as `json=`, which httpx would
+    otherwise encode with the stdlib on the event loop thread.
+    """
+
+    def build_request(self, method, url, *, json=None, headers=None, **kwargs) -> httpx.Request:
+        if json is None or any(kwargs.get(k) is not None for k in ("content", "data", "files")):
+            return super().build_request(method, url, json=json, headers=headers, **kwargs)
+        headers = httpx.Headers(headers)
+        headers.setdefault("Content-Type", "application/json")
+        kwargs["content"] = orjson.dumps(json, default=str)
+        return super().build_request(method, url, headers=headers, **kwargs)
 
 
 class DatabaseClient:
     """Supabase client for BLKOUT content storage"""
 
+    # Number of recent rows used to seed the in-process seen filters
+    seen_snapshot_size = 10_000
+
+    # Rows per bulk upsert request, well under PostgREST's payload limit
+    upsert_chunk_size = 500
+
+    # Keys per in_() lookup, keeping the query string short
+    lookup_chunk_size = 100
+
+    # Column that identifies a stored URL, for confirming seen-filter hits
+    seen_key_columns = {"news_articles": "url_hash", "events": "url"}
+
+    # Discovery logs written per insert by the background writer
+    log_batch_size = 100
+
     def __init__(self):
-        self.client: Client = create_client(
+        # Async PostgREST client: queries await their HTTP round-trip
+        # instead of blocking the event loop the agents share. Requests
+        # multiplex over one pooled HTTP/2 connection kept alive between
+        # batches, rather than re-handshaking TLS for each one.
+        self.http_client = _OrjsonHTTPClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            follow_redirects=True,
+        )
+        self.client = AsyncClient(
             os.getenv("SUPABASE_URL", ""),
-            os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+            os.getenv("SUPABASE_SERVICE_ROLE_KEY", ""),
+            options=AsyncClientOptions(httpx_client=self.http_client),
         )
+        # url_hash filters: a miss means "not stored" without a round-trip;
+        # a hit is confirmed against the table. Seeded lazily from the DB.
+        self._seen_articles: Optional[BloomFilter] = None
+        self._seen_events: Optional[BloomFilter] = None
+        # Trips after repeated network failures so a Supabase outage fails
+        # each remaining call at once instead of after its retries
+        self.breaker = CircuitBreaker("Supabase")
+        # Monitoring rows are written off the agents' critical path
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_writer: Optional[asyncio.Task] = None
+
+    @retry(
+        retry=retry_if_exception_type(httpx.TransportError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.5, max=8) + wait_random(0, 1),
+        reraise=True,
+    )
+    async def _execute(self, query):
+        """Run an idempotent query (select / ignore-duplicates upsert), retrying network errors"""
+        self.breaker.check()
+        try:
+            result = await query.execute()
+        except httpx.TransportError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
 
     def _generate_hash(self, url: str) -> str:
         """Generate URL hash for deduplication"""
-        return hashlib.md5(url.lower().strip().encode()).hexdigest()
+        return _url_hash(url)
+
+    async def _articles_seen(self) -> BloomFilter:
+        """news_articles seen filter, seeded on first use"""
+        if self._seen_articles is None:
+            self._seen_articles = await self._load_seen_filter("news_articles", "url_hash", "created_at")
+        return self._seen_articles
+
+    async def _events_seen(self) -> BloomFilter:
+        """events seen filter, seeded on first use"""
+        if self._seen_events is None:
+            # events has no url_hash column - hash the stored URLs instead
+            self._seen_events = await self._load_seen_filter("events", "url", "date")
+        return self._seen_events
+
+    async def filter_unseen_urls(self, table: str, urls: Iterable[str]) -> Set[str]:
+        """Return the URLs not already stored in `table` ("news_articles" or "events")
+
+        Lets agents drop stored items before spending filter/LLM work on them.
+        Seen-filter misses need no query. Hits are confirmed with one lookup,
+        because a false positive (about 1 in 10,000) would otherwise drop a
+        new URL on every run.
+        """
+        seen = await (self._articles_seen() if table == "news_articles" else self._events_seen())
+        unseen, maybe = set(), {}
+        for url in urls:
+            url_hash = self._generate_hash(url)
+            if url_hash in seen:
+                maybe[url] = url_hash
+            else:
+                unseen.add(url)
+
+        if maybe:
+            try:
+                stored = await self._stored_urls(table, maybe)
+            except Exception as e:
+                print(f"[DB] Could not confirm seen {table} URLs, skipping them this run: {e}")
+                stored = set(maybe)
+            unseen.update(url for url in maybe if url not in stored)
+        return unseen
+
+    async def _stored_urls(self, table: str, urls: Dict[str, str]) -> Set[str]:
+        """Of `urls` (url -> url_hash), the ones `table` really holds"""
+        column = self.seen_key_columns[table]
+        by_key: Dict[str, List[str]] = {}
+        for url, url_hash in urls.items():
+            by_key.setdefault(url_hash if column == "url_hash" else url, []).append(url)
+
+        keys = list(by_key)
+        stored = set()
+        for start in range(0, len(keys), self.lookup_chunk_size):
+            result = await self._execute(
+                self.client.table(table).select(column)
+                .in_(column, keys[start:start + self.lookup_chunk_size])
+            )
+            for row in result.data or []:
+                stored.update(by_key.get(row.get(column), ()))
+        return stored
+
+    async def _load_seen_filter(self, table: str, column: str, order_by: str) -> BloomFilter:
+        """Seed a Bloom filter from the most recent rows of a table"""
+        seen = BloomFilter()
+        try:
+            result = await self._execute(
+                self.client.table(table).select(column)
+                .order(order_by, desc=True)
+                .limit(self.seen_snapshot_size)
+            )
+            for row in result.data or []:
+                value = row.get(column)
+                if value:
+                    seen.add(value if column == "url_hash" else self._generate_hash(value))
+        except Exception as e:
+            print(f"[DB] Could not seed {table} seen filter: {e}")
+        return seen
 
     # =========================================================================
     # NEWS ARTICLES
@@ -29,52 +199,77 @@ class DatabaseClient:
     async def article_exists(self, url: str) -> bool:
         """Check if article already exists"""
         url_hash = self._generate_hash(url)
-        result = self.client.table("news_articles").select("id").eq("url_hash", url_hash).execute()
+        result = await self.client.table("news_articles").select("id").eq("url_hash", url_hash).execute()
         return len(result.data) > 0
 
-    async def insert_article(self, article: Dict[str, Any]) -> Optional[str]:
-        """Insert a new article"""
-        url_hash = self._generate_hash(article.get("source_url", ""))
-
-        # Check for duplicate
-        if await self.article_exists(article.get("source_url", "")):
-            return None
-
-        data = {
-            "title": article.get("title", "")[:500],
-            "excerpt": article.get("excerpt", "")[:1000],
-            "content": article.get("content", ""),
-            "source_url": article.get("source_url", ""),
-            "source_name": article.get("source_name", ""),
-            "author": article.get("author", ""),
-            "published_at": article.get("published_date") or datetime.utcnow().isoformat(),
-            "featured_image": article.get("image_url"),
-            "category": article.get("category", "news"),
-            "interest_score": min(100, article.get("relevance_score", 50)),
-            "url_hash": url_hash,
+    def _article_row(self, article: "DiscoveredArticle") -> Dict[str, Any]:
+        """Map a discovered article onto the news_articles schema
+
+        url_hash is left out: Postgres generates it from source_url.
+        """
+        return {
+            "title": article.title[:500],
+            "excerpt": article.snippet[:1000],
+            "content": "",
+            "source_url": article.url,
+            "source_name": article.source,
+            "author": "",
+            "published_at": article.published_date or datetime.utcnow().isoformat(),
+            "featured_image": None,
+            "category": article.category,
+            "interest_score": min(100, article.relevance_score),
             "status": "review",  # Requires human review before publishing
             "published": False,
             "moderation_status": "pending",
-            "topics": article.get("tags", []),
+            "topics": article.tags or [],
             "discovery_method": "research_agent",
         }
 
-        result = self.client.table("news_articles").insert(data).execute()
-        return result.data[0]["id"] if result.data else None
+    async def insert_article(self, article: "DiscoveredArticle") -> Optional[str]:
+        """Insert a new article; returns None if it already exists
 
-    async def insert_articles_batch(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Insert multiple articles, skipping duplicates"""
-        inserted = 0
-        skipped = 0
+        The unique url_hash index makes the duplicate check atomic and
+        saves the separate exists() round-trip.
+        """
+        data = self._article_row(article)
+        result = await self._execute(self.client.table("news_articles").upsert(
+            data, on_conflict="url_hash", ignore_duplicates=True
+        ))
+        return result.data[0]["id"] if result.data else None
 
+    async def insert_articles_batch(self, articles: Iterable["DiscoveredArticle"]) -> Dict[str, int]:
+        """Insert multiple articles, skipping duplicates
+
+        Rows go out as chunked bulk upserts; Postgres drops the duplicates
+        via the unique url_hash index, so each chunk is one round-trip
+        instead of two per article. Callers have already dropped stored
+        URLs with filter_unseen_urls, so the seen filter isn't consulted
+        here (a false positive would lose the row).
+        """
+        seen = await self._articles_seen()
+        rows = {}
+        total = 0
         for article in articles:
-            result = await self.insert_article(article)
-            if result:
-                inserted += 1
-            else:
-                skipped += 1
+            total += 1
+            url_hash = self._generate_hash(article.url)
+            if url_hash not in rows:
+                rows[url_hash] = self._article_row(article)
+
+        inserted = await self._upsert_new("news_articles", list(rows.values()), "url_hash")
+        seen.update(rows)
+        return {"inserted": inserted, "skipped": total - inserted}
 
-        return {"inserted": inserted, "skipped": skipped}
+    async def _upsert_new(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> int:
+        """Bulk insert rows, ignoring conflicts on `on_conflict`; returns rows inserted"""
+        inserted = 0
+        for start in range(0, len(rows), self.upsert_chunk_size):
+            result = await self._execute(self.client.table(table).upsert(
+                rows[start:start + self.upsert_chunk_size],
+                on_conflict=on_conflict,
+                ignore_duplicates=True,
+            ))
+            inserted += len(result.data or [])
+        return inserted
 
     # =========================================================================
     # EVENTS
@@ -83,93 +278,112 @@ class DatabaseClient:
     async def event_exists(self, url: str) -> bool:
         """Check if event already exists"""
         url_hash = self._generate_hash(url)
-        result = self.client.table("events").select("id").eq("url_hash", url_hash).execute()
+        result = await self.client.table("events").select("id").eq("url_hash", url_hash).execute()
         return len(result.data) > 0
 
-    async def insert_event(self, event: Dict[str, Any]) -> Optional[str]:
-        """Insert a new event"""
+    def _event_row(self, event: "DiscoveredEvent") -> Optional[Dict[str, Any]]:
+        """Map a discovered event onto the events schema, or None if its date is unusable"""
 
         # CRITICAL: Skip events without valid date (database constraint)
-        event_date = event.get("date") or event.get("start_date")
+        event_date = event.date
         if not event_date:
-            print(f"[DB] Skipping event without date: {event.get('name', 'Unknown')[:50]}")
+            print(f"[DB] Skipping event without date: {event.name[:50]}")
             return None
 
         # Validate date format - reject placeholder text
         event_date_str = str(event_date).strip()
         if not event_date_str or len(event_date_str) < 10:
-            print(f"[DB] Skipping event with invalid date '{event_date_str}': {event.get('name', 'Unknown')[:50]}")
+            print(f"[DB] Skipping event with invalid date '{event_date_str}': {event.name[:50]}")
             return None
 
         # Reject placeholder/invalid date strings
-        invalid_dates = ["select", "tba", "tbd", "coming soon", "date not set"]
-        if any(invalid in event_date_str.lower() for invalid in invalid_dates):
-            print(f"[DB] Skipping event with placeholder date '{event_date_str}': {event.get('name', 'Unknown')[:50]}")
+        if _PLACEHOLDER_DATE_RE.search(event_date_str):
+            print(f"[DB] Skipping event with placeholder date '{event_date_str}': {event.name[:50]}")
             return None
 
         # Validate ISO-like format (YYYY-MM-DD)
         try:
-            from datetime import datetime
             # Try parsing as ISO date
             datetime.fromisoformat(event_date_str.split('T')[0])
         except (ValueError, AttributeError):
-            print(f"[DB] Skipping event with unparseable date '{event_date_str}': {event.get('name', 'Unknown')[:50]}")
-            return None
-
-        url_hash = self._generate_hash(event.get("url", ""))
-
-        # Check for duplicate
-        if await self.event_exists(event.get("url", "")):
+            print(f"[DB] Skipping event with unparseable date '{event_date_str}': {event.name[:50]}")
             return None
 
         # Map to actual events table schema
         # Actual columns: id, title, date, description, location, virtual_link, organizer,
         #                 source, tags, url, cost, start_time, end_time, end_date, status
         # Combine address info into location field
-        location_parts = []
-        if event.get("venue"):
-            location_parts.append(event.get("venue"))
-        if event.get("address"):
-            location_parts.append(event.get("address"))
-        if event.get("city"):
-            location_parts.append(event.get("city"))
-
+        location_parts = [part for part in (event.venue, event.city) if part]
         location = ", ".join(location_parts) if location_parts else "Location TBA"
 
-        data = {
-            "title": event.get("name", "")[:500],
-            "description": event.get("description", ""),
-            "url": event.get("url", ""),
-            "location": location,  # Combined address/venue/city
+        return {
+            "title": event.name[:500],
+            "description": event.description,
+            "url": event.url,
+            "location": location,  # Combined venue/city
             "date": event_date,  # Required field - validated above
-            "start_time": event.get("start_time"),
-            "end_time": event.get("end_time"),
-            "end_date": event.get("end_date"),
-            "cost": event.get("price"),
-            "organizer": event.get("organizer"),
-            "source": event.get("source_platform", "research_agent"),
-            "tags": event.get("tags", []),
+            "start_time": None,
+            "end_time": None,
+            "end_date": None,
+            "cost": event.price,
+            "organizer": None,
+            "source": event.source_platform,
+            "tags": event.tags or [],
             "status": "pending",  # Goes to moderation queue (draft not allowed by constraint)
             # Note: url_hash, image_url, relevance_score, discovery_method columns don't exist
             # These features need to be added via database migration if needed
         }
 
-        result = self.client.table("events").insert(data).execute()
+    async def insert_event(self, event: "DiscoveredEvent") -> Optional[str]:
+        """Insert a new event; returns None if it already exists or has no usable date"""
+        data = self._event_row(event)
+        if data is None:
+            return None
+
+        result = await self._execute(self.client.table("events").upsert(
+            data, on_conflict="url", ignore_duplicates=True
+        ))
         return result.data[0]["id"] if result.data else None
 
-    async def insert_events_batch(self, events: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Insert multiple events, skipping duplicates"""
-        inserted = 0
-        skipped = 0
+    async def insert_events_batch(self, events: Iterable["DiscoveredEvent"]) -> Dict[str, int]:
+        """Insert multiple events, skipping duplicates and undated events
 
+        Same chunked bulk upsert as articles, deduplicated on the unique url.
+        """
+        seen = await self._events_seen()
+        rows = {}
+        total = 0
         for event in events:
-            result = await self.insert_event(event)
-            if result:
-                inserted += 1
-            else:
-                skipped += 1
+            total += 1
+            url_hash = self._generate_hash(event.url)
+            if url_hash in rows:
+                continue
+            row = self._event_row(event)
+            if row is not None:
+                rows[url_hash] = row
+
+        inserted = await self._upsert_new("events", list(rows.values()), "url")
+        seen.update(rows)
+        return {"inserted": inserted, "skipped": total - inserted}
 
-        return {"inserted": inserted, "skipped": skipped}
+    # =========================================================================
+    # GRANTS
+    # =========================================================================
+
+    async def insert_grants_batch(self, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert grant rows, skipping ones already stored
+
+        Bulk upsert against the unique application_url index: Postgres
+        drops grants we already have, so there is no lookup per grant.
+        """
+        unique = {}
+        total = 0
+        for row in rows:
+            total += 1
+            unique.setdefault(row["application_url"], row)
+
+        inserted = await self._upsert_new("grants", list(unique.values()), "application_url")
+        return {"inserted": inserted, "skipped": total - inserted}
 
     # =========================================================================
     # DISCOVERY LOGS
@@ -180,8 +394,12 @@ class DatabaseClient:
         run_type: str,
         stats: Dict[str, Any],
         errors: List[str] = None,
-    ) -> str:
-        """Log a discovery run for monitoring"""
+    ) -> None:
+        """Log a discovery run for monitoring
+
+        Only queues the row; a background task inserts queued logs in
+        batches, so the run returns without waiting on the write.
+        """
         data = {
             "run_type": run_type,  # "news" | "events" | "deep_research"
             "started_at": datetime.utcnow().isoformat(),
@@ -190,9 +408,67 @@ class DatabaseClient:
             "status": "completed" if not errors else "completed_with_errors",
         }
 
-        result = self.client.table("discovery_logs").insert(data).execute()
+        if self._log_writer is None or self._log_writer.done():
+            # (Re)started lazily: a queue and task belong to the running loop
+            self._log_queue = asyncio.Queue(maxsize=1000)
+            self._log_writer = asyncio.create_task(self._write_logs())
+        try:
+            self._log_queue.put_nowait(data)
+        except asyncio.QueueFull:
+            print(f"[Database] Log queue full, dropping {run_type} log")
+
+    async def _write_logs(self):
+        """Insert queued discovery logs, one multi-row insert per drain"""
+        while True:
+            rows = [await self._log_queue.get()]
+            while len(rows) < self.log_batch_size and not self._log_queue.empty():
+                rows.append(self._log_queue.get_nowait())
+            try:
+                await self.client.table("discovery_logs").insert(rows).execute()
+            except Exception as e:
+                print(f"[Database] Error writing {len(rows)} discovery logs: {e}")
+            finally:
+                for _ in rows:
+                    self._log_queue.task_done()
+
+    async def flush_logs(self):
+        """Wait until every queued discovery log has been written"""
+        if self._log_writer is not None and not self._log_writer.done():
+            await self._log_queue.join()
+
+    async def log_llm_batch(self, batch_id: str, candidates: List[Dict[str, Any]]) -> Optional[str]:
+        """Record a submitted LLM batch and the candidates it scores
+
+        Kept in discovery_logs as a "pending" run until the results are saved.
+        """
+        data = {
+            "run_type": "deep_research_batch",
+            "started_at": datetime.utcnow().isoformat(),
+            "stats": {"batch_id": batch_id, "candidates": candidates},
+            "errors": [],
+            "status": "pending",
+        }
+
+        result = await self.client.table("discovery_logs").insert(data).execute()
         return result.data[0]["id"] if result.data else None
 
+    async def pending_llm_batches(self) -> List[Dict[str, Any]]:
+        """Submitted LLM batches whose results have not been saved yet"""
+        result = await self.client.table("discovery_logs")\
+            .select("id, stats")\
+            .eq("run_type", "deep_research_batch")\
+            .eq("status", "pending")\
+            .execute()
+        return result.data or []
+
+    async def finish_llm_batch(self, log_id: str, stats: Dict[str, Any], errors: List[str] = None):
+        """Mark a pending LLM batch as collected"""
+        await self.client.table("discovery_logs").update({
+            "stats": stats,
+            "errors": errors or [],
+            "status": "completed" if not errors else "completed_with_errors",
+        }).eq("id", log_id).execute()
+
 
 # Singleton
 _db: Optional[DatabaseClient] = None
@@ -0,0 +1,98 @@
+"""
+Deduplication helpers - in-process filters that avoid database round-trips
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex digests (e.g. url_hash values)
+
+    Keys are expected to already be uniformly distributed hex digests, so
+    bit positions are derived from the digest itself with double hashing
+    instead of hashing again. A miss is definitive; a hit may be a false
+    positive at roughly `error_rate`.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 1e-4):
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        h1 = int(key[:16], 16)
+        h2 = int(key[16:32], 16) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over lowercased word unigrams and bigrams
+
+    Paraphrases of the same text land within a few bits of each other,
+    so near-duplicates are found by Hamming distance instead of equality.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    weights = [0] * 64
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += count if (h >> bit) & 1 else -count
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class SimHashIndex:
+    """Near-duplicate lookup for SimHash fingerprints within `k` bits
+
+    Fingerprints are split into k + 1 bands; by pigeonhole two fingerprints
+    within k bits share at least one band exactly, so only that band's
+    bucket is compared.
+    """
+
+    def __init__(self, k: int = 3):
+        self.k = k
+        self.num_bands = k + 1
+        self.band_bits = 64 // self.num_bands
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.num_bands)]
+
+    def _bands(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        for i in range(self.num_bands):
+            yield i, (fingerprint >> (i * self.band_bits)) & mask
+
+    def add(self, fingerprint: int) -> None:
+        for i, band in self._bands(fingerprint):
+            self._buckets[i].setdefault(band, []).append(fingerprint)
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Return a stored fingerprint within k bits, if any"""
+        for i, band in self._bands(fingerprint):
+            for other in self._buckets[i].get(band, ()):
+                if (fingerprint ^ other).bit_count() <= self.k:
+                    return other
+        return None
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return self.find(fingerprint) is not None
@@ -10,6 +10,8 @@ Discovers grant opportunities relevant to BLKOUT's mission:
 """
 
 import asyncio
+import orjson
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -19,23 +21,40 @@ from .search import SearchAgent
 from .database import get_database
 from .notifications import get_notifier
 
-import sys
-sys.path.append("..")
+from configs.blkout_config import extract_domain
 from configs.grants_config import (
     grant_search_queries,
-    funder_websites,
-    high_relevance_keywords,
-    lgbtq_keywords,
-    black_keywords,
-    arts_keywords,
-    community_wealth_keywords,
+    FUNDER_DOMAINS,
+    GRANT_CATEGORY_MASKS,
+    grant_keyword_mask,
     relevance_threshold,
     funder_types,
     program_areas,
 )
 
 
-@dataclass
+GRANT_ANALYSIS_SYSTEM_PROMPT = f"""Analyze grant opportunities for BLKOUT - a community-owned liberation platform for Black queer men in the UK.
+
+BLKOUT's focus areas:
+- Black LGBTQ+ community wellbeing and connection
+- Participatory arts and storytelling
+- Community wealth building / cooperative ownership
+- Independent media and journalism
+- Gender justice and trans inclusion
+
+Return JSON with:
+- relevance_score: number 0-100
+- fit_reasoning: why this is/isn't a good fit for BLKOUT
+- funder_type: one of {", ".join(funder_types)}
+- program_area: one of {", ".join(program_areas)}
+- estimated_amount_range: e.g. "5000-20000" or "unknown"
+- deadline_mentioned: date if found, else null
+- priority: "high" | "medium" | "low"
+- tags: list of relevant tags
+"""
+
+
+@dataclass(slots=True)
 class DiscoveredGrant:
     """A discovered grant opportunity"""
     title: str
@@ -53,9 +72,61 @@ class DiscoveredGrant:
     tags: List[str] = None
 
 
+@lru_cache(maxsize=4096)
+def _quick_grant_score(text: str) -> int:
+    """Keyword score for a grant's title + snippet
+
+    Memoized: the same listings come back from several of the grant
+    queries in a run, and the score depends only on the text.
+    """
+    mask = grant_keyword_mask(text.lower())
+
+    # Check for high-relevance intersectional terms
+    if mask & GRANT_CATEGORY_MASKS["high"]:
+        return 95
+
+    # Check category combinations
+    has_lgbtq = bool(mask & GRANT_CATEGORY_MASKS["lgbtq"])
+    has_black = bool(mask & GRANT_CATEGORY_MASKS["black"])
+    has_arts = bool(mask & GRANT_CATEGORY_MASKS["arts"])
+    has_coop = bool(mask & GRANT_CATEGORY_MASKS["community_wealth"])
+
+    # Scoring based on alignment
+    score = 30  # Base score for any grant
+
+    if has_lgbtq and has_black:
+        score = 90  # Perfect intersectional fit
+    elif has_lgbtq:
+        score += 25
+    elif has_black:
+        score += 25
+
+    if has_arts:
+        score += 15
+    if has_coop:
+        score += 15
+
+    # Check for "open" or "deadline" indicating active opportunity
+    if mask & GRANT_CATEGORY_MASKS["active"]:
+        score += 10
+
+    return min(100, score)
+
+
 class GrantResearchAgent:
     """Agent for discovering grant funding opportunities"""
 
+    # (display name, lowercased match key) for funder extraction
+    KNOWN_FUNDERS = tuple((name, name.lower()) for name in (
+        "National Lottery", "Arts Council", "Tudor Trust", "Esmée Fairbairn",
+        "Paul Hamlyn", "Comic Relief", "Joseph Rowntree", "Lankelly Chase",
+        "Baring Foundation", "City Bridge", "Trust for London", "Power to Change",
+        "Elton John", "LGBT Foundation", "Stonewall",
+    ))
+
+    # LLM grant analyses in flight at once
+    llm_concurrency = 10
+
     def __init__(self):
         self.llm = get_llm_client()
         self.search = SearchAgent(max_results=15)
@@ -63,76 +134,29 @@ class GrantResearchAgent:
 
     def _quick_relevance_check(self, text: str) -> int:
         """Fast keyword-based relevance check"""
-        text_lower = text.lower()
-
-        # Check for high-relevance intersectional terms
-        for term in high_relevance_keywords:
-            if term in text_lower:
-                return 95
-
-        # Check category combinations
-        has_lgbtq = any(kw in text_lower for kw in lgbtq_keywords)
-        has_black = any(kw in text_lower for kw in black_keywords)
-        has_arts = any(kw in text_lower for kw in arts_keywords)
-        has_coop = any(kw in text_lower for kw in community_wealth_keywords)
-
-        # Scoring based on alignment
-        score = 30  # Base score for any grant
-
-        if has_lgbtq and has_black:
-            score = 90  # Perfect intersectional fit
-        elif has_lgbtq:
-            score += 25
-        elif has_black:
-            score += 25
-
-        if has_arts:
-            score += 15
-        if has_coop:
-            score += 15
-
-        # Check for "open" or "deadline" indicating active opportunity
-        if "open" in text_lower or "deadline" in text_lower or "apply" in text_lower:
-            score += 10
-
-        return min(100, score)
+        return _quick_grant_score(text)
 
     async def _analyze_grant_with_llm(self, title: str, snippet: str, url: str) -> Dict[str, Any]:
-        """Use LLM to analyze grant fit for BLKOUT"""
-        prompt = f"""Analyze this grant opportunity for BLKOUT - a community-owned liberation platform for Black queer men in the UK.
+        """Use LLM to analyze grant fit for BLKOUT
 
-BLKOUT's focus areas:
-- Black LGBTQ+ community wellbeing and connection
-- Participatory arts and storytelling
-- Community wealth building / cooperative ownership
-- Independent media and journalism
-- Gender justice and trans inclusion
+        Exact repeats are served by the LLM client's cache; the same call
+        re-listed with a reworded snippet or on another site is matched
+        on title + description by the similarity tier.
+        """
+        similar_key = f"{title} {snippet}"
+        cached = self.llm.cache.get_similar("grant", similar_key)
+        if cached is not None:
+            return orjson.loads(cached)
 
-Grant: {title}
-Description: {snippet}
-URL: {url}
-
-Respond in JSON format:
-{{
-    "relevance_score": 0-100,
-    "fit_reasoning": "Why this is/isn't a good fit for BLKOUT",
-    "funder_type": "one of: trust_foundation, lottery, arts_council, lgbtq_specific, racial_justice, gender_justice, community_wealth, media_journalism, corporate, government",
-    "program_area": "one of: community_development, arts_culture, health_wellbeing, racial_justice, lgbtq_rights, gender_justice, media_communications, cooperative_economy, youth, mental_health, capacity_building, core_costs",
-    "estimated_amount_range": "e.g. '5000-20000' or 'unknown'",
-    "deadline_mentioned": "date if found, else null",
-    "priority": "high/medium/low",
-    "tags": ["relevant", "tags"]
-}}"""
+        # Only the grant itself varies; the mission and schema stay in the
+        # constant system prompt
+        prompt = f"Grant: {title}\nDescription: {snippet}\nURL: {url}"
 
         try:
-            response = await self.llm.complete(prompt)
-            # Parse JSON from response
-            import json
-            # Find JSON in response
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start >= 0 and end > start:
-                return json.loads(response[start:end])
+            # JSON mode returns the object directly - no scanning the reply for braces
+            analysis = await self.llm.complete_json(prompt, GRANT_ANALYSIS_SYSTEM_PROMPT)
+            self.llm.cache.set_similar("grant", similar_key, orjson.dumps(analysis).decode())
+            return analysis
         except Exception as e:
             print(f"[GrantAgent] LLM analysis error: {e}")
 
@@ -142,68 +166,57 @@ Respond in JSON format:
         """Execute grant research across all configured queries"""
         print(f"[GrantAgent] Starting research with {len(grant_search_queries)} queries...")
 
-        # Phase 1: Search
-        all_results = await self.search.multi_search(
-            grant_search_queries,
-            search_type="web",
-            time_range=time_range,
-        )
-        print(f"[GrantAgent] Found {len(all_results)} raw results")
+        # Search and LLM phases are pipelined: each query's results are
+        # filtered as soon as they arrive and high-confidence ones go
+        # straight to the LLM workers, so analysis overlaps the searches
+        # still being paced out
+        discovered = []
+        found = 0
+        candidates = 0
+        llm_queue: asyncio.Queue = asyncio.Queue()
 
-        # Phase 2: Quick filter
-        candidates = []
-        for result in all_results:
-            combined_text = f"{result.title} {result.snippet}"
-            quick_score = self._quick_relevance_check(combined_text)
-            if quick_score >= 40:  # Worth deeper analysis
-                candidates.append((result, quick_score))
+        async def llm_worker():
+            while (item := await llm_queue.get()) is not None:
+                result, quick_score = item
+                analysis = await self._analyze_grant_with_llm(result.title, result.snippet, result.url)
+                discovered.append(self._grant_from_analysis(result, quick_score, analysis))
 
-        print(f"[GrantAgent] {len(candidates)} candidates passed quick filter")
+        workers = [asyncio.create_task(llm_worker()) for _ in range(self.llm_concurrency)]
 
-        # Phase 3: LLM analysis for promising opportunities
-        discovered = []
-        for result, quick_score in candidates:
-            if quick_score >= 75:
-                # High confidence, do LLM analysis for details
-                analysis = await self._analyze_grant_with_llm(
-                    result.title, result.snippet, result.url
-                )
-
-                # Parse amount range
-                amount_min, amount_max = None, None
-                if analysis.get("estimated_amount_range") and analysis["estimated_amount_range"] != "unknown":
-                    try:
-                        parts = analysis["estimated_amount_range"].replace("£", "").replace(",", "").split("-")
-                        if len(parts) == 2:
-                            amount_min = float(parts[0].strip())
-                            amount_max = float(parts[1].strip())
-                    except:
-                        pass
-
-                discovered.append(DiscoveredGrant(
-                    title=result.title,
-                    funder_name=self._extract_funder_name(result.title, result.source),
-                    url=result.url,
-                    description=result.snippet,
-                    deadline=analysis.get("deadline_mentioned"),
-                    amount_min=amount_min,
-                    amount_max=amount_max,
-                    funder_type=analysis.get("funder_type", "trust_foundation"),
-                    program_area=analysis.get("program_area", "community_development"),
-                    relevance_score=analysis.get("relevance_score", quick_score),
-                    fit_reasoning=analysis.get("fit_reasoning", ""),
-                    tags=analysis.get("tags", []),
-                ))
-            elif quick_score >= relevance_threshold:
-                # Medium confidence, include with basic info
-                discovered.append(DiscoveredGrant(
-                    title=result.title,
-                    funder_name=self._extract_funder_name(result.title, result.source),
-                    url=result.url,
-                    description=result.snippet,
-                    relevance_score=quick_score,
-                    fit_reasoning="Keyword match - needs manual review",
-                ))
+        try:
+            async for batch in self.search.multi_search_stream(
+                grant_search_queries,
+                search_type="web",
+                time_range=time_range,
+            ):
+                found += len(batch)
+                for result in batch:
+                    quick_score = self._quick_relevance_check(f"{result.title} {result.snippet}")
+                    if quick_score < 40:
+                        continue
+
+                    # Worth deeper analysis
+                    candidates += 1
+                    if quick_score >= 75:
+                        # High confidence, LLM analysis adds the details
+                        llm_queue.put_nowait((result, quick_score))
+                    elif quick_score >= relevance_threshold:
+                        # Medium confidence, include with basic info
+                        discovered.append(DiscoveredGrant(
+                            title=result.title,
+                            funder_name=self._extract_funder_name(result.title, result.source, result.url),
+                            url=result.url,
+                            description=result.snippet,
+                            relevance_score=quick_score,
+                            fit_reasoning="Keyword match - needs manual review",
+                        ))
+        finally:
+            for _ in workers:
+                llm_queue.put_nowait(None)
+            await asyncio.gather(*workers)
+
+        print(f"[GrantAgent] Found {found} raw results")
+        print(f"[GrantAgent] {candidates} candidates passed quick filter")
 
         # Sort by relevance
         discovered.sort(key=lambda x: x.relevance_score, reverse=True)
@@ -211,19 +224,44 @@ Respond in JSON format:
 
         return discovered
 
-    def _extract_funder_name(self, title: str, source: str) -> str:
-        """Extract funder name from title or source"""
-        # Check against known funders
-        known_funders = [
-            "National Lottery", "Arts Council", "Tudor Trust", "Esmée Fairbairn",
-            "Paul Hamlyn", "Comic Relief", "Joseph Rowntree", "Lankelly Chase",
-            "Baring Foundation", "City Bridge", "Trust for London", "Power to Change",
-            "Elton John", "LGBT Foundation", "Stonewall",
-        ]
+    def _grant_from_analysis(self, result, quick_score: int, analysis: Dict[str, Any]) -> DiscoveredGrant:
+        """Build a grant from a search result and its LLM analysis"""
+        # Parse amount range
+        amount_min, amount_max = None, None
+        if analysis.get("estimated_amount_range") and analysis["estimated_amount_range"] != "unknown":
+            try:
+                parts = analysis["estimated_amount_range"].replace("£", "").replace(",", "").split("-")
+                if len(parts) == 2:
+                    amount_min = float(parts[0].strip())
+                    amount_max = float(parts[1].strip())
+            except:
+                pass
+
+        return DiscoveredGrant(
+            title=result.title,
+            funder_name=self._extract_funder_name(result.title, result.source, result.url),
+            url=result.url,
+            description=result.snippet,
+            deadline=analysis.get("deadline_mentioned"),
+            amount_min=amount_min,
+            amount_max=amount_max,
+            funder_type=analysis.get("funder_type", "trust_foundation"),
+            program_area=analysis.get("program_area", "community_development"),
+            relevance_score=analysis.get("relevance_score", quick_score),
+            fit_reasoning=analysis.get("fit_reasoning", ""),
+            tags=analysis.get("tags", []),
+        )
+
+    def _extract_funder_name(self, title: str, source: str, url: str = "") -> str:
+        """Extract funder name from the listing's site, title or source"""
+        # A page on a known funder's own site names its funder directly
+        funder = FUNDER_DOMAINS.get(extract_domain(url))
+        if funder:
+            return funder
 
         text = f"{title} {source}".lower()
-        for funder in known_funders:
-            if funder.lower() in text:
+        for funder, funder_lower in self.KNOWN_FUNDERS:
+            if funder_lower in text:
                 return funder
 
         # Default to source domain
@@ -233,43 +271,25 @@ Respond in JSON format:
         """Research and save grants to database"""
         grants = await self.research(time_range)
 
-        # Convert to dict format for database
-        inserted = 0
-        skipped = 0
-
-        for grant in grants:
-            try:
-                result = await self._insert_grant(grant)
-                if result:
-                    inserted += 1
-                else:
-                    skipped += 1
-            except Exception as e:
-                print(f"[GrantAgent] Insert error: {e}")
-                skipped += 1
+        result = {"inserted": 0, "skipped": len(grants)}
+        try:
+            result = await self.db.insert_grants_batch(self._grant_row(g) for g in grants)
+        except Exception as e:
+            print(f"[GrantAgent] Insert error: {e}")
 
         # Log the run
         await self.db.log_discovery_run("grants", {
             "total_found": len(grants),
-            "inserted": inserted,
-            "skipped": skipped,
+            **result,
         })
 
         return {
             "discovered": len(grants),
-            "inserted": inserted,
-            "skipped": skipped,
+            **result,
         }
 
-    async def _insert_grant(self, grant: DiscoveredGrant) -> Optional[str]:
-        """Insert a grant opportunity into the database"""
-        # Check for duplicate by URL
-        url_hash = self.db._generate_hash(grant.url)
-        existing = self.db.client.table("grants").select("id").eq("application_url", grant.url).execute()
-
-        if existing.data:
-            return None  # Already exists
-
+    def _grant_row(self, grant: DiscoveredGrant) -> Dict[str, Any]:
+        """Build the grants table row for a discovered grant"""
         data = {
             "title": grant.title[:500],
             "funder_name": grant.funder_name,
@@ -296,8 +316,7 @@ Respond in JSON format:
         if grant.amount_max:
             data["max_potential_budget"] = grant.amount_max
 
-        result = self.db.client.table("grants").insert(data).execute()
-        return result.data[0]["id"] if result.data else None
+        return data
 
 
 class GrantPlanningAgent:
@@ -334,11 +353,12 @@ class GrantPlanningAgent:
     async def _send_digest_email(self, run_stats: Dict[str, Any]) -> None:
         """Send email digest with new discoveries and top priorities"""
         try:
-            # Get newly discovered grants (last 24 hours, high relevance)
-            new_grants = await self._get_recent_discoveries()
-
-            # Get top 10 priority grants overall
-            top_priority = await self._get_top_priority_grants()
+            # Newly discovered high-relevance grants and the overall top 10
+            # are independent queries, fetched side by side
+            new_grants, top_priority = await asyncio.gather(
+                self._get_recent_discoveries(),
+                self._get_top_priority_grants(),
+            )
 
             # Send digest
             await self.notifier.send_grants_digest(
@@ -352,7 +372,7 @@ class GrantPlanningAgent:
     async def _get_recent_discoveries(self) -> list:
         """Get grants discovered in the last run"""
         try:
-            response = self.db.client.table("grants")\
+            response = await self.db.client.table("grants")\
                 .select("title, funder_name, application_url, deadline_date, fit_score, funder_advice, priority, notes")\
                 .eq("status", "researching")\
                 .gte("fit_score", 60)\
@@ -367,7 +387,7 @@ class GrantPlanningAgent:
     async def _get_top_priority_grants(self) -> list:
         """Get top 10 highest priority grant opportunities"""
         try:
-            response = self.db.client.table("grants")\
+            response = await self.db.client.table("grants")\
                 .select("title, funder_name, application_url, deadline_date, fit_score, funder_advice, priority")\
                 .neq("status", "declined")\
                 .neq("status", "submitted")\
@@ -387,7 +407,7 @@ class GrantPlanningAgent:
         today = datetime.utcnow().date().isoformat()
         month_ahead = (datetime.utcnow() + timedelta(days=30)).date().isoformat()
 
-        response = self.db.client.table("grants")\
+        response = await self.db.client.table("grants")\
             .select("title, funder_name, deadline_date, status, priority")\
             .gte("deadline_date", today)\
             .lte("deadline_date", month_ahead)\
@@ -5,21 +5,23 @@ Syncs discovered news and events to ivor_intelligence table,
 enabling IVOR to confidently discuss current community happenings.
 """
 
-import os
+import asyncio
 import json
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
-from supabase import create_client, Client
+from supabase import AsyncClient
+
+from .database import get_database
 
 
 class IVORSync:
     """Syncs research agent discoveries to IVOR's intelligence system."""
 
-    def __init__(self):
-        self.client: Client = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        )
+    def __init__(self, client: Optional[AsyncClient] = None):
+        # Share the database's async Supabase client (and its HTTP/2 pool)
+        # unless one is given
+        self.client = client or get_database().client
 
     async def sync_daily_discoveries(self, discovery_stats: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -32,20 +34,23 @@ class IVORSync:
             "errors": []
         }
 
-        try:
-            # Sync recent news summary
-            news_result = await self._sync_news_intelligence()
-            results["news_synced"] = news_result.get("success", False)
-
-            # Sync upcoming events summary
-            events_result = await self._sync_events_intelligence()
-            results["events_synced"] = events_result.get("success", False)
+        # News summary, events summary and run metadata are independent
+        # round-trips, so they run side by side
+        news_result, events_result, metadata_result = await asyncio.gather(
+            self._sync_news_intelligence(),
+            self._sync_events_intelligence(),
+            self._sync_discovery_metadata(discovery_stats),
+            return_exceptions=True,
+        )
 
-            # Sync discovery run metadata
-            await self._sync_discovery_metadata(discovery_stats)
+        for result in (news_result, events_result, metadata_result):
+            if isinstance(result, Exception):
+                results["errors"].append(str(result))
 
-        except Exception as e:
-            results["errors"].append(str(e))
+        if isinstance(news_result, dict):
+            results["news_synced"] = news_result.get("success", False)
+        if isinstance(events_result, dict):
+            results["events_synced"] = events_result.get("success", False)
 
         return results
 
@@ -58,7 +63,7 @@ class IVORSync:
             # Get recent high-relevance news (last 7 days)
             week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
 
-            response = self.client.table("news_articles")\
+            response = await self.client.table("news_articles")\
                 .select("title, excerpt, source_name, category, created_at")\
                 .eq("discovery_method", "research_agent")\
                 .gte("created_at", week_ago)\
@@ -72,10 +77,12 @@ class IVORSync:
                 return {"success": True, "message": "No recent news to sync"}
 
             # Build intelligence summary
+            categories = self._count_by_field(articles, "category")
+            sources = self._count_by_field(articles, "source_name")
             intelligence_data = {
                 "total_articles": len(articles),
-                "categories": self._count_by_field(articles, "category"),
-                "sources": self._count_by_field(articles, "source_name"),
+                "categories": categories,
+                "sources": sources,
                 "recent_headlines": [
                     {
                         "title": a["title"],
@@ -87,10 +94,10 @@ class IVORSync:
                 "last_updated": datetime.utcnow().isoformat()
             }
 
-            key_insights = self._extract_news_insights(articles)
+            key_insights = self._extract_news_insights(articles, categories, sources)
 
             # Upsert to ivor_intelligence
-            self.client.table("ivor_intelligence").upsert({
+            await self.client.table("ivor_intelligence").upsert({
                 "intelligence_type": "community_needs",
                 "ivor_service": "research_agent",
                 "ivor_endpoint": "/discovery/news",
@@ -126,7 +133,7 @@ class IVORSync:
             today = datetime.utcnow().date().isoformat()
             month_ahead = (datetime.utcnow() + timedelta(days=30)).date().isoformat()
 
-            response = self.client.table("events")\
+            response = await self.client.table("events")\
                 .select("title, description, date, location, organizer, source")\
                 .eq("discovery_method", "research_agent")\
                 .gte("date", today)\
@@ -141,10 +148,14 @@ class IVORSync:
                 return {"success": True, "message": "No upcoming events to sync"}
 
             # Build intelligence summary
+            locations = self._count_by_field(events, "location")
+            organizers = self._count_by_field(events, "organizer")
+            week_end = datetime.now(timezone.utc) + timedelta(days=7)
+            this_week = [e for e in events if self._is_this_week(e.get("date"), week_end)]
             intelligence_data = {
                 "total_events": len(events),
-                "locations": self._count_by_field(events, "location"),
-                "organizers": self._count_by_field(events, "organizer"),
+                "locations": locations,
+                "organizers": organizers,
                 "upcoming_events": [
                     {
                         "title": e["title"],
@@ -154,14 +165,14 @@ class IVORSync:
                     }
                     for e in events[:15]
                 ],
-                "this_week": [e for e in events if self._is_this_week(e.get("date"))],
+                "this_week": this_week,
                 "last_updated": datetime.utcnow().isoformat()
             }
 
-            key_insights = self._extract_events_insights(events)
+            key_insights = self._extract_events_insights(this_week, locations, organizers)
 
             # Upsert to ivor_intelligence
-            self.client.table("ivor_intelligence").upsert({
+            await self.client.table("ivor_intelligence").upsert({
                 "intelligence_type": "organizing_events",
                 "ivor_service": "research_agent",
                 "ivor_endpoint": "/discovery/events",
@@ -175,7 +186,7 @@ class IVORSync:
                 ],
                 "relevance_score": 0.90,
                 "priority": "high",
-                "urgency": "elevated" if len([e for e in events if self._is_this_week(e.get("date"))]) > 0 else "normal",
+                "urgency": "elevated" if this_week else "normal",
                 "data_timestamp": datetime.utcnow().isoformat(),
                 "expires_at": (datetime.utcnow() + timedelta(hours=12)).isoformat(),
                 "is_stale": False,
@@ -191,7 +202,7 @@ class IVORSync:
     async def _sync_discovery_metadata(self, stats: Dict[str, Any]) -> None:
         """Sync discovery run metadata for IVOR's awareness of agent activity."""
         try:
-            self.client.table("ivor_intelligence").upsert({
+            await self.client.table("ivor_intelligence").upsert({
                 "intelligence_type": "resources",
                 "ivor_service": "research_agent",
                 "ivor_endpoint": "/discovery/status",
@@ -220,36 +231,34 @@ class IVORSync:
 
     def _count_by_field(self, items: List[Dict], field: str) -> Dict[str, int]:
         """Count occurrences by field value."""
-        counts = {}
-        for item in items:
-            value = item.get(field, "Unknown")
-            if value:
-                counts[value] = counts.get(value, 0) + 1
-        return counts
-
-    def _is_this_week(self, date_str: Optional[str]) -> bool:
-        """Check if date is within this week."""
+        return dict(Counter(
+            value for value in (item.get(field, "Unknown") for item in items) if value
+        ))
+
+    def _is_this_week(self, date_str: Optional[str], week_end: datetime) -> bool:
+        """Check if date is before `week_end` (a UTC-aware boundary computed once per sync)."""
         if not date_str:
             return False
         try:
             date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            week_end = datetime.utcnow() + timedelta(days=7)
+            if date.tzinfo is None:
+                date = date.replace(tzinfo=timezone.utc)
             return date <= week_end
         except:
             return False
 
-    def _extract_news_insights(self, articles: List[Dict]) -> List[str]:
-        """Extract key insights from news articles."""
+    def _extract_news_insights(
+        self, articles: List[Dict], categories: Dict[str, int], sources: Dict[str, int]
+    ) -> List[str]:
+        """Extract key insights from news articles and their precomputed counts."""
         insights = []
 
         # Category distribution
-        categories = self._count_by_field(articles, "category")
         if categories:
             top_category = max(categories, key=categories.get)
             insights.append(f"Most coverage in {top_category} ({categories[top_category]} articles)")
 
         # Source diversity
-        sources = self._count_by_field(articles, "source_name")
         insights.append(f"Content from {len(sources)} different sources")
 
         # Recent activity
@@ -257,23 +266,22 @@ class IVORSync:
 
         return insights[:5]
 
-    def _extract_events_insights(self, events: List[Dict]) -> List[str]:
-        """Extract key insights from events."""
+    def _extract_events_insights(
+        self, this_week: List[Dict], locations: Dict[str, int], organizers: Dict[str, int]
+    ) -> List[str]:
+        """Extract key insights from this week's events and the precomputed counts."""
         insights = []
 
         # This week's events
-        this_week = [e for e in events if self._is_this_week(e.get("date"))]
         if this_week:
             insights.append(f"{len(this_week)} events happening this week")
 
         # Location distribution
-        locations = self._count_by_field(events, "location")
         if locations:
             top_location = max(locations, key=locations.get)
             insights.append(f"Most events in {top_location}")
 
         # Organizer activity
-        organizers = self._count_by_field(events, "organizer")
         insights.append(f"Events from {len(organizers)} different organizers")
 
         return insights[:5]
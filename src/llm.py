@@ -2,23 +2,96 @@
 LLM Client - Groq integration with fallbacks
 """
 
+import asyncio
 import os
 import json
-from typing import Optional, List, Dict, Any
-from groq import Groq
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Optional, List, Dict, Any, Tuple
+
+import httpx
+from groq import APIConnectionError, Groq, InternalServerError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential, wait_random
+
+from .llm_cache import LLMCache
+from .rate_limit import CircuitBreaker, QuotaExceeded, llm_rate_limiter, parse_reset
+
+# Failures worth another attempt (timeouts, dropped connections, 5xx).
+# Anything else - bad requests, auth, quota - fails the same way again.
+TRANSIENT_LLM_ERRORS = (APIConnectionError, InternalServerError, httpx.TransportError)
+
+
+def batch_api_enabled() -> bool:
+    """Whether non-urgent runs go through the Batch API (LLM_BATCH_API=1)
+
+    Off by default: the Batch API is not available on every Groq plan.
+    """
+    return os.getenv("LLM_BATCH_API", "").lower() in ("1", "true", "yes")
+
+
+RELEVANCE_SYSTEM_PROMPT = """You are a relevance scoring agent for the BLKOUT community platform.
+Score content relevance to Black LGBTQ+ people in the UK from 0-100.
+
+90-100: Explicitly Black LGBTQ+ UK content
+70-89: Strong intersectional relevance
+50-69: Moderate relevance
+0-49: Low or no relevance
+"""
+
+RELEVANCE_FIELDS = """- relevance_score: number 0-100
+- reasoning: brief explanation
+- recommended_action: "publish" | "review" | "skip"
+- suggested_tags: list of tags
+- suggested_category: "news" | "culture" | "health" | "community" | "politics" | "events"
+"""
+
+# Complete system prompts, fixed at import: every request of a kind opens
+# with the same bytes, and only the user turn carries per-item content
+RELEVANCE_ITEM_SYSTEM_PROMPT = RELEVANCE_SYSTEM_PROMPT + """
+Return JSON with:
+""" + RELEVANCE_FIELDS
+
+RELEVANCE_BATCH_SYSTEM_PROMPT = RELEVANCE_SYSTEM_PROMPT + """
+Score each numbered item independently. Return JSON of the form
+{"scores": [{"id": <item number>, ...}, ...]} with one entry per item, each with:
+""" + RELEVANCE_FIELDS
+
+EVENT_EXTRACTION_SYSTEM_PROMPT = """Extract event information from this webpage content.
+Return JSON with:
+- name: event title
+- date: ISO date string
+- venue: venue name
+- address: full address
+- city: city name
+- price: ticket price or "Free"
+- description: brief description
+- organizer: who's running it
+- event_type: "party" | "community" | "cultural" | "health" | "pride"
+- tags: relevant tags list
+
+If information is not found, use null."""
 
 
 class LLMClient:
     """Unified LLM client using Groq free tier"""
 
     def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        # One pooled HTTP/2 connection is multiplexed across all completions
+        # instead of a TLS handshake per request
+        self.http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=self.http_client)
+        self.cache = LLMCache()
+        # Shared by every agent, since they all use this singleton client
+        self.rate_limiter = llm_rate_limiter()
+        self.breaker = CircuitBreaker("Groq")
         self.default_model = "llama-3.3-70b-versatile"
         self.fast_model = "llama-3.1-8b-instant"
+        # Pause once less than this share of the per-minute token budget is left
+        self.token_headroom = 0.1
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    async def complete(
+    def _chat_kwargs(
         self,
         prompt: str,
         system_prompt: str = "",
@@ -26,17 +99,15 @@ class LLMClient:
         temperature: float = 0.3,
         max_tokens: int = 4096,
         json_mode: bool = False,
-    ) -> str:
-        """Generate completion from LLM"""
-        model = model or self.default_model
-
+    ) -> Dict[str, Any]:
+        """Chat completion request body, shared by realtime and batch calls"""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
         kwargs = {
-            "model": model,
+            "model": model or self.default_model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
@@ -44,9 +115,69 @@ class LLMClient:
 
         if json_mode:
             kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_LLM_ERRORS),
+        stop=stop_after_attempt(3),
+        # Jittered so concurrent workers don't retry in lockstep
+        wait=wait_exponential(multiplier=0.5, max=8) + wait_random(0, 1),
+        reraise=True,
+    )
+    async def complete(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+    ) -> str:
+        """Generate completion from LLM
+
+        Raises QuotaExceeded when the request budget runs out, and
+        CircuitOpen while Groq is failing repeatedly.
+        """
+        kwargs = self._chat_kwargs(prompt, system_prompt, model, temperature, max_tokens, json_mode)
+
+        cache_key = self.cache.make_key(**kwargs)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        response = self.client.chat.completions.create(**kwargs)
-        return response.choices[0].message.content
+        self.breaker.check()
+        await self.rate_limiter.acquire()
+        # The pooled client is thread-safe; a worker thread keeps concurrent
+        # completions from blocking the event loop on each other
+        try:
+            raw = await asyncio.to_thread(self.client.chat.completions.with_raw_response.create, **kwargs)
+        except RateLimitError as e:
+            # Groq has already honoured retry-after; another round won't help
+            raise QuotaExceeded(str(e)) from e
+        except TRANSIENT_LLM_ERRORS:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self._respect_token_budget(raw.headers)
+        content = raw.parse().choices[0].message.content
+        if content:
+            self.cache.set(cache_key, content)
+        return content
+
+    def _respect_token_budget(self, headers) -> None:
+        """Hold back further requests when Groq reports the TPM budget nearly spent
+
+        The local bucket only counts requests; this stops the next call
+        from being the one that runs out of tokens and gets a 429.
+        """
+        try:
+            limit = int(headers["x-ratelimit-limit-tokens"])
+            remaining = int(headers["x-ratelimit-remaining-tokens"])
+            reset = parse_reset(headers["x-ratelimit-reset-tokens"])
+        except (KeyError, ValueError):
+            return
+        if remaining < limit * self.token_headroom:
+            self.rate_limiter.defer(reset)
 
     async def complete_json(
         self,
@@ -63,6 +194,24 @@ class LLMClient:
         )
         return json.loads(result)
 
+    @staticmethod
+    def _relevance_key(title: str, content: str) -> str:
+        """Similarity-cache input for a relevance analysis"""
+        return f"{title}\n{content[:1000]}"
+
+    @staticmethod
+    def _relevance_prompt(title: str, content: str, source: str, url: str) -> Tuple[str, str]:
+        """(prompt, system prompt) for scoring a single item"""
+        prompt = f"""Analyze this content:
+
+Title: {title}
+Source: {source}
+Content: {content[:1000]}
+URL: {url}
+
+Return relevance analysis as JSON."""
+        return prompt, RELEVANCE_ITEM_SYSTEM_PROMPT
+
     async def analyze_relevance(
         self,
         title: str,
@@ -71,50 +220,124 @@ class LLMClient:
         url: str,
     ) -> Dict[str, Any]:
         """Analyze content relevance to BLKOUT community"""
-        system_prompt = """You are a relevance scoring agent for the BLKOUT community platform.
-Score content relevance to Black LGBTQ+ people in the UK from 0-100.
+        prompt, system_prompt = self._relevance_prompt(title, content, source, url)
 
-90-100: Explicitly Black LGBTQ+ UK content
-70-89: Strong intersectional relevance
-50-69: Moderate relevance
-0-49: Low or no relevance
+        # Same story syndicated under another URL/snippet scores the same
+        similar_key = self._relevance_key(title, content)
+        cached = self.cache.get_similar("relevance", similar_key)
+        if cached is not None:
+            return json.loads(cached)
 
-Return JSON with:
-- relevance_score: number 0-100
-- reasoning: brief explanation
-- recommended_action: "publish" | "review" | "skip"
-- suggested_tags: list of tags
-- suggested_category: "news" | "culture" | "health" | "community" | "politics" | "events"
-"""
+        analysis = await self.complete_json(prompt, system_prompt, model=self.fast_model)
+        self.cache.set_similar("relevance", similar_key, json.dumps(analysis))
+        return analysis
 
-        prompt = f"""Analyze this content:
+    async def analyze_relevance_batch(self, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Score several items (title/content/source/url dicts) in one request
 
-Title: {title}
-Source: {source}
-Content: {content[:1000]}
-URL: {url}
+        Results line up with `items`; an item the model left out gets {}.
+        Per-item answers share the similarity cache with analyze_relevance.
+        """
+        results: List[Dict[str, Any]] = [{} for _ in items]
+        pending = []
+        for i, item in enumerate(items):
+            cached = self.cache.get_similar("relevance", self._relevance_key(item["title"], item["content"]))
+            if cached is not None:
+                results[i] = json.loads(cached)
+            else:
+                pending.append(i)
 
-Return relevance analysis as JSON."""
+        if len(pending) == 1:
+            results[pending[0]] = await self.analyze_relevance(**items[pending[0]])
+            return results
+        if not pending:
+            return results
 
-        return await self.complete_json(prompt, system_prompt, model=self.fast_model)
+        blocks = [
+            f"""Item {n}:
+Title: {items[i]['title']}
+Source: {items[i]['source']}
+Content: {items[i]['content'][:1000]}
+URL: {items[i]['url']}"""
+            for n, i in enumerate(pending, 1)
+        ]
+        prompt = f"""Analyze these {len(pending)} items:
 
-    async def extract_event_data(self, raw_html: str, url: str) -> Dict[str, Any]:
-        """Extract structured event data from HTML"""
-        system_prompt = """Extract event information from this webpage content.
-Return JSON with:
-- name: event title
-- date: ISO date string
-- venue: venue name
-- address: full address
-- city: city name
-- price: ticket price or "Free"
-- description: brief description
-- organizer: who's running it
-- event_type: "party" | "community" | "cultural" | "health" | "pride"
-- tags: relevant tags list
+""" + "\n\n".join(blocks) + "\n\nReturn relevance analysis for every item as JSON."
 
-If information is not found, use null."""
+        response = await self.complete_json(prompt, RELEVANCE_BATCH_SYSTEM_PROMPT, model=self.fast_model)
+        for entry in response.get("scores", []):
+            n = entry.get("id") if isinstance(entry, dict) else None
+            if isinstance(n, int) and 1 <= n <= len(pending):
+                i = pending[n - 1]
+                results[i] = entry
+                key = self._relevance_key(items[i]["title"], items[i]["content"])
+                self.cache.set_similar("relevance", key, json.dumps(entry))
+        return results
+
+    async def submit_relevance_batch(self, items: List[Dict[str, str]]) -> str:
+        """Queue relevance analyses on the Batch API (half price, 24h window)
+
+        Each item becomes one request whose custom_id is its index in
+        `items`. Returns the batch id to pass to fetch_relevance_batch.
+        """
+        lines = []
+        for i, item in enumerate(items):
+            prompt, system_prompt = self._relevance_prompt(**item)
+            body = self._chat_kwargs(
+                prompt,
+                system_prompt + "\n\nRespond with valid JSON only.",
+                model=self.fast_model,
+                json_mode=True,
+            )
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }).encode())
+
+        upload = await asyncio.to_thread(
+            self.client.files.create,
+            file=("relevance.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = await asyncio.to_thread(
+            self.client.batches.create,
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"[LLM] Submitted batch {batch.id} with {len(items)} requests")
+        return batch.id
 
+    async def fetch_relevance_batch(self, batch_id: str) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Results of a submitted batch keyed by item index
+
+        Returns None while the batch is still running. Once it has ended
+        (including expired or failed), returns whatever analyses came back.
+        """
+        batch = await asyncio.to_thread(self.client.batches.retrieve, batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
+
+        results: Dict[int, Dict[str, Any]] = {}
+        if not batch.output_file_id:
+            print(f"[LLM] Batch {batch_id} ended as {batch.status} with no output")
+            return results
+
+        output = await asyncio.to_thread(self.client.files.content, batch.output_file_id)
+        for line in output.read().splitlines():
+            try:
+                record = json.loads(line)
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+                results[int(record["custom_id"])] = json.loads(content)
+            except (json.JSONDecodeError, KeyError, IndexError, TypeError, ValueError):
+                continue  # Failed request - caller falls back for that item
+        return results
+
+    async def extract_event_data(self, raw_html: str, url: str) -> Dict[str, Any]:
+        """Extract structured event data from HTML"""
         prompt = f"""Extract event data from this content:
 
 URL: {url}
@@ -122,7 +345,7 @@ Content: {raw_html[:3000]}
 
 Return structured event data as JSON."""
 
-        return await self.complete_json(prompt, system_prompt, model=self.fast_model)
+        return await self.complete_json(prompt, EVENT_EXTRACTION_SYSTEM_PROMPT, model=self.fast_model)
 
 
 # Singleton instance
@@ -0,0 +1,159 @@
+"""
+LLM Response Cache - SQLite-backed exact-match cache for completions
+
+Groq has no native prompt cache, so identical prompts (the same article
+surfacing from several queries, or again on the next run) are answered
+from disk instead of spending free-tier quota. A second, similarity tier
+reuses answers for near-identical inputs such as a syndicated story
+with a slightly different snippet.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+
+from .dedup import SimHashIndex, simhash
+
+
+class LLMCache:
+    """Completion cache: exact match on the full request, plus a SimHash tier"""
+
+    # Inputs shorter than this are too sparse for a reliable SimHash match
+    min_similar_tokens = 8
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: int = 14 * 24 * 3600,
+        max_entries: int = 50_000,
+    ):
+        self.path = path or os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        # namespace -> (fingerprint index, fingerprint -> response)
+        self._similar: Dict[str, Tuple[SimHashIndex, Dict[int, str]]] = {}
+        # Lookups since start: misses are requests that went to the LLM
+        self.stats = {"hits": 0, "similar_hits": 0, "misses": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_similar_cache ("
+                "namespace TEXT NOT NULL, fingerprint TEXT NOT NULL, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (namespace, fingerprint))"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(**request: object) -> str:
+        """Stable key over every parameter that affects the completion"""
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None on miss/expiry/cache error"""
+        try:
+            row = self._connect().execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Read error: {e}")
+            return None
+
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response; cache failures never break the LLM call"""
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+            conn.commit()
+            self._after_write()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Write error: {e}")
+
+    def _similar_index(self, namespace: str) -> Tuple[SimHashIndex, Dict[int, str]]:
+        """Load a namespace's unexpired fingerprints into memory once"""
+        if namespace not in self._similar:
+            index, responses = SimHashIndex(k=3), {}
+            try:
+                rows = self._connect().execute(
+                    "SELECT fingerprint, response FROM llm_similar_cache "
+                    "WHERE namespace = ? AND created_at > ?",
+                    (namespace, time.time() - self.ttl_seconds),
+                )
+                for fingerprint, response in rows:
+                    fingerprint = int(fingerprint, 16)
+                    index.add(fingerprint)
+                    responses[fingerprint] = response
+            except sqlite3.Error as e:
+                print(f"[LLMCache] Read error: {e}")
+            self._similar[namespace] = (index, responses)
+        return self._similar[namespace]
+
+    def get_similar(self, namespace: str, text: str) -> Optional[str]:
+        """Return the response cached for a near-identical input, if any"""
+        if len(text.split()) < self.min_similar_tokens:
+            return None
+        index, responses = self._similar_index(namespace)
+        match = index.find(simhash(text))
+        if match is None:
+            return None
+        self.stats["similar_hits"] += 1
+        return responses[match]
+
+    def set_similar(self, namespace: str, text: str, response: str) -> None:
+        """Store a response under the input's SimHash fingerprint"""
+        if len(text.split()) < self.min_similar_tokens:
+            return
+        fingerprint = simhash(text)
+        index, responses = self._similar_index(namespace)
+        if fingerprint not in responses:
+            index.add(fingerprint)
+        responses[fingerprint] = response
+
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_similar_cache "
+                "(namespace, fingerprint, response, created_at) VALUES (?, ?, ?, ?)",
+                (namespace, f"{fingerprint:016x}", response, time.time()),
+            )
+            conn.commit()
+            self._after_write()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Write error: {e}")
+
+    def _after_write(self) -> None:
+        """Every 1000 writes, drop the oldest entries beyond max_entries"""
+        self._writes += 1
+        if self._writes % 1000:
+            return
+        conn = self._connect()
+        for table in ("llm_cache", "llm_similar_cache"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE rowid NOT IN "
+                f"(SELECT rowid FROM {table} ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+        conn.commit()
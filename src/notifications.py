@@ -7,6 +7,8 @@ Sends digest emails for:
 """
 
 import os
+from html import escape
+
 import httpx
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -20,6 +22,24 @@ class EmailNotifier:
         self.from_email = os.getenv("NOTIFICATION_FROM_EMAIL", "research@blkoutuk.com")
         self.to_email = os.getenv("NOTIFICATION_TO_EMAIL", "hello@blkoutuk.com")
         self.api_url = "https://api.resend.com/emails"
+        # Created on first send and kept for the life of the process, so
+        # back-to-back digests reuse the connection to Resend
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                timeout=30.0,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client (called on scheduler shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def send_email(self, subject: str, html_content: str) -> bool:
         """Send an email via Resend API"""
@@ -28,28 +48,26 @@ class EmailNotifier:
             return False
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "from": self.from_email,
-                        "to": [self.to_email],
-                        "subject": subject,
-                        "html": html_content,
-                    },
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    print(f"[Notifications] Email sent: {subject}")
-                    return True
-                else:
-                    print(f"[Notifications] Email failed: {response.status_code} - {response.text}")
-                    return False
+            response = await self._get_client().post(
+                self.api_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "from": self.from_email,
+                    "to": [self.to_email],
+                    "subject": subject,
+                    "html": html_content,
+                },
+            )
+
+            if response.status_code == 200:
+                print(f"[Notifications] Email sent: {subject}")
+                return True
+            else:
+                print(f"[Notifications] Email failed: {response.status_code} - {response.text}")
+                return False
 
         except Exception as e:
             print(f"[Notifications] Email error: {e}")
@@ -79,11 +97,16 @@ class EmailNotifier:
         top_priority: List[Dict[str, Any]],
         run_stats: Dict[str, Any],
     ) -> str:
-        """Build HTML email for grants digest"""
+        """Build HTML email for grants digest
+
+        Grant fields come from scraped pages, so every one is escaped
+        before it goes into the markup. Sections are collected as parts
+        and joined once.
+        """
 
         now = datetime.utcnow().strftime("%d %B %Y, %H:%M UTC")
 
-        html = f"""
+        parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -113,58 +136,60 @@ class EmailNotifier:
         <h1>BLKOUT Grant Research</h1>
         <p>{now}</p>
     </div>
-"""
+"""]
 
         # New discoveries section
         if new_grants:
-            html += """
+            parts.append("""
     <div class="section">
         <h2>New Discoveries</h2>
-"""
+""")
             for grant in new_grants[:10]:  # Limit to 10
                 priority_class = "high" if grant.get("priority") == "high" else "medium" if grant.get("priority") == "medium" else ""
-                score = grant.get("fit_score", 0)
+                score = escape(str(grant.get("fit_score", 0)))
+                deadline = grant.get("deadline_date")
 
-                html += f"""
+                parts.append(f"""
         <div class="grant {priority_class}">
-            <h3><a href="{grant.get('application_url', '#')}">{grant.get('title', 'Untitled')[:80]}</a></h3>
+            <h3><a href="{escape(grant.get('application_url') or '#')}">{escape((grant.get('title') or 'Untitled')[:80])}</a></h3>
             <div class="meta">
-                <strong>{grant.get('funder_name', 'Unknown Funder')}</strong>
-                {f" &bull; Deadline: {grant.get('deadline_date')}" if grant.get('deadline_date') else ""}
+                <strong>{escape(grant.get('funder_name') or 'Unknown Funder')}</strong>
+                {f" &bull; Deadline: {escape(str(deadline))}" if deadline else ""}
                 &bull; <span class="score">{score}% fit</span>
             </div>
-            <div class="description">{(grant.get('notes', '') or '')[:200]}...</div>
+            <div class="description">{escape((grant.get('notes', '') or '')[:200])}...</div>
         </div>
-"""
-            html += "    </div>"
+""")
+            parts.append("    </div>")
 
         # Top priority section
         if top_priority:
-            html += """
+            parts.append("""
     <div class="section">
         <h2>Top 10 Priority Opportunities</h2>
-"""
+""")
             for i, grant in enumerate(top_priority[:10], 1):
                 priority_class = "high" if grant.get("priority") == "high" else "medium"
-                score = grant.get("fit_score", 0)
+                score = escape(str(grant.get("fit_score", 0)))
                 deadline = grant.get("deadline_date")
-                deadline_text = f" &bull; <strong>Deadline: {deadline}</strong>" if deadline else ""
+                deadline_text = f" &bull; <strong>Deadline: {escape(str(deadline))}</strong>" if deadline else ""
+                advice = grant.get("funder_advice")
 
-                html += f"""
+                parts.append(f"""
         <div class="grant {priority_class}">
-            <h3>#{i} <a href="{grant.get('application_url', '#')}">{grant.get('title', 'Untitled')[:80]}</a></h3>
+            <h3>#{i} <a href="{escape(grant.get('application_url') or '#')}">{escape((grant.get('title') or 'Untitled')[:80])}</a></h3>
             <div class="meta">
-                <strong>{grant.get('funder_name', 'Unknown Funder')}</strong>
+                <strong>{escape(grant.get('funder_name') or 'Unknown Funder')}</strong>
                 {deadline_text}
                 &bull; <span class="score">{score}% fit</span>
             </div>
-            {f"<div class='description'>{grant.get('funder_advice', '')[:150]}...</div>" if grant.get('funder_advice') else ""}
+            {f"<div class='description'>{escape(advice[:150])}...</div>" if advice else ""}
         </div>
-"""
-            html += "    </div>"
+""")
+            parts.append("    </div>")
 
         # Stats footer
-        html += f"""
+        parts.append(f"""
     <div class="stats">
         <span>Discovered: {run_stats.get('discovered', 0)}</span>
         <span>New: {run_stats.get('inserted', 0)}</span>
@@ -177,8 +202,8 @@ class EmailNotifier:
     </div>
 </body>
 </html>
-"""
-        return html
+""")
+        return "".join(parts)
 
 
 # Singleton
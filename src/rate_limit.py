@@ -0,0 +1,127 @@
+"""
+Rate Limiting - Token bucket shared by every LLM call in the process
+
+Groq's free tier caps requests per minute; pacing calls locally avoids
+429s, and giving up after a bounded wait lets a run finish with what it
+has instead of stalling behind retries. A circuit breaker does the same
+for outages: once a backend keeps failing, callers fail fast onto their
+fallback paths instead of each waiting out timeouts and retries.
+
+The scraper reuses TokenBucket to pace page loads per host.
+"""
+
+import asyncio
+import os
+import re
+import time
+from typing import Optional
+
+
+class QuotaExceeded(Exception):
+    """The LLM request budget is exhausted for longer than we are willing to wait"""
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per `per` seconds, bursting up to `rate`"""
+
+    def __init__(self, rate: int = 30, per: float = 60.0, max_wait: float = 120.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / per
+        self.max_wait = max_wait
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: Optional[float] = None) -> None:
+        """Take one token, sleeping until it is available
+
+        Tokens are reserved up front (the balance may go negative), so
+        concurrent callers queue up in order without a lock. Raises
+        QuotaExceeded when the wait would exceed `max_wait`.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        wait = -self._tokens / self.fill_rate
+        if wait > max_wait:
+            self._tokens += 1  # Give the reservation back
+            raise QuotaExceeded(f"LLM rate limit: next slot in {wait:.0f}s (max wait {max_wait:.0f}s)")
+        await asyncio.sleep(wait)
+
+    def defer(self, seconds: float) -> None:
+        """Hold the next request back for at least `seconds` (server backpressure)"""
+        self._refill()
+        self._tokens = min(self._tokens, 1 - seconds * self.fill_rate)
+
+
+# Groq reset headers look like "7.66s", "2m59.56s" or "120ms"
+_DURATION_RE = re.compile(r"([\d.]+)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "h": 3600.0, "m": 60.0, "s": 1.0}
+
+
+def parse_reset(value: str) -> float:
+    """Seconds in a rate-limit reset header value"""
+    return sum(float(n) * _UNIT_SECONDS[unit] for n, unit in _DURATION_RE.findall(value))
+
+
+class CircuitOpen(Exception):
+    """A backend failed repeatedly and calls are being short-circuited"""
+
+
+class CircuitBreaker:
+    """Open after `threshold` consecutive failures; after each `cooldown`, let one probe call through"""
+
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 60.0):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown
+
+    def check(self) -> None:
+        """Raise CircuitOpen while the breaker is open
+
+        Once the cooldown has passed the breaker is half-open: the first
+        caller goes through as a probe and restarts the cooldown, so
+        everyone else keeps failing fast until the probe records its
+        outcome (or for another cooldown if it never does).
+        """
+        if self._opened_at is None:
+            return
+        if self.is_open:
+            remaining = self.cooldown - (time.monotonic() - self._opened_at)
+            raise CircuitOpen(f"{self.name} unavailable, retrying in {remaining:.0f}s")
+        self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure; (re)opens once the threshold is reached"""
+        self._failures += 1
+        if self._failures >= self.threshold:
+            if not self.is_open:
+                print(f"[CircuitBreaker] {self.name}: {self._failures} failures in a row, "
+                      f"short-circuiting for {self.cooldown:.0f}s")
+            self._opened_at = time.monotonic()
+
+
+def llm_rate_limiter() -> TokenBucket:
+    """Bucket sized from LLM_RPM / LLM_MAX_WAIT (defaults match Groq's free tier)"""
+    return TokenBucket(
+        rate=int(os.getenv("LLM_RPM", "30")),
+        per=60.0,
+        max_wait=float(os.getenv("LLM_MAX_WAIT", "120")),
+    )
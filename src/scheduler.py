@@ -3,20 +3,59 @@ Scheduler - Automated execution of discovery agents
 """
 
 import asyncio
+import functools
 import os
 from datetime import datetime
+from typing import List, Set
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from .agents import PlanningAgent
+from .control import control_socket_path, serve_control
 from .grants_agent import GrantPlanningAgent
+from .llm import batch_api_enabled
+from .notifications import get_notifier
+
+
+def _exclusive(job):
+    """Skip a job while another run of it is in flight
+
+    APScheduler's max_instances only covers scheduled fires; jobs triggered
+    over the control socket call the coroutine directly, so both paths are
+    guarded here to keep one run of each job on the shared agents.
+    """
+    @functools.wraps(job)
+    async def run(self):
+        name = job.__name__
+        if name in self._running:
+            print(f"[Scheduler] {name} is already running - skipped")
+            return
+        self._running.add(name)
+        try:
+            await job(self)
+        finally:
+            self._running.discard(name)
+    return run
 
 
 class DiscoveryScheduler:
     """Schedules and runs discovery agents"""
 
+    # Upper bound for a single manually-triggered job (seconds)
+    job_timeout = 3 * 60 * 60
+
     def __init__(self):
-        self.scheduler = AsyncIOScheduler(timezone="Europe/London")
+        # Collapse missed fires (e.g. after a container restart) into a single
+        # run and never let a slow job overlap its own next fire.
+        self.scheduler = AsyncIOScheduler(
+            timezone="Europe/London",
+            job_defaults={"coalesce": True, "misfire_grace_time": 3600, "max_instances": 1},
+        )
+        self._stopped = asyncio.Event()
+        # Strong refs to jobs triggered over the control socket
+        self._triggered: Set[asyncio.Task] = set()
+        # Names of jobs currently running, see _exclusive
+        self._running: Set[str] = set()
         self.agent = PlanningAgent()
         self.grants_agent = GrantPlanningAgent()
 
@@ -50,6 +89,16 @@ class DiscoveryScheduler:
             replace_existing=True,
         )
 
+        # Save weekly deep research scored on the Batch API once it finishes
+        if batch_api_enabled():
+            self.scheduler.add_job(
+                self._collect_batches,
+                CronTrigger(minute=30),
+                id="collect_llm_batches",
+                name="Collect LLM Batch Results",
+                replace_existing=True,
+            )
+
         # Weekly grant research on Monday at 9 AM
         self.scheduler.add_job(
             self._run_grants,
@@ -72,6 +121,7 @@ class DiscoveryScheduler:
         for job in self.scheduler.get_jobs():
             print(f"  - {job.name}: {job.trigger}")
 
+    @_exclusive
     async def _run_daily(self):
         """Execute daily discovery"""
         print(f"[Scheduler] Running daily discovery at {datetime.now()}")
@@ -81,6 +131,7 @@ class DiscoveryScheduler:
         except Exception as e:
             print(f"[Scheduler] Daily discovery error: {e}")
 
+    @_exclusive
     async def _run_events_only(self):
         """Execute events-only discovery"""
         print(f"[Scheduler] Running evening events check at {datetime.now()}")
@@ -90,6 +141,7 @@ class DiscoveryScheduler:
         except Exception as e:
             print(f"[Scheduler] Events discovery error: {e}")
 
+    @_exclusive
     async def _run_weekly(self):
         """Execute weekly deep research"""
         print(f"[Scheduler] Running weekly deep research at {datetime.now()}")
@@ -99,6 +151,17 @@ class DiscoveryScheduler:
         except Exception as e:
             print(f"[Scheduler] Weekly research error: {e}")
 
+    @_exclusive
+    async def _collect_batches(self):
+        """Save articles from finished LLM batches"""
+        try:
+            results = await self.agent.news_agent.collect_llm_batches()
+            if results["batches"]:
+                print(f"[Scheduler] Batch results: {results}")
+        except Exception as e:
+            print(f"[Scheduler] Batch collection error: {e}")
+
+    @_exclusive
     async def _run_grants(self):
         """Execute weekly grant research"""
         print(f"[Scheduler] Running grant research at {datetime.now()}")
@@ -117,8 +180,13 @@ class DiscoveryScheduler:
     def stop(self):
         """Stop the scheduler"""
         self.scheduler.shutdown()
+        self._stopped.set()
         print("[Scheduler] Stopped")
 
+    async def wait_until_stopped(self):
+        """Block until stop() without polling; APScheduler owns all wakeups"""
+        await self._stopped.wait()
+
     async def run_now(self, job_type: str = "daily"):
         """Manually trigger a job"""
         if job_type == "daily":
@@ -132,18 +200,48 @@ class DiscoveryScheduler:
         else:
             print(f"Unknown job type: {job_type}")
 
+    async def run_many(self, job_types: List[str]):
+        """Manually trigger several independent jobs concurrently"""
+        async def run_with_timeout(job_type: str):
+            try:
+                await asyncio.wait_for(self.run_now(job_type), timeout=self.job_timeout)
+            except asyncio.TimeoutError:
+                print(f"[Scheduler] {job_type} job timed out after {self.job_timeout}s")
+
+        # Preserve order but don't run the same job twice
+        await asyncio.gather(*(run_with_timeout(j) for j in dict.fromkeys(job_types)))
+
+    def trigger(self, job_types: List[str]):
+        """Start jobs in the background (control socket entry point)"""
+        print(f"[Scheduler] Triggered via control socket: {', '.join(job_types)}")
+        task = asyncio.create_task(self.run_many(job_types))
+        self._triggered.add(task)
+        task.add_done_callback(self._triggered.discard)
+
 
 async def run_scheduler():
     """Run the scheduler as main process"""
     scheduler = DiscoveryScheduler()
     scheduler.start()
+    control = await serve_control(scheduler.trigger)
+
+    try:
+        await scheduler.agent.start()
+    except Exception as e:
+        # Scrapes fall back to launching their own browser
+        print(f"[Scheduler] Could not start shared browser: {e}")
 
     try:
-        # Keep running
-        while True:
-            await asyncio.sleep(60)
-    except KeyboardInterrupt:
+        await scheduler.wait_until_stopped()
+    except (KeyboardInterrupt, asyncio.CancelledError):
         scheduler.stop()
+    finally:
+        await scheduler.agent.stop()
+        await scheduler.agent.db.flush_logs()
+        await get_notifier().aclose()
+        control.close()
+        if os.path.exists(control_socket_path()):
+            os.unlink(control_socket_path())
 
 
 if __name__ == "__main__":
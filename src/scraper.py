@@ -3,16 +3,25 @@ Web Scraper Agent - Browser automation for event extraction
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator
+from dataclasses import dataclass, fields
 from datetime import datetime
 import hashlib
 import re
 
-from playwright.async_api import async_playwright, Browser, Page
+import lxml.html
+from cssselect import HTMLTranslator
+from lxml import etree
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route
 
+from .rate_limit import TokenBucket
 
-@dataclass
+
+@dataclass(slots=True)
 class ScrapedEvent:
     name: str
     url: str
@@ -35,85 +44,316 @@ class ScrapedEvent:
         self.url_hash = hashlib.md5(self.url.encode()).hexdigest()
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Flat record: read the slots directly rather than asdict()'s recursive copy
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+# =============================================================================
+# HTML PARSING - selectors compiled to XPath once at import
+# =============================================================================
+
+_css = HTMLTranslator()
+
+
+def _compile_selector(css: str, within: bool = False) -> etree.XPath:
+    """Compile a CSS selector; `within` matches descendants only (like element.query_selector)"""
+    prefix = "descendant::" if within else "descendant-or-self::"
+    return etree.XPath(_css.css_to_xpath(css, prefix=prefix))
+
+
+_EVENTBRITE_SELECTORS = {
+    "event_card": _compile_selector("[data-testid='event-card'], .search-event-card"),
+    "title": _compile_selector("h3, .event-card-title", within=True),
+    "link": _compile_selector("a", within=True),
+    "date": _compile_selector("[data-testid='event-card-date'], .event-card-date", within=True),
+    "venue": _compile_selector("[data-testid='event-card-location'], .event-card-location", within=True),
+}
+
+_MOONLIGHT_SELECTORS = {
+    "event_card": _compile_selector(".experience-card, .event-item, a[href*='/event']"),
+}
+
+
+def _first_text(element, selector: etree.XPath) -> str:
+    matches = selector(element)
+    return matches[0].text_content() if matches else ""
+
+
+def _first_attr(element, selector: etree.XPath, attr: str) -> str:
+    matches = selector(element)
+    return matches[0].get(attr, "") if matches else ""
+
+
+def parse_eventbrite_html(html: str) -> List[ScrapedEvent]:
+    """Extract event cards from an Eventbrite search results page"""
+    events = []
+    tree = lxml.html.fromstring(html)
+
+    for card in _EVENTBRITE_SELECTORS["event_card"](tree)[:20]:
+        try:
+            title = _first_text(card, _EVENTBRITE_SELECTORS["title"])
+            link = _first_attr(card, _EVENTBRITE_SELECTORS["link"], "href")
+            date = _first_text(card, _EVENTBRITE_SELECTORS["date"])
+            venue = _first_text(card, _EVENTBRITE_SELECTORS["venue"])
+
+            if title and link:
+                events.append(ScrapedEvent(
+                    name=title.strip(),
+                    url=link if link.startswith("http") else f"https://www.eventbrite.co.uk{link}",
+                    venue=venue.strip() if venue else None,
+                    date=date.strip() if date else None,
+                    source_platform="Eventbrite",
+                ))
+        except Exception as e:
+            print(f"Error extracting event card: {e}")
+
+    return events
+
+
+def parse_moonlight_html(html: str) -> List[ScrapedEvent]:
+    """Extract experience cards from the Moonlight Experiences listing"""
+    events = []
+    tree = lxml.html.fromstring(html)
+
+    for card in _MOONLIGHT_SELECTORS["event_card"](tree)[:20]:
+        title = card.text_content() or ""
+        link = card.get("href") or ""
+
+        if title and link:
+            full_url = link if link.startswith("http") else f"https://www.moonlightexperiences.com{link}"
+            events.append(ScrapedEvent(
+                name=title.strip()[:200],
+                url=full_url,
+                source_platform="Moonlight Experiences",
+            ))
+
+    return events
+
+
+# OutSavvy event page fields: (selector fallbacks, min stripped length).
+# The first match longer than the minimum wins, else the last match found.
+_OUTSAVVY_EVENT_FIELDS = {
+    # OutSavvy uses h1 tags for titles
+    "title": (["h1"], 0),
+    # Classes with "time" or "Date"
+    "date": (["[class*='time']", "[class*='Date']", "time", ".when"], 0),
+    # Classes with "Venue" or "Location"
+    "venue": (["[class*='Venue']", "[class*='Location']", ".where", ".venue"], 0),
+    "price": (["[class*='price']", ".price", ".ticket-price"], 0),
+    # .event-description or classes with "Description"; skip stub blurbs
+    "description": ([".event-description", "[class*='Description']", "[class*='about']", ".description"], 20),
+}
+
+_PICK_FIELDS_JS = """(fields) => {
+    const pick = ([selectors, minLength]) => {
+        let text = "";
+        for (const selector of selectors) {
+            const el = document.querySelector(selector);
+            if (!el) continue;
+            text = el.textContent || "";
+            if (text.trim().length > minLength) break;
+        }
+        return text;
+    };
+    return Object.fromEntries(Object.entries(fields).map(([name, spec]) => [name, pick(spec)]));
+}"""
+
+
+# Requests the scrapers never read from: skipping them cuts most of a
+# page's bytes and stops slow media/trackers holding up "networkidle"
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_TRACKER_URL_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|segment\.io|facebook\.net|hotjar\.com"
+)
+
+
+async def _route_request(route: Route) -> None:
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or _TRACKER_URL_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+_PLATFORM_PARSERS = {
+    "eventbrite": parse_eventbrite_html,
+    "moonlight": parse_moonlight_html,
+}
+
+
+def parse_platform_html(platform: str, html: str) -> List[ScrapedEvent]:
+    """Process-pool entry point: parse a platform's page HTML
+
+    Takes the decoded str from page.content(); lxml would read bytes
+    without a <meta charset> as latin-1 and garble non-ASCII text.
+    """
+    return _PLATFORM_PARSERS[platform](html)
 
 
 class ScraperAgent:
     """Browser-based scraper for event platforms"""
 
-    def __init__(self, headless: bool = True, timeout: int = 30000):
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout: int = 30000,
+        max_pages: int = 4,
+        parse_workers: Optional[int] = None,
+    ):
         self.headless = headless
         self.timeout = timeout
+        self.parse_workers = parse_workers or min(4, os.cpu_count() or 1)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self._playwright: Optional[Playwright] = None
+        # Bounds concurrently open pages across all platforms
+        self._page_slots = asyncio.Semaphore(max_pages)
+        # Pages handed back by _page(), reused instead of opening new tabs
+        self._idle_pages: List[Page] = []
+        # One bucket per host: a site's searches start at most one per
+        # host_interval seconds, but hosts never wait on each other
+        self.host_interval = 2.0
+        self._host_buckets: Dict[str, TokenBucket] = {}
 
     async def __aenter__(self):
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=self.headless)
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        # One context shared by every page so connections, DNS and cookies
+        # are reused instead of paying a fresh handshake per page
+        self.context = await self.browser.new_context()
+        await self.context.route("**/*", _route_request)
+        # Spawned (not forked) workers: the parent already runs an event loop
+        # and the Playwright driver, neither of which survives a fork cleanly
+        self._parse_pool = ProcessPoolExecutor(
+            max_workers=self.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+        # Closing the context closes any pooled pages with it
+        self._idle_pages.clear()
+        if self.context:
+            await self.context.close()
         if self.browser:
             await self.browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the browser is still up (a long-lived scraper can lose it)"""
+        return self.browser is not None and self.browser.is_connected()
+
+    @asynccontextmanager
+    async def _page(self) -> AsyncIterator[Page]:
+        """Check out a page from the shared context, bounded by the page semaphore
+
+        Pages go back to a pool afterwards (parked on about:blank so the
+        last site's scripts stop running) rather than being closed, so
+        later scrapes skip page creation.
+        """
+        if not self.context:
+            raise RuntimeError("Scraper not initialized. Use 'async with' context.")
+
+        async with self._page_slots:
+            page = None
+            while self._idle_pages and page is None:
+                page = self._idle_pages.pop()
+                if page.is_closed():
+                    page = None
+            if page is None:
+                page = await self.context.new_page()
+
+            reusable = False
+            try:
+                yield page
+                reusable = True
+            finally:
+                if reusable and not page.is_closed():
+                    try:
+                        await page.goto("about:blank")
+                        self._idle_pages.append(page)
+                    except Exception:
+                        await page.close()
+                else:
+                    await page.close()
+
+    async def _pace(self, host: str) -> None:
+        """Wait for this host's next request slot"""
+        bucket = self._host_buckets.get(host)
+        if bucket is None:
+            bucket = self._host_buckets[host] = TokenBucket(
+                rate=1, per=self.host_interval, max_wait=float("inf")
+            )
+        await bucket.acquire()
+
+    async def _parse(self, platform: str, html: str) -> List[ScrapedEvent]:
+        """Parse page HTML off the event loop so platforms parse in parallel"""
+        if not self._parse_pool:
+            return parse_platform_html(platform, html)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._parse_pool, parse_platform_html, platform, html
+        )
 
     async def scrape_page(self, url: str) -> str:
         """Scrape raw HTML from a URL"""
-        if not self.browser:
-            raise RuntimeError("Scraper not initialized. Use 'async with' context.")
-
-        page = await self.browser.new_page()
-        try:
+        async with self._page() as page:
             await page.goto(url, timeout=self.timeout, wait_until="networkidle")
             content = await page.content()
             return content
-        finally:
-            await page.close()
 
     async def scrape_outsavvy(self, search_query: str = "Black LGBTQ") -> List[ScrapedEvent]:
         """Scrape events from OutSavvy"""
         events = []
         url = f"https://www.outsavvy.com/search?q={search_query.replace(' ', '+')}"
 
-        if not self.browser:
-            raise RuntimeError("Scraper not initialized")
-
-        page = await self.browser.new_page()
         try:
-            await page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
+            await self._pace("outsavvy")
+            async with self._page() as page:
+                await page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
 
-            # Wait for page to fully load and JS to render
-            await asyncio.sleep(3)
+                # Wait for page to fully load and JS to render
+                await asyncio.sleep(3)
 
-            # Wait for events to load - use actual OutSavvy selectors with fallbacks
-            try:
-                await page.wait_for_selector("article, a[href*='/event/']", timeout=30000)
-            except Exception as e:
-                print(f"OutSavvy: No events loaded after 30s: {e}")
-                return events
-
-            # Extract event links using actual selector that works
-            event_links = await page.eval_on_selector_all(
-                "a[href*='/event/']",
-                "elements => elements.map(e => e.href)"
-            )
-
-            # Deduplicate and limit
-            unique_links = list(set(event_links))[:20]
-            print(f"OutSavvy: Found {len(unique_links)} unique event links")
-
-            for link in unique_links:
+                # Wait for events to load - use actual OutSavvy selectors with fallbacks
                 try:
-                    event = await self._scrape_outsavvy_event(page, link)
-                    if event:
-                        events.append(event)
+                    await page.wait_for_selector("article, a[href*='/event/']", timeout=30000)
                 except Exception as e:
-                    print(f"Error scraping {link}: {e}")
-                    continue  # Skip failed events, don't crash entire scrape
-
+                    print(f"OutSavvy: No events loaded after 30s: {e}")
+                    return events
+
+                # Extract event links using actual selector that works
+                event_links = await page.eval_on_selector_all(
+                    "a[href*='/event/']",
+                    "elements => elements.map(e => e.href)"
+                )
         except Exception as e:
             print(f"OutSavvy scrape error: {e}")
             # Don't raise - return partial results
-        finally:
-            await page.close()
+            return events
+
+        # Deduplicate and limit
+        unique_links = list(set(event_links))[:20]
+        print(f"OutSavvy: Found {len(unique_links)} unique event links")
+
+        async def scrape_event(link: str) -> Optional[ScrapedEvent]:
+            try:
+                async with self._page() as event_page:
+                    return await self._scrape_outsavvy_event(event_page, link)
+            except Exception as e:
+                print(f"Error scraping {link}: {e}")
+                return None  # Skip failed events, don't crash entire scrape
+
+        # Detail pages load side by side on pooled pages (the page
+        # semaphore caps how many hit the site at once)
+        for event in await asyncio.gather(*(scrape_event(link) for link in unique_links)):
+            if event:
+                events.append(event)
 
         return events
 
@@ -123,46 +363,14 @@ class ScraperAgent:
             await page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
             await asyncio.sleep(2)  # Allow JS to render
 
-            # Title - OutSavvy uses h1 tags
-            title = ""
-            if await page.locator("h1").count() > 0:
-                title = await page.locator("h1").first.text_content() or ""
-
-            # Date/Time - OutSavvy uses classes with "time" or "Date"
-            date_elem = ""
-            date_selectors = ["[class*='time']", "[class*='Date']", "time", ".when"]
-            for selector in date_selectors:
-                if await page.locator(selector).count() > 0:
-                    date_elem = await page.locator(selector).first.text_content() or ""
-                    if date_elem.strip():
-                        break
-
-            # Venue - OutSavvy uses classes with "Venue" or "Location"
-            venue = ""
-            venue_selectors = ["[class*='Venue']", "[class*='Location']", ".where", ".venue"]
-            for selector in venue_selectors:
-                if await page.locator(selector).count() > 0:
-                    venue = await page.locator(selector).first.text_content() or ""
-                    if venue.strip():
-                        break
-
-            # Price - OutSavvy uses classes with "price"
-            price = ""
-            price_selectors = ["[class*='price']", ".price", ".ticket-price"]
-            for selector in price_selectors:
-                if await page.locator(selector).count() > 0:
-                    price = await page.locator(selector).first.text_content() or ""
-                    if price.strip():
-                        break
-
-            # Description - OutSavvy uses .event-description or classes with "Description"
-            description = ""
-            desc_selectors = [".event-description", "[class*='Description']", "[class*='about']", ".description"]
-            for selector in desc_selectors:
-                if await page.locator(selector).count() > 0:
-                    description = await page.locator(selector).first.text_content() or ""
-                    if description.strip() and len(description.strip()) > 20:
-                        break
+            # Every field in one in-page call instead of a browser
+            # round-trip per selector tried
+            fields = await page.evaluate(_PICK_FIELDS_JS, _OUTSAVVY_EVENT_FIELDS)
+            title = fields["title"]
+            date_elem = fields["date"]
+            venue = fields["venue"]
+            price = fields["price"]
+            description = fields["description"]
 
             if not title:
                 return None
@@ -185,45 +393,17 @@ class ScraperAgent:
         events = []
         url = f"https://www.eventbrite.co.uk/d/united-kingdom/{search_query}/"
 
-        if not self.browser:
-            raise RuntimeError("Scraper not initialized")
-
-        page = await self.browser.new_page()
         try:
-            await page.goto(url, timeout=self.timeout, wait_until="networkidle")
-
-            # Extract event cards
-            event_cards = await page.query_selector_all("[data-testid='event-card'], .search-event-card")
-
-            for card in event_cards[:20]:
-                try:
-                    title_elem = await card.query_selector("h3, .event-card-title")
-                    title = await title_elem.text_content() if title_elem else ""
-
-                    link_elem = await card.query_selector("a")
-                    link = await link_elem.get_attribute("href") if link_elem else ""
-
-                    date_elem = await card.query_selector("[data-testid='event-card-date'], .event-card-date")
-                    date = await date_elem.text_content() if date_elem else ""
-
-                    venue_elem = await card.query_selector("[data-testid='event-card-location'], .event-card-location")
-                    venue = await venue_elem.text_content() if venue_elem else ""
-
-                    if title and link:
-                        events.append(ScrapedEvent(
-                            name=title.strip(),
-                            url=link if link.startswith("http") else f"https://www.eventbrite.co.uk{link}",
-                            venue=venue.strip() if venue else None,
-                            date=date.strip() if date else None,
-                            source_platform="Eventbrite",
-                        ))
-                except Exception as e:
-                    print(f"Error extracting event card: {e}")
-
+            await self._pace("eventbrite")
+            async with self._page() as page:
+                await page.goto(url, timeout=self.timeout, wait_until="networkidle")
+                # One DOM snapshot, parsed locally, instead of a browser
+                # round-trip per card field
+                html = await page.content()
+            # Page slot is released before the CPU-bound parse
+            events = await self._parse("eventbrite", html)
         except Exception as e:
             print(f"Eventbrite scrape error: {e}")
-        finally:
-            await page.close()
 
         return events
 
@@ -232,75 +412,58 @@ class ScraperAgent:
         events = []
         url = "https://www.moonlightexperiences.com/experiences"
 
-        if not self.browser:
-            raise RuntimeError("Scraper not initialized")
-
-        page = await self.browser.new_page()
         try:
-            await page.goto(url, timeout=self.timeout, wait_until="networkidle")
-
-            # Extract experience cards
-            cards = await page.query_selector_all(".experience-card, .event-item, a[href*='/event']")
-
-            for card in cards[:20]:
-                try:
-                    title = await card.text_content() or ""
-                    link = await card.get_attribute("href") or ""
-
-                    if title and link:
-                        full_url = link if link.startswith("http") else f"https://www.moonlightexperiences.com{link}"
-                        events.append(ScrapedEvent(
-                            name=title.strip()[:200],
-                            url=full_url,
-                            source_platform="Moonlight Experiences",
-                        ))
-                except:
-                    pass
-
+            async with self._page() as page:
+                await page.goto(url, timeout=self.timeout, wait_until="networkidle")
+                html = await page.content()
+            events = await self._parse("moonlight", html)
         except Exception as e:
             print(f"Moonlight scrape error: {e}")
-        finally:
-            await page.close()
 
         return events
 
-    async def scrape_all_platforms(self) -> List[ScrapedEvent]:
-        """Scrape all configured event platforms with error isolation"""
-        all_events = []
+    async def _scrape_queries(self, platform: str, scrape, queries: List[str]) -> List[ScrapedEvent]:
+        """Run one platform's searches concurrently - isolated error handling
 
-        # OutSavvy searches - isolated error handling
-        print("\n=== Scraping OutSavvy ===")
-        for query in ["Black LGBTQ", "QTIPOC", "queer POC"]:
+        The host's token bucket (see _pace) spaces the page loads out.
+        """
+        async def run(query: str) -> List[ScrapedEvent]:
             try:
-                events = await self.scrape_outsavvy(query)
-                all_events.extend(events)
-                print(f"OutSavvy '{query}': {len(events)} events found")
+                found = await scrape(query)
+                print(f"{platform} '{query}': {len(found)} events found")
+                return found
             except Exception as e:
-                print(f"OutSavvy '{query}' failed: {e}")
-                # Continue to next platform - don't crash entire discovery
-            await asyncio.sleep(2)  # Rate limiting
+                print(f"{platform} '{query}' failed: {e}")
+                # Continue with the other queries - don't crash entire discovery
+                return []
 
-        # Eventbrite searches - isolated error handling
-        print("\n=== Scraping Eventbrite ===")
-        for query in ["Black-queer", "QTIPOC", "Black-LGBTQ"]:
-            try:
-                events = await self.scrape_eventbrite(query)
-                all_events.extend(events)
-                print(f"Eventbrite '{query}': {len(events)} events found")
-            except Exception as e:
-                print(f"Eventbrite '{query}' failed: {e}")
-                # Continue to next platform
-            await asyncio.sleep(2)
+        results = await asyncio.gather(*(run(query) for query in queries))
+        return [event for found in results for event in found]
 
-        # Moonlight - isolated error handling
-        print("\n=== Scraping Moonlight ===")
+    async def _scrape_moonlight_safe(self) -> List[ScrapedEvent]:
+        """Moonlight - isolated error handling"""
         try:
             events = await self.scrape_moonlight()
-            all_events.extend(events)
             print(f"Moonlight: {len(events)} events found")
+            return events
         except Exception as e:
             print(f"Moonlight failed: {e}")
             # Continue anyway
+            return []
+
+    async def scrape_all_platforms(self) -> List[ScrapedEvent]:
+        """Scrape all configured event platforms with error isolation
+
+        Every search runs concurrently; per-host token buckets keep each
+        site's page loads spaced out while different sites overlap.
+        """
+        print("\n=== Scraping OutSavvy, Eventbrite, Moonlight ===")
+        platform_results = await asyncio.gather(
+            self._scrape_queries("OutSavvy", self.scrape_outsavvy, ["Black LGBTQ", "QTIPOC", "queer POC"]),
+            self._scrape_queries("Eventbrite", self.scrape_eventbrite, ["Black-queer", "QTIPOC", "Black-LGBTQ"]),
+            self._scrape_moonlight_safe(),
+        )
+        all_events = [event for events in platform_results for event in events]
 
         # Deduplicate by URL hash
         seen = set()
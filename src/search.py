@@ -3,13 +3,37 @@ Search Agent - Web search using DuckDuckGo (free, no API key needed)
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from ddgs import DDGS
 
-
-@dataclass
+# Query parameters that only track the referrer, never change the page
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid", "ocid"}
+
+
+def canonical_url(url: str) -> str:
+    """Dedup key for a URL: the same article linked with different
+    scheme, www., trailing slash, fragment or tracking parameters maps
+    to one key. The original URL is still what gets stored.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip().lower()
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    key = f"{host}{parts.path.rstrip('/')}"
+    return f"{key}?{query}" if query else key
+
+
+@dataclass(slots=True)
 class SearchResult:
     title: str
     url: str
@@ -100,21 +124,39 @@ class SearchAgent:
     ) -> List[SearchResult]:
         """Execute multiple searches and deduplicate results"""
         all_results = []
-        seen_urls = set()
+        async for results in self.multi_search_stream(queries, search_type, region, time_range):
+            all_results.extend(results)
+        return all_results
 
-        search_fn = self.search_news if search_type == "news" else self.search
+    async def multi_search_stream(
+        self,
+        queries: List[str],
+        search_type: str = "web",
+        region: str = "uk-en",
+        time_range: Optional[str] = "m",
+    ) -> AsyncIterator[List[SearchResult]]:
+        """Yield each query's new (not yet seen) results as soon as it returns
 
-        for query in queries:
-            results = await search_fn(query, region, time_range)
-            for result in results:
-                if result.url not in seen_urls:
-                    seen_urls.add(result.url)
-                    all_results.append(result)
+        Lets callers start work on early batches while later queries are
+        still being paced out.
+        """
+        seen_urls = set()
+        search_fn = self.search_news if search_type == "news" else self.search
 
-            # Rate limiting - be nice to DuckDuckGo
-            await asyncio.sleep(1)
+        for i, query in enumerate(queries):
+            if i:
+                # Rate limiting - be nice to DuckDuckGo
+                await asyncio.sleep(1)
 
-        return all_results
+            results = await search_fn(query, region, time_range)
+            fresh = []
+            for r in results:
+                key = canonical_url(r.url)
+                if key not in seen_urls:
+                    seen_urls.add(key)
+                    fresh.append(r)
+            if fresh:
+                yield fresh
 
     def _extract_source(self, url: str) -> str:
         """Extract source name from URL"""
@@ -134,6 +176,19 @@ class SearchAgent:
 class EventSearchAgent(SearchAgent):
     """Specialized search agent for events"""
 
+    QTIPOC_QUERIES = (
+        "QTIPOC events UK",
+        "Black LGBTQ party London",
+        "Black queer events Manchester",
+        "site:outsavvy.com Black LGBTQ",
+        "site:eventbrite.co.uk QTIPOC",
+        "BBZ London",
+        "Misery QTIPOC",
+        "Hungama queer",
+        "UK Black Pride events",
+        "Black gay party UK",
+    )
+
     def __init__(self, max_results: int = 15):
         super().__init__(max_results)
         self.event_platforms = [
@@ -165,16 +220,4 @@ class EventSearchAgent(SearchAgent):
 
     async def search_qtipoc_events(self) -> List[SearchResult]:
         """Search specifically for QTIPOC events"""
-        queries = [
-            "QTIPOC events UK",
-            "Black LGBTQ party London",
-            "Black queer events Manchester",
-            "site:outsavvy.com Black LGBTQ",
-            "site:eventbrite.co.uk QTIPOC",
-            "BBZ London",
-            "Misery QTIPOC",
-            "Hungama queer",
-            "UK Black Pride events",
-            "Black gay party UK",
-        ]
-        return await self.multi_search(queries, search_type="web", time_range="m")
+        return await self.multi_search(self.QTIPOC_QUERIES, search_type="web", time_range="m")
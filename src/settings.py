@@ -0,0 +1,35 @@
+"""
+Settings - Validated environment configuration, loaded once per process
+
+main.check_config() validates through get_settings() at startup. The
+LLM, database and notification clients still read their own variables,
+so --test and the unit tests run with only part of the environment set.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import Field, HttpUrl
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Environment variables required to run the research agent"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Set-but-empty keys are as unusable as missing ones
+    groq_api_key: str = Field(min_length=1)
+    supabase_url: HttpUrl
+    supabase_service_role_key: str = Field(min_length=1)
+
+    # Optional: email notifications
+    resend_api_key: Optional[str] = None
+    notification_from_email: str = "research@blkoutuk.com"
+    notification_to_email: str = "hello@blkoutuk.com"
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Validate the environment once and share the result"""
+    return Settings()
@@ -36,6 +36,9 @@ def mock_llm_client():
         "suggested_tags": ["black", "queer", "uk"],
         "recommended_action": "publish",
     })
+    mock.analyze_relevance_batch = AsyncMock(side_effect=lambda items: [
+        mock.analyze_relevance.return_value for _ in items
+    ])
     return mock
 
 
@@ -64,6 +67,7 @@ def mock_database():
         "errors": 0,
     })
     mock.log_discovery_run = AsyncMock(return_value=True)
+    mock.filter_unseen_urls = AsyncMock(side_effect=lambda table, urls: set(urls))
     return mock
 
 
@@ -5,18 +5,30 @@ Tests: Date extraction, event deduplication, relevance filtering, search result
 
 import pytest
 import asyncio
-from datetime import datetime, timedelta
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 
 from src.agents import (
+    _regex_event_date,
+    _unique_by_url,
     NewsResearchAgent,
     EventsDiscoveryAgent,
+    PlanningAgent,
     DiscoveredArticle,
     DiscoveredEvent,
 )
+from src.rate_limit import QuotaExceeded
 from src.search import SearchResult
 
 
+def _stream(results):
+    """Stand-in for SearchAgent.multi_search_stream yielding one batch"""
+    async def multi_search_stream(*args, **kwargs):
+        yield results
+    return multi_search_stream
+
+
 class TestNewsResearchAgent:
     """Test news research agent functionality"""
 
@@ -85,9 +97,7 @@ class TestNewsResearchAgent:
                     agent = NewsResearchAgent()
 
                     # Mock search to return sample results
-                    mock_search_class.return_value.multi_search = AsyncMock(
-                        return_value=sample_search_results
-                    )
+                    mock_search_class.return_value.multi_search_stream = _stream(sample_search_results)
                     agent.search = mock_search_class.return_value
 
                     articles = await agent.research(time_range="w")
@@ -116,9 +126,7 @@ class TestNewsResearchAgent:
                         published_date="2026-01-07",
                     )
 
-                    mock_search_class.return_value.multi_search = AsyncMock(
-                        return_value=[result]
-                    )
+                    mock_search_class.return_value.multi_search_stream = _stream([result])
                     agent.search = mock_search_class.return_value
 
                     articles = await agent.research(time_range="w")
@@ -133,6 +141,252 @@ class TestNewsResearchAgent:
                     assert isinstance(article.relevance_score, int)
                     assert 0 <= article.relevance_score <= 100
 
+    @pytest.mark.asyncio
+    async def test_research_analyzes_borderline_candidates_concurrently(self, mock_llm_client):
+        """Test that LLM analysis runs in parallel, bounded by llm_concurrency"""
+        in_flight = 0
+        peak = 0
+
+        async def analyze_relevance_batch(items):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{"relevance_score": 80, "suggested_category": "news"} for _ in items]
+
+        mock_llm_client.analyze_relevance_batch = analyze_relevance_batch
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database"):
+                    agent = NewsResearchAgent()
+                    agent.llm_concurrency = 3
+                    agent.llm_batch_size = 2
+
+                    # Black + LGBTQ without UK scores 60: borderline, needs LLM
+                    results = [
+                        SearchResult(
+                            title=f"Black community queer night story {i}",
+                            url=f"https://example.com/article-{i}",
+                            snippet="Profile",
+                            source="Example",
+                        )
+                        for i in range(12)
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+
+                    articles = await agent.research(time_range="w")
+
+                    assert len(articles) == 12
+                    assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_research_weighs_source_trust_before_llm(self, mock_llm_client):
+        """Test that borderline results reach the LLM only with enough source trust"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database"):
+                    agent = NewsResearchAgent()
+
+                    # Black + UK without LGBTQ scores 50; Black + LGBTQ without UK scores 60
+                    results = [
+                        SearchResult("Black history month events in London", "https://example.com/a", "", "Example"),
+                        SearchResult("Black history month events in London", "https://www.voice-online.co.uk/b", "", "Voice"),
+                        SearchResult("Black community queer night story", "https://uk.news.yahoo.com/c", "", "Yahoo"),
+                        SearchResult("Black community queer night story", "https://example.com/d", "", "Example"),
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+
+                    await agent.research(time_range="w")
+
+                    [items] = mock_llm_client.analyze_relevance_batch.await_args.args
+                    assert [item["url"] for item in items] == [
+                        "https://www.voice-online.co.uk/b",
+                        "https://example.com/d",
+                    ]
+
+    @pytest.mark.asyncio
+    async def test_research_scores_duplicate_urls_once(self, mock_llm_client):
+        """Test that a URL returned by several queries reaches the LLM once"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database"):
+                    agent = NewsResearchAgent()
+
+                    result = SearchResult(
+                        title="Black community queer night story",
+                        url="https://example.com/article",
+                        snippet="Profile",
+                        source="Example",
+                    )
+                    mock_search_class.return_value.multi_search_stream = _stream([result, result, result])
+                    agent.search = mock_search_class.return_value
+
+                    articles = await agent.research(time_range="w")
+
+                    assert len(articles) == 1
+                    assert mock_llm_client.analyze_relevance_batch.await_count == 1
+                    assert len(mock_llm_client.analyze_relevance_batch.await_args.args[0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_research_and_save_streams_inserts(self, mock_llm_client, mock_database):
+        """Test that articles are inserted in chunks and the chunk stats are summed"""
+        mock_database.insert_articles_batch = AsyncMock(
+            side_effect=lambda articles: {"inserted": len(articles), "skipped": 0}
+        )
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database", return_value=mock_database):
+                    agent = NewsResearchAgent()
+                    agent.save_batch_size = 2
+
+                    # Black + LGBTQ + UK scores 85: accepted without the LLM
+                    results = [
+                        SearchResult(f"Black trans health UK initiative {i}", f"https://example.com/{i}", "", "Health")
+                        for i in range(5)
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+
+                    stats = await agent.research_and_save(time_range="d")
+
+                    chunks = [len(c.args[0]) for c in mock_database.insert_articles_batch.await_args_list]
+                    assert chunks == [2, 2, 1]
+                    assert stats["inserted"] == 5
+
+    @pytest.mark.asyncio
+    async def test_research_failure_still_saves_accepted_articles(self, mock_llm_client, mock_database):
+        """Test that articles queued before research raises are written and the writer finishes"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent"):
+                with patch("src.agents.get_database", return_value=mock_database):
+                    agent = NewsResearchAgent()
+                    article = DiscoveredArticle(title="Story", url="https://example.com/s", source="Example", snippet="")
+
+                    async def failing_research(*args, sink, **kwargs):
+                        sink.put_nowait(article)
+                        raise RuntimeError("search backend down")
+
+                    agent._research = failing_research
+
+                    with pytest.raises(RuntimeError):
+                        await agent.research_and_save(time_range="d")
+
+                    mock_database.insert_articles_batch.assert_awaited_once_with([article])
+
+    @pytest.mark.asyncio
+    async def test_research_and_save_skips_stored_urls(self, mock_llm_client, mock_database):
+        """Test that URLs already in the database never reach the LLM"""
+        stored = "https://example.com/article-0"
+        mock_database.filter_unseen_urls = AsyncMock(
+            side_effect=lambda table, urls: {u for u in urls if u != stored}
+        )
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database", return_value=mock_database):
+                    agent = NewsResearchAgent()
+
+                    results = [
+                        SearchResult(
+                            title=f"Black community queer night story {i}",
+                            url=f"https://example.com/article-{i}",
+                            snippet="Profile",
+                            source="Example",
+                        )
+                        for i in range(3)
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+
+                    await agent.research_and_save(time_range="d")
+
+                    analyzed = [
+                        item["url"]
+                        for c in mock_llm_client.analyze_relevance_batch.await_args_list
+                        for item in c.args[0]
+                    ]
+                    assert sorted(analyzed) == [
+                        "https://example.com/article-1",
+                        "https://example.com/article-2",
+                    ]
+
+
+    @pytest.mark.asyncio
+    async def test_batch_api_round_trip(self, mock_llm_client, mock_database):
+        """Test that borderline candidates are submitted, then saved once the batch finishes"""
+        mock_llm_client.submit_relevance_batch = AsyncMock(return_value="batch_1")
+        mock_llm_client.fetch_relevance_batch = AsyncMock(side_effect=[None, {0: {"relevance_score": 90}}])
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database", return_value=mock_database):
+                    agent = NewsResearchAgent()
+
+                    results = [
+                        SearchResult(
+                            title=f"Black community queer night story {i}",
+                            url=f"https://example.com/article-{i}",
+                            snippet="Profile",
+                            source="Example",
+                        )
+                        for i in range(2)
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+
+                    stats = await agent.research_and_submit_batch(time_range="m")
+
+                    assert stats["batch_id"] == "batch_1"
+                    assert stats["batched_candidates"] == 2
+                    mock_llm_client.analyze_relevance_batch.assert_not_awaited()
+                    candidates = mock_database.log_llm_batch.await_args.args[1]
+
+                    mock_database.pending_llm_batches = AsyncMock(return_value=[
+                        {"id": "log_1", "stats": {"batch_id": "batch_1", "candidates": candidates}},
+                    ])
+                    assert (await agent.collect_llm_batches())["batches"] == 0
+
+                    collected = await agent.collect_llm_batches()
+
+                    assert collected == {"batches": 1, "discovered": 1}
+                    saved = mock_database.insert_articles_batch.await_args.args[0]
+                    assert [a.url for a in saved] == ["https://example.com/article-0"]
+                    assert mock_database.finish_llm_batch.await_args.args[0] == "log_1"
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs_keep_their_own_deferred(self, mock_llm_client, mock_database):
+        """Test that a concurrent scored run doesn't clear a deferring run's candidates"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database", return_value=mock_database):
+                    agent = NewsResearchAgent()
+                    results = [
+                        SearchResult(
+                            title=f"Black community queer night story {i}",
+                            url=f"https://example.com/article-{i}",
+                            snippet="Profile",
+                            source="Example",
+                        )
+                        for i in range(2)
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+
+                    weekly, daily = await asyncio.gather(
+                        agent._research("m", defer_llm=True),
+                        agent._research("d"),
+                    )
+
+                    assert [r.url for r, _ in weekly.deferred] == [r.url for r in results]
+                    assert weekly.articles == []
+                    assert daily.deferred == []
+                    assert len(daily.articles) == 2
+
 
 class TestEventsDiscoveryAgent:
     """Test events discovery agent functionality"""
@@ -196,6 +450,30 @@ class TestEventsDiscoveryAgent:
 
                 assert date is None
 
+    @pytest.mark.asyncio
+    async def test_extract_date_explicit_date_skips_llm(self, mock_llm_client):
+        """Test that an explicit upcoming date is read without calling the LLM"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.get_database"):
+                agent = EventsDiscoveryAgent()
+                agent.llm = mock_llm_client
+
+                date_str = await agent._extract_date_from_text(
+                    "Title: BBZ\nURL: https://example.com/2099/03/14/bbz\nSnippet: Doors 10pm"
+                )
+
+                assert date_str == "2099-03-14"
+                mock_llm_client.complete.assert_not_awaited()
+
+    def test_regex_date_picks_earliest_upcoming(self):
+        """Test ISO and day-month-year forms, skipping past and impossible dates"""
+        today = date(2026, 1, 10)
+
+        assert _regex_event_date("Posted 2026-01-02. Party on 14th February 2026", today) == "2026-02-14"
+        assert _regex_event_date("/2026/03/01/ and 7 Feb 2026", today) == "2026-02-07"
+        assert _regex_event_date("Was on 2025-12-31, see 31 Feb 2026", today) is None
+        assert _regex_event_date("Saturday Feb 7", today) is None
+
     @pytest.mark.asyncio
     async def test_discover_from_search_extracts_dates(self, mock_llm_client, sample_search_results):
         """Test that discovery from search extracts dates from results"""
@@ -221,6 +499,44 @@ class TestEventsDiscoveryAgent:
                     assert events[0].date == "2026-01-07"
                     assert events[1].date == "2026-01-07"
 
+    @pytest.mark.asyncio
+    async def test_discover_from_search_extracts_dates_concurrently(self, mock_llm_client, sample_search_results):
+        """Test that date extraction overlaps and dates stay with their events"""
+        in_flight = 0
+        peak = 0
+
+        async def complete(prompt, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            # Later results answer first; each date must still land on its own event
+            return "2026-02-21" if "Hunagama" in prompt else "2026-01-07"
+
+        mock_llm_client.complete = complete
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.EventSearchAgent") as mock_search_class:
+                with patch("src.agents.get_database"):
+                    agent = EventsDiscoveryAgent()
+                    # Drop the explicit date so every result needs the LLM
+                    results = [
+                        replace(r, snippet=r.snippet.replace(" Event date: 2026-02-21", ""))
+                        for r in sample_search_results[:3]
+                    ]
+                    mock_search_class.return_value.search_qtipoc_events = AsyncMock(
+                        return_value=results
+                    )
+                    agent.search = mock_search_class.return_value
+
+                    events = await agent.discover_from_search()
+
+                    assert peak == len(events) > 1
+                    dates = {e.name: e.date for e in events}
+                    assert dates["Hunagama Queer Night"] == "2026-02-21"
+                    assert dates["Black LGBTQ Pride Manchester"] == "2026-01-07"
+
     @pytest.mark.asyncio
     async def test_discover_all_deduplicates_by_url(self, mock_llm_client, sample_event_data):
         """Test that discover_all deduplicates events by URL"""
@@ -267,6 +583,151 @@ class TestEventsDiscoveryAgent:
                         urls = [e.url for e in unique_events]
                         assert urls.count("https://outsavvy.com/event/bbz-jan-7") == 1
 
+    @pytest.mark.asyncio
+    async def test_discover_all_merges_details_from_duplicate_urls(self, mock_llm_client):
+        """Test that a repeat listing fills in fields the first one lacked"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.EventSearchAgent"):
+                with patch("src.agents.ScraperAgent"):
+                    with patch("src.agents.get_database"):
+                        agent = EventsDiscoveryAgent()
+
+                        from_search = DiscoveredEvent(
+                            name="BBZ Party",
+                            url="https://outsavvy.com/event/bbz-jan-7",
+                            source_platform="Search",
+                        )
+                        scraped = DiscoveredEvent(
+                            name="BBZ: Black Boyz and Girlz",
+                            url="https://outsavvy.com/event/bbz-jan-7",
+                            venue="Phoenix Bar",
+                            date="2026-01-07",
+                            source_platform="OutSavvy",
+                        )
+                        agent.discover_from_search = AsyncMock(return_value=[from_search])
+                        agent.discover_from_scraping = AsyncMock(return_value=[scraped])
+
+                        [event] = await agent.discover_all()
+
+                        assert event.name == "BBZ Party"
+                        assert event.source_platform == "Search"
+                        assert event.venue == "Phoenix Bar"
+                        assert event.date == "2026-01-07"
+
+    @pytest.mark.asyncio
+    async def test_scraping_reuses_injected_browser(self, mock_llm_client):
+        """Test that a shared scraper is used instead of launching a browser per run"""
+        from src.scraper import ScrapedEvent
+
+        shared = MagicMock(is_running=True)
+        shared.scrape_all_platforms = AsyncMock(return_value=[
+            ScrapedEvent(name="BBZ", url="https://outsavvy.com/event/bbz", source_platform="OutSavvy"),
+        ])
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.EventSearchAgent"):
+                with patch("src.agents.ScraperAgent") as mock_scraper_class:
+                    with patch("src.agents.get_database"):
+                        agent = EventsDiscoveryAgent()
+                        agent.scraper = shared
+
+                        events = await agent.discover_from_scraping()
+
+                        assert [e.url for e in events] == ["https://outsavvy.com/event/bbz"]
+                        mock_scraper_class.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_discover_all_scores_events_with_llm(self, mock_llm_client):
+        """Test that events get LLM scores in batches and low scorers are dropped"""
+        async def analyze_relevance_batch(items):
+            return [
+                {"relevance_score": 30} if "Pub quiz" in item["title"] else {"relevance_score": 92}
+                for item in items
+            ]
+
+        mock_llm_client.analyze_relevance_batch = AsyncMock(side_effect=analyze_relevance_batch)
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.EventSearchAgent"):
+                with patch("src.agents.ScraperAgent"):
+                    with patch("src.agents.get_database"):
+                        agent = EventsDiscoveryAgent()
+                        agent.llm_batch_size = 2
+
+                        events = [
+                            DiscoveredEvent(name=f"Black queer night {i}", url=f"https://example.com/{i}", relevance_score=75)
+                            for i in range(3)
+                        ] + [DiscoveredEvent(name="Pub quiz", url="https://example.com/quiz", relevance_score=75)]
+                        agent.discover_from_search = AsyncMock(return_value=events)
+                        agent.discover_from_scraping = AsyncMock(return_value=[])
+
+                        scored = await agent.discover_all()
+
+                        assert [e.url for e in scored] == [f"https://example.com/{i}" for i in range(3)]
+                        assert {e.relevance_score for e in scored} == {92}
+                        assert mock_llm_client.analyze_relevance_batch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_discover_all_keeps_heuristic_scores_without_llm(self, mock_llm_client):
+        """Test that events are kept unscored when the LLM quota is exhausted"""
+        mock_llm_client.analyze_relevance_batch = AsyncMock(side_effect=QuotaExceeded("quota"))
+
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.EventSearchAgent"):
+                with patch("src.agents.ScraperAgent"):
+                    with patch("src.agents.get_database"):
+                        agent = EventsDiscoveryAgent()
+
+                        event = DiscoveredEvent(name="BBZ Party", url="https://example.com/bbz", relevance_score=85)
+                        agent.discover_from_search = AsyncMock(return_value=[event])
+                        agent.discover_from_scraping = AsyncMock(return_value=[])
+
+                        assert await agent.discover_all() == [event]
+
+    @pytest.mark.asyncio
+    async def test_discover_all_drops_cross_platform_near_duplicates(self, mock_llm_client):
+        """Test that the same listing on two platforms is kept once per date"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.EventSearchAgent"):
+                with patch("src.agents.ScraperAgent"):
+                    with patch("src.agents.get_database"):
+                        agent = EventsDiscoveryAgent()
+
+                        description = "Black queer club night with DJs and performers until late"
+                        outsavvy = DiscoveredEvent(
+                            name="BBZ Black Boyz and Girlz",
+                            url="https://outsavvy.com/event/bbz-jan-7",
+                            venue="Phoenix Bar",
+                            date="2026-01-07",
+                            description=description,
+                        )
+                        eventbrite = DiscoveredEvent(
+                            name="BBZ Black Boyz and Girlz",
+                            url="https://www.eventbrite.co.uk/e/bbz-123",
+                            venue="Phoenix Bar",
+                            date="2026-01-07",
+                            description=description + "!",
+                        )
+                        next_month = DiscoveredEvent(
+                            name="BBZ Black Boyz and Girlz",
+                            url="https://outsavvy.com/event/bbz-feb-4",
+                            venue="Phoenix Bar",
+                            date="2026-02-04",
+                            description=description,
+                        )
+
+                        agent.discover_from_search = AsyncMock(return_value=[outsavvy])
+                        agent.discover_from_scraping = AsyncMock(
+                            return_value=[eventbrite, next_month]
+                        )
+
+                        unique_events = await agent.discover_all()
+
+                        assert [e.url for e in unique_events] == [
+                            "https://outsavvy.com/event/bbz-jan-7",
+                            "https://outsavvy.com/event/bbz-feb-4",
+                        ]
+
     @pytest.mark.asyncio
     async def test_discover_all_handles_errors_gracefully(self):
         """Test that discover_all handles search/scrape errors gracefully"""
@@ -351,6 +812,40 @@ class TestEventsDiscoveryAgent:
                         assert result["discovered"] == 1
 
 
+class TestPlanningAgent:
+    """Test top-level coordination of the daily run"""
+
+    @pytest.mark.asyncio
+    async def test_daily_discovery_runs_news_and_events_concurrently(self):
+        """Test that both phases overlap and one failing doesn't drop the other"""
+        started = []
+
+        async def news(**kwargs):
+            started.append("news")
+            await asyncio.sleep(0.01)
+            assert "events" in started
+            return {"discovered": 2, "partial": False}
+
+        async def events():
+            started.append("events")
+            await asyncio.sleep(0.01)
+            raise RuntimeError("scraper down")
+
+        with patch("src.agents.NewsResearchAgent"), patch("src.agents.EventsDiscoveryAgent"):
+            with patch("src.agents.get_database"), patch("src.agents.IVORSync"):
+                agent = PlanningAgent()
+                agent.news_agent.research_and_save = news
+                agent.events_agent.discover_and_save = events
+                agent.ivor_sync.sync_daily_discoveries = AsyncMock(return_value={"synced": 2})
+
+                results = await agent.run_daily_discovery()
+
+        assert results["news"] == {"discovered": 2, "partial": False}
+        assert results["events"] == {}
+        assert results["errors"] == ["Events discovery failed: scraper down"]
+        assert results["ivor_sync"] == {"synced": 2}
+
+
 class TestDeduplication:
     """Test URL-based deduplication"""
 
@@ -408,6 +903,22 @@ class TestDeduplication:
         # Different cases = different URLs in dedup logic
         assert len(unique_events) == 2
 
+    def test_search_results_deduplicated_before_scoring(self):
+        """Test that tracking-param variants collapse and keep the richer fields"""
+        results = [
+            SearchResult("A", "https://www.example.com/story", "Short", "Example"),
+            SearchResult("A", "https://example.com/story/?utm_source=x", "A much longer snippet", "Example", "2026-01-02"),
+            SearchResult("B", "https://example.com/other", "Other", "Example"),
+        ]
+
+        seen_urls = set()
+        unique = _unique_by_url(results, seen_urls)
+
+        assert [r.url for r in unique] == ["https://www.example.com/story", "https://example.com/other"]
+        assert unique[0].snippet == "A much longer snippet"
+        assert unique[0].published_date == "2026-01-02"
+        assert _unique_by_url([SearchResult("A", "http://example.com/story#top", "", "Example")], seen_urls) == []
+
 
 class TestErrorHandling:
     """Test error handling in agents"""
@@ -429,13 +940,11 @@ class TestErrorHandling:
                         published_date="2026-01-07",
                     )
 
-                    mock_search_class.return_value.multi_search = AsyncMock(
-                        return_value=[result]
-                    )
+                    mock_search_class.return_value.multi_search_stream = _stream([result])
                     agent.search = mock_search_class.return_value
 
                     # Make LLM fail
-                    mock_llm_client.analyze_relevance = AsyncMock(
+                    mock_llm_client.analyze_relevance_batch = AsyncMock(
                         side_effect=Exception("API error")
                     )
 
@@ -445,6 +954,35 @@ class TestErrorHandling:
                     assert len(articles) > 0
                     assert articles[0].title == "Black trans health UK initiative"
 
+    @pytest.mark.asyncio
+    async def test_news_agent_stops_llm_calls_when_quota_exhausted(self, mock_llm_client, mock_database):
+        """Test that running out of LLM quota ends analysis early and saves a partial run"""
+        with patch("src.agents.get_llm_client", return_value=mock_llm_client):
+            with patch("src.agents.SearchAgent") as mock_search_class:
+                with patch("src.agents.get_database", return_value=mock_database):
+                    agent = NewsResearchAgent()
+                    agent.llm_concurrency = 1
+                    agent.llm_batch_size = 2
+
+                    results = [
+                        SearchResult(
+                            title=f"Black community queer night story {i}",
+                            url=f"https://example.com/article-{i}",
+                            snippet="Profile",
+                            source="Example",
+                        )
+                        for i in range(5)
+                    ]
+                    mock_search_class.return_value.multi_search_stream = _stream(results)
+                    agent.search = mock_search_class.return_value
+                    mock_llm_client.analyze_relevance_batch = AsyncMock(side_effect=QuotaExceeded("quota"))
+
+                    stats = await agent.research_and_save(time_range="d")
+
+                    assert mock_llm_client.analyze_relevance_batch.await_count == 1
+                    assert stats["partial"] is True
+                    assert mock_database.log_discovery_run.await_args.args[0] == "news_partial"
+
     @pytest.mark.asyncio
     async def test_events_agent_date_extraction_error_fallback(self, mock_llm_client):
         """Test that events agent handles date extraction errors"""
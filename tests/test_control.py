@@ -0,0 +1,81 @@
+"""
+Test suite for the daemon control socket
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.control import send_jobs, serve_control
+
+
+class TestControlSocket:
+    """Test triggering jobs on a running daemon"""
+
+    @pytest.mark.asyncio
+    async def test_jobs_reach_running_daemon(self, tmp_path):
+        """Test that valid jobs are handed to the trigger and echoed back"""
+        path = str(tmp_path / "ctl.sock")
+        received = []
+        server = await serve_control(received.append, path)
+        try:
+            accepted = await send_jobs(["events", "bogus", "events", "grants"], path)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert accepted == ["events", "grants"]
+        assert received == [["events", "grants"]]
+
+    @pytest.mark.asyncio
+    async def test_no_daemon_returns_none(self, tmp_path):
+        """Test that callers can fall back to running in-process"""
+        assert await send_jobs(["daily"], str(tmp_path / "missing.sock")) is None
+
+    @pytest.mark.asyncio
+    async def test_refuses_second_daemon(self, tmp_path):
+        """Test that a live socket is not hijacked by another daemon"""
+        path = str(tmp_path / "ctl.sock")
+        server = await serve_control(lambda jobs: None, path)
+        try:
+            with pytest.raises(RuntimeError):
+                await serve_control(lambda jobs: None, path)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+
+class TestTriggeredJobs:
+    """Test jobs started over the control socket"""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_trigger_is_skipped(self):
+        """Test that a job already running is not started a second time"""
+        from src.scheduler import DiscoveryScheduler
+
+        with patch("src.scheduler.PlanningAgent"), patch("src.scheduler.GrantPlanningAgent"):
+            scheduler = DiscoveryScheduler()
+
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def daily():
+            started.set()
+            await release.wait()
+            return {}
+
+        scheduler.agent.run_daily_discovery = AsyncMock(side_effect=daily)
+
+        scheduler.trigger(["daily"])
+        await started.wait()
+        first = set(scheduler._triggered)
+        scheduler.trigger(["daily"])
+        await asyncio.wait_for(asyncio.gather(*(scheduler._triggered - first)), timeout=1)
+
+        release.set()
+        await asyncio.gather(*first)
+        assert scheduler.agent.run_daily_discovery.await_count == 1
+
+        # Once finished, the job can run again
+        await scheduler.run_now("daily")
+        assert scheduler.agent.run_daily_discovery.await_count == 2
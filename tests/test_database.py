@@ -0,0 +1,163 @@
+"""
+Test suite for the Supabase database client
+"""
+
+import hashlib
+from datetime import datetime
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.agents import DiscoveredArticle
+from src.database import DatabaseClient, _OrjsonHTTPClient
+from src.dedup import BloomFilter
+from src.rate_limit import CircuitOpen
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """DatabaseClient with the Supabase client replaced by a mock"""
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.sig")
+    client = DatabaseClient()
+    client.client = MagicMock()
+    client.client.table.return_value.insert.return_value.execute = AsyncMock()
+    return client
+
+
+class TestDiscoveryLogs:
+    """Test background writing of discovery logs"""
+
+    @pytest.mark.asyncio
+    async def test_logs_are_queued_and_batched(self, db):
+        """Test that logging returns without writing and queued rows share one insert"""
+        await db.log_discovery_run("news", {"total_found": 3})
+        await db.log_discovery_run("events", {"total_found": 1}, errors=["scrape failed"])
+
+        db.client.table.return_value.insert.assert_not_called()
+
+        await db.flush_logs()
+
+        [rows] = db.client.table.return_value.insert.call_args.args
+        assert [r["run_type"] for r in rows] == ["news", "events"]
+        assert rows[1]["status"] == "completed_with_errors"
+
+    @pytest.mark.asyncio
+    async def test_write_errors_do_not_stop_the_writer(self, db):
+        """Test that a failed insert is reported and later logs still get written"""
+        execute = db.client.table.return_value.insert.return_value.execute
+        execute.side_effect = [Exception("timeout"), None]
+
+        await db.log_discovery_run("news", {})
+        await db.flush_logs()
+        await db.log_discovery_run("events", {})
+        await db.flush_logs()
+
+        assert execute.await_count == 2
+
+
+class TestArticleRows:
+    """Test the news_articles payload"""
+
+    def test_url_hash_left_to_postgres(self, db):
+        """Test that rows omit the generated url_hash column"""
+        row = db._article_row(DiscoveredArticle(
+            title="Story", url="https://example.com/story", source="Example", snippet="",
+        ))
+
+        assert "url_hash" not in row
+        assert row["source_url"] == "https://example.com/story"
+
+    def test_hash_matches_generated_column(self, db):
+        """Test that the seen-filter key follows md5(lower(btrim(source_url)))"""
+        expected = hashlib.md5(b"https://example.com/story").hexdigest()
+        assert db._generate_hash("  HTTPS://Example.com/Story ") == expected
+
+
+class TestSeenFilter:
+    """Test that seen-filter hits are confirmed before URLs are dropped"""
+
+    @pytest.mark.asyncio
+    async def test_false_positive_is_kept(self, db):
+        """Test that only hits the table confirms are treated as stored"""
+        stored, new, fresh = "https://example.com/stored", "https://example.com/new", "https://example.com/fresh"
+        db._seen_articles = BloomFilter()
+        db._seen_articles.update([db._generate_hash(stored), db._generate_hash(new)])  # `new` is a false positive
+        lookup = db.client.table.return_value.select.return_value.in_
+        lookup.return_value.execute = AsyncMock(return_value=MagicMock(data=[{"url_hash": db._generate_hash(stored)}]))
+
+        assert await db.filter_unseen_urls("news_articles", [stored, new, fresh]) == {new, fresh}
+        assert sorted(lookup.call_args.args[1]) == sorted([db._generate_hash(stored), db._generate_hash(new)])
+
+    @pytest.mark.asyncio
+    async def test_misses_need_no_lookup(self, db):
+        """Test that URLs the filter has never seen skip the database"""
+        db._seen_events = BloomFilter()
+
+        assert await db.filter_unseen_urls("events", ["https://example.com/e"]) == {"https://example.com/e"}
+        db.client.table.assert_not_called()
+
+
+class TestGrantsBatch:
+    """Test bulk grant inserts"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_application_urls_sent_once(self, db):
+        """Test that rows are deduplicated by application_url before the upsert"""
+        db._upsert_new = AsyncMock(return_value=1)
+        rows = [
+            {"application_url": "https://funder.org/apply", "title": "Fund"},
+            {"application_url": "https://funder.org/apply", "title": "Fund (again)"},
+        ]
+
+        assert await db.insert_grants_batch(rows) == {"inserted": 1, "skipped": 1}
+        table, sent, on_conflict = db._upsert_new.await_args.args
+        assert (table, on_conflict) == ("grants", "application_url")
+        assert [r["title"] for r in sent] == ["Fund"]
+
+
+class TestOrjsonHTTPClient:
+    """Test orjson encoding of request bodies"""
+
+    @pytest.mark.asyncio
+    async def test_json_bodies_are_orjson_encoded(self):
+        """Test that rows are sent compactly as UTF-8 JSON with datetimes serialised"""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["content_type"] = request.headers["content-type"]
+            seen["body"] = request.content
+            return httpx.Response(201)
+
+        async with _OrjsonHTTPClient(transport=httpx.MockTransport(handler)) as client:
+            await client.post("https://example.com/rows", json=[{"name": "Café", "at": datetime(2026, 1, 7)}])
+
+        assert seen["content_type"] == "application/json"
+        assert seen["body"] == '[{"name":"Café","at":"2026-01-07T00:00:00"}]'.encode()
+
+
+class TestTransientFailures:
+    """Test retries and the circuit breaker around idempotent queries"""
+
+    @pytest.mark.asyncio
+    async def test_network_errors_are_retried(self, db):
+        """Test that a dropped connection is retried and the breaker stays closed"""
+        query = MagicMock()
+        query.execute = AsyncMock(side_effect=[httpx.ConnectError("reset"), "ok"])
+
+        assert await db._execute(query) == "ok"
+        assert query.execute.await_count == 2
+        assert not db.breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_the_request(self, db):
+        """Test that calls fail fast without touching Supabase during an outage"""
+        for _ in range(db.breaker.threshold):
+            db.breaker.record_failure()
+        query = MagicMock()
+        query.execute = AsyncMock()
+
+        with pytest.raises(CircuitOpen):
+            await db._execute(query)
+        query.execute.assert_not_awaited()
@@ -0,0 +1,64 @@
+"""
+Test suite for in-process deduplication helpers
+"""
+
+import hashlib
+
+import pytest
+
+from src.dedup import BloomFilter, SimHashIndex, simhash
+
+
+def _url_hash(url: str) -> str:
+    return hashlib.md5(url.lower().strip().encode()).hexdigest()
+
+
+class TestBloomFilter:
+    """Test the url_hash Bloom filter"""
+
+    def test_added_keys_are_found(self):
+        """Test that there are no false negatives"""
+        bloom = BloomFilter(capacity=1000)
+        hashes = [_url_hash(f"https://example.com/event/{i}") for i in range(1000)]
+        bloom.update(hashes)
+
+        assert all(h in bloom for h in hashes)
+
+    def test_unseen_keys_mostly_absent(self):
+        """Test that the false-positive rate stays near the target"""
+        bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+        bloom.update(_url_hash(f"https://example.com/seen/{i}") for i in range(1000))
+
+        false_positives = sum(
+            _url_hash(f"https://example.com/unseen/{i}") in bloom for i in range(10_000)
+        )
+        assert false_positives < 50
+
+    def test_empty_filter(self):
+        """Test that an empty filter contains nothing"""
+        assert _url_hash("https://example.com") not in BloomFilter()
+
+
+class TestSimHash:
+    """Test near-duplicate fingerprinting of event listings"""
+
+    BASE = "BBZ Black Boyz and Girlz queer club night at the Phoenix Bar London with DJs until late"
+
+    def test_identical_text_identical_fingerprint(self):
+        """Test that fingerprints are deterministic and case-insensitive"""
+        assert simhash(self.BASE) == simhash(self.BASE.upper())
+
+    def test_paraphrase_is_near_duplicate(self):
+        """Test that a lightly edited listing is found in the index"""
+        index = SimHashIndex(k=3)
+        index.add(simhash(self.BASE))
+
+        paraphrase = self.BASE + " tickets"
+        assert simhash(paraphrase) in index
+
+    def test_distinct_listing_is_not_duplicate(self):
+        """Test that an unrelated listing is not matched"""
+        index = SimHashIndex(k=3)
+        index.add(simhash(self.BASE))
+
+        assert simhash("Hungama South Asian queer dance party in Shoreditch every month") not in index
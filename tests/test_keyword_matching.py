@@ -0,0 +1,178 @@
+"""
+Test suite for precompiled keyword, domain and query matching in the BLKOUT config
+"""
+
+import pytest
+
+from configs.blkout_config import (
+    score_text,
+    keyword_categories,
+    classify_domain,
+    extract_domain,
+    is_event_source,
+    _dedupe_queries,
+    keyword_mask,
+    keyword_masks,
+    category_counts,
+    CATEGORY_MASKS,
+)
+from configs.frozen import freeze_keywords
+
+
+class TestFreezeKeywords:
+    """Test import-time keyword normalisation"""
+
+    def test_lowercases_and_dedupes_in_order(self):
+        """Test that keywords are lowercased once and duplicates dropped"""
+        assert freeze_keywords(["QTIPOC", "Black", "qtipoc"]) == ("qtipoc", "black")
+
+
+class TestScoreText:
+    """Test single-pass keyword category tagging"""
+
+    def test_tags_overlapping_keywords(self):
+        """Test that overlapping keywords are reported in every category"""
+        hits = score_text("Black queer night in London")
+
+        assert "black queer" in hits["high"]
+        assert "black" in hits["black"]
+        assert "queer" in hits["lgbtq"]
+        assert "london" in hits["uk"]
+
+    def test_case_insensitive(self):
+        """Test that matching ignores case"""
+        assert score_text("QTIPOC EVENTS") == score_text("qtipoc events")
+
+    def test_no_hits(self):
+        """Test that irrelevant text returns no categories"""
+        assert score_text("Weather forecast and traffic") == {}
+
+    def test_matches_substring_semantics(self):
+        """Test parity with the `kw in text` checks it replaces"""
+        text = "Afro-Caribbean trans wiki guide for Manchester"
+        hits = score_text(text)
+        text_lower = text.lower()
+
+        for category, keywords in keyword_categories.items():
+            expected = {kw for kw in keywords if kw in text_lower}
+            assert set(hits.get(category, [])) == expected
+
+
+class TestKeywordMask:
+    """Test bitmask keyword scoring"""
+
+    def test_category_counts(self):
+        """Test popcount of distinct keyword hits per category"""
+        counts = category_counts(keyword_mask("Black gay and black trans people in London"))
+
+        assert counts["high"] == 2  # "black gay", "black trans"
+        assert counts["black"] == 1  # "black" counted once
+        assert counts["lgbtq"] == 2  # "gay", "trans"
+        assert counts["uk"] == 1
+        assert counts["negative"] == 0
+
+    def test_mask_category_membership(self):
+        """Test category tests via mask intersection"""
+        mask = keyword_mask("QTIPOC night")
+
+        assert mask & CATEGORY_MASKS["high"]
+        assert not mask & CATEGORY_MASKS["uk"]
+        assert keyword_mask("weather and traffic") == 0
+
+    def test_batch_matches_per_document(self):
+        """Test that one batched scan equals per-text masks without bleed-over"""
+        texts = ["Black", "queer UK news", "", "İstanbul trans night", "weather"]
+        assert keyword_masks(texts) == [keyword_mask(t) for t in texts]
+        assert keyword_masks([]) == []
+
+
+class TestClassifyDomain:
+    """Test exact/suffix domain classification"""
+
+    def test_blacklisted_host_and_subdomain(self):
+        """Test blacklisted domains block the host and its subdomains"""
+        assert classify_domain("https://wikipedia.org/wiki/Pride") == "block"
+        assert classify_domain("https://en.wikipedia.org/wiki/Pride") == "block"
+        assert classify_domain("https://www.reddit.com/r/lgbt") == "block"
+
+    def test_lookalike_domain_not_blocked(self):
+        """Test that substrings of a blacklisted domain don't match"""
+        assert classify_domain("https://notwikipedia.org/page") == "unknown"
+        assert classify_domain("https://wikipedia.org.evil.com/page") == "unknown"
+
+    def test_whitelisted_and_wildcard(self):
+        """Test whitelist hosts and *. wildcard suffixes"""
+        assert classify_domain("https://www.pinknews.co.uk/2026/01/article") == "allow"
+        assert classify_domain("https://ukblackpride.org.uk/events") == "allow"
+
+    def test_unknown_and_malformed(self):
+        """Test unlisted and malformed URLs"""
+        assert classify_domain("https://example.com/article") == "unknown"
+        assert classify_domain("not a url") == "unknown"
+        assert classify_domain("") == "unknown"
+
+    def test_extract_domain(self):
+        """Test host extraction strips www., port, userinfo and case"""
+        assert extract_domain("https://www.Eventbrite.co.uk/e/123?x=1") == "eventbrite.co.uk"
+        assert extract_domain("http://user@outsavvy.com:8080/event") == "outsavvy.com"
+        assert extract_domain("not a url") == ""
+
+    def test_event_source_fragments(self):
+        """Test platform fragments match anywhere in the host"""
+        assert is_event_source("eventbrite.com")
+        assert is_event_source("m.facebook.com")
+        assert not is_event_source("theguardian.com")
+        assert not is_event_source("")
+
+
+class TestQueryDeduplication:
+    """Test near-duplicate search query collapsing"""
+
+    def test_collapses_reordered_queries(self):
+        """Test that reordered queries keep only the first"""
+        queries = ["Black LGBTQ UK", "UK black LGBTQ", "Black trans UK"]
+        assert _dedupe_queries(queries) == ("Black LGBTQ UK", "Black trans UK")
+
+    def test_keeps_distinct_and_operator_queries(self):
+        """Test that site: and distinct-topic queries are preserved"""
+        queries = [
+            "queer community funding UK",
+            "trans community funding UK",
+            "site:outsavvy.com Black LGBTQ",
+            "Black LGBTQ",
+        ]
+        assert _dedupe_queries(queries) == tuple(queries)
+
+    def test_exclusions_do_not_affect_similarity(self):
+        """Test that shared -exclusion suffixes don't merge distinct queries"""
+        queries = (
+            "Black queer events Manchester -wiki -wikipedia -game",
+            "BBZ London party -wiki -wikipedia -game",
+        )
+        assert _dedupe_queries(queries) == queries
+
+
+class TestGrantKeywordPatterns:
+    """Test the grant keyword automaton and category masks"""
+
+    def test_matches_same_as_substring_any(self):
+        """Test mask membership agrees with any(kw in text) per category"""
+        from configs import grants_config
+
+        texts = [
+            "funding for black queer artists, deadline soon",
+            "co-op support for worker-owned social enterprise",
+            "general environmental grant",
+        ]
+        categories = {
+            "high": grants_config.high_relevance_keywords,
+            "lgbtq": grants_config.lgbtq_keywords,
+            "black": grants_config.black_keywords,
+            "arts": grants_config.arts_keywords,
+            "community_wealth": grants_config.community_wealth_keywords,
+        }
+        for text in texts:
+            for category, keywords in categories.items():
+                expected = any(kw in text for kw in keywords)
+                mask = grants_config.grant_keyword_mask(text)
+                assert bool(mask & grants_config.GRANT_CATEGORY_MASKS[category]) == expected
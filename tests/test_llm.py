@@ -0,0 +1,109 @@
+"""
+Test suite for LLM client helpers
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.llm import LLMClient
+
+
+@pytest.fixture
+def groq_key(monkeypatch):
+    """LLMClient() builds a Groq client, which refuses to start without a key"""
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+
+
+def _item(i: int) -> dict:
+    return {
+        "title": f"Story {i}",
+        "content": f"Black queer community organisers in London announce programme number {i}",
+        "source": "Example",
+        "url": f"https://example.com/{i}",
+    }
+
+
+@pytest.mark.usefixtures("groq_key")
+class TestAnalyzeRelevanceBatch:
+    """Test scoring several candidates in one request"""
+
+    @pytest.mark.asyncio
+    async def test_results_line_up_with_items(self, tmp_path, monkeypatch):
+        """Test that scores map back by id and omitted items come back empty"""
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+        client = LLMClient()
+        client.complete_json = AsyncMock(return_value={"scores": [
+            {"id": 3, "relevance_score": 30},
+            {"id": 1, "relevance_score": 90},
+            {"id": 9, "relevance_score": 50},
+        ]})
+
+        results = await client.analyze_relevance_batch([_item(1), _item(2), _item(3)])
+
+        assert [r.get("relevance_score") for r in results] == [90, None, 30]
+        assert client.complete_json.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_items_are_not_resent(self, tmp_path, monkeypatch):
+        """Test that items answered before are served from the similarity cache"""
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+        client = LLMClient()
+        client.complete_json = AsyncMock(return_value={"scores": [
+            {"id": 1, "relevance_score": 90},
+            {"id": 2, "relevance_score": 40},
+        ]})
+        await client.analyze_relevance_batch([_item(1), _item(2)])
+
+        client.complete_json = AsyncMock(return_value={"relevance_score": 70})
+        results = await client.analyze_relevance_batch([_item(1), _item(2), _item(3)])
+
+        assert [r["relevance_score"] for r in results] == [90, 40, 70]
+        assert "Story 3" in client.complete_json.await_args.args[0]
+
+
+@pytest.mark.usefixtures("groq_key")
+class TestRelevanceBatchAPI:
+    """Test the offline (Batch API) relevance path"""
+
+    @pytest.mark.asyncio
+    async def test_submit_uploads_one_request_per_item(self, tmp_path, monkeypatch):
+        """Test that each item becomes a JSONL request keyed by its index"""
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+        client = LLMClient()
+        client.client = MagicMock()
+        client.client.files.create.return_value.id = "file_1"
+        client.client.batches.create.return_value.id = "batch_1"
+
+        assert await client.submit_relevance_batch([_item(1), _item(2)]) == "batch_1"
+
+        _, payload = client.client.files.create.call_args.kwargs["file"]
+        lines = [json.loads(line) for line in payload.splitlines()]
+        assert [line["custom_id"] for line in lines] == ["0", "1"]
+        assert lines[0]["body"]["model"] == client.fast_model
+        assert client.client.batches.create.call_args.kwargs["input_file_id"] == "file_1"
+
+    @pytest.mark.asyncio
+    async def test_fetch_waits_then_maps_results(self, tmp_path, monkeypatch):
+        """Test that a running batch returns None and a finished one maps by index"""
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+        client = LLMClient()
+        client.client = MagicMock()
+        client.client.batches.retrieve.return_value.status = "in_progress"
+
+        assert await client.fetch_relevance_batch("batch_1") is None
+
+        def line(custom_id, content):
+            return json.dumps({
+                "custom_id": custom_id,
+                "response": {"body": {"choices": [{"message": {"content": content}}]}},
+            }).encode()
+
+        client.client.batches.retrieve.return_value.status = "completed"
+        client.client.batches.retrieve.return_value.output_file_id = "file_out"
+        client.client.files.content.return_value.read.return_value = b"\n".join([
+            line("1", '{"relevance_score": 80}'),
+            line("0", "not json"),
+        ])
+
+        assert await client.fetch_relevance_batch("batch_1") == {1: {"relevance_score": 80}}
@@ -0,0 +1,85 @@
+"""
+Test suite for the on-disk LLM response cache
+"""
+
+import pytest
+
+from src.llm_cache import LLMCache
+
+
+class TestLLMCache:
+    """Test exact-match completion caching"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored response is returned for the same key"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite3"))
+        key = cache.make_key(model="m", temperature=0.3, messages=[{"role": "user", "content": "hi"}])
+        assert cache.get(key) is None
+
+        cache.set(key, "hello")
+        assert cache.get(key) == "hello"
+
+    def test_key_covers_request_parameters(self):
+        """Test that changing any parameter changes the key"""
+        base = dict(model="m", temperature=0.3, messages=[{"role": "user", "content": "hi"}])
+        key = LLMCache.make_key(**base)
+
+        assert key == LLMCache.make_key(**dict(base))
+        assert key != LLMCache.make_key(**{**base, "temperature": 0.5})
+        assert key != LLMCache.make_key(**{**base, "model": "other"})
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that responses survive a restart"""
+        path = str(tmp_path / "llm.sqlite3")
+        LLMCache(path=path).set("k", "cached")
+        assert LLMCache(path=path).get("k") == "cached"
+
+    def test_stats_count_hits_and_misses(self, tmp_path):
+        """Test that lookups are tallied for hit-rate logging"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite3"))
+        cache.get("k")
+        cache.set("k", "cached")
+        cache.get("k")
+        cache.get("k")
+
+        assert cache.stats == {"hits": 2, "similar_hits": 0, "misses": 1}
+
+    def test_expired_entries_miss(self, tmp_path):
+        """Test that entries older than the TTL are ignored"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl_seconds=-1)
+        cache.set("k", "stale")
+        assert cache.get("k") is None
+
+
+class TestLLMSimilarCache:
+    """Test the near-duplicate (SimHash) tier"""
+
+    TEXT = (
+        "UK Black Pride returns to London this summer with a bigger community programme. "
+        "Organisers say the free event in Haggerston Park will feature performances, "
+        "wellbeing spaces and stalls from Black queer and trans-led groups across the "
+        "country, with the line-up announced next month."
+    )
+
+    def test_near_identical_input_hits(self, tmp_path):
+        """Test that a lightly edited input reuses the cached response"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite3"))
+        cache.set_similar("relevance", self.TEXT, '{"relevance_score": 90}')
+
+        assert cache.get_similar("relevance", self.TEXT + " Updated") == '{"relevance_score": 90}'
+        assert cache.get_similar("dates", self.TEXT) is None
+
+    def test_unrelated_and_short_inputs_miss(self, tmp_path):
+        """Test that unrelated or too-short inputs are not matched"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite3"))
+        cache.set_similar("relevance", self.TEXT, "cached")
+
+        assert cache.get_similar("relevance", "Council budget vote delayed again after long debate in Leeds") is None
+        cache.set_similar("relevance", "Black Pride", "short")
+        assert cache.get_similar("relevance", "Black Pride") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that the similarity tier is reloaded from disk"""
+        path = str(tmp_path / "llm.sqlite3")
+        LLMCache(path=path).set_similar("relevance", self.TEXT, "cached")
+        assert LLMCache(path=path).get_similar("relevance", self.TEXT) == "cached"
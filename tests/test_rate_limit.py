@@ -0,0 +1,113 @@
+"""
+Test suite for the LLM token bucket and circuit breaker
+"""
+
+import time
+
+import pytest
+
+from src.rate_limit import CircuitBreaker, CircuitOpen, QuotaExceeded, TokenBucket, parse_reset
+
+
+class TestTokenBucket:
+    """Test request pacing and fail-fast behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_burst_up_to_capacity(self):
+        """Test that a full bucket serves `rate` requests without waiting"""
+        bucket = TokenBucket(rate=5, per=60.0)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        """Test that an empty bucket sleeps until the next token"""
+        bucket = TokenBucket(rate=20, per=1.0)
+        for _ in range(20):
+            await bucket.acquire()
+
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.03
+
+    @pytest.mark.asyncio
+    async def test_raises_when_wait_exceeds_limit(self):
+        """Test that an exhausted budget fails fast instead of blocking"""
+        bucket = TokenBucket(rate=1, per=60.0, max_wait=1.0)
+        await bucket.acquire()
+
+        start = time.monotonic()
+        with pytest.raises(QuotaExceeded):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.1
+        # The failed attempt must not eat into the next slot
+        assert bucket._tokens == pytest.approx(0, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_defer_holds_back_the_next_request(self):
+        """Test that server backpressure delays a bucket that still has tokens"""
+        bucket = TokenBucket(rate=10, per=1.0)
+        bucket.defer(0.2)
+
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.15
+
+    def test_parse_reset(self):
+        """Test Groq's reset header durations"""
+        assert parse_reset("7.66s") == pytest.approx(7.66)
+        assert parse_reset("2m59.56s") == pytest.approx(179.56)
+        assert parse_reset("120ms") == pytest.approx(0.12)
+        assert parse_reset("1h") == 3600
+
+
+class TestCircuitBreaker:
+    """Test short-circuiting after repeated failures"""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the breaker and check() raises"""
+        breaker = CircuitBreaker("Test", threshold=3, cooldown=60.0)
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.check()
+
+        breaker.record_failure()
+        assert breaker.is_open
+        with pytest.raises(CircuitOpen):
+            breaker.check()
+
+    def test_success_resets_the_count(self):
+        """Test that a success in between keeps the breaker closed"""
+        breaker = CircuitBreaker("Test", threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert not breaker.is_open
+
+    def test_lets_one_probe_through_after_cooldown(self):
+        """Test that only one caller probes a recovering backend"""
+        breaker = CircuitBreaker("Test", threshold=1, cooldown=60.0)
+        breaker.record_failure()
+        breaker._opened_at -= 60.0  # Cooldown elapsed
+
+        breaker.check()
+        with pytest.raises(CircuitOpen):
+            breaker.check()
+
+        breaker.record_success()
+        breaker.check()
+        breaker.check()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe starts a fresh cooldown"""
+        breaker = CircuitBreaker("Test", threshold=1, cooldown=60.0)
+        breaker.record_failure()
+        breaker._opened_at -= 60.0
+
+        breaker.check()
+        breaker.record_failure()
+        assert breaker.is_open
+        with pytest.raises(CircuitOpen):
+            breaker.check()
@@ -0,0 +1,138 @@
+"""
+Test suite for offline HTML parsing of scraped event platform pages
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.scraper import (
+    ScraperAgent,
+    parse_eventbrite_html,
+    parse_moonlight_html,
+    parse_platform_html,
+)
+
+
+EVENTBRITE_HTML = """
+<html><body>
+  <div data-testid="event-card">
+    <a href="/e/bbz-night-123">Tickets</a>
+    <h3> BBZ Night </h3>
+    <p data-testid="event-card-date">Sat, 7 Jan</p>
+    <p class="event-card-location">Phoenix Bar</p>
+  </div>
+  <div class="search-event-card">
+    <h3>Card without a link</h3>
+  </div>
+</body></html>
+"""
+
+
+class TestEventbriteParsing:
+    """Test Eventbrite card extraction"""
+
+    def test_extracts_card_fields(self):
+        """Test title, link, date and venue extraction"""
+        events = parse_eventbrite_html(EVENTBRITE_HTML)
+
+        assert len(events) == 1
+        event = events[0]
+        assert event.name == "BBZ Night"
+        assert event.url == "https://www.eventbrite.co.uk/e/bbz-night-123"
+        assert event.date == "Sat, 7 Jan"
+        assert event.venue == "Phoenix Bar"
+        assert event.source_platform == "Eventbrite"
+
+    def test_no_cards(self):
+        """Test a page without event cards"""
+        assert parse_eventbrite_html("<html><body><p>Nothing</p></body></html>") == []
+
+
+class TestMoonlightParsing:
+    """Test Moonlight Experiences card extraction"""
+
+    def test_extracts_linked_cards_only(self):
+        """Test that only cards with an href become events"""
+        html = """
+        <div>
+          <a href="/event/hungama">Hungama Queer Night</a>
+          <div class="experience-card">No link here</div>
+        </div>
+        """
+        events = parse_moonlight_html(html)
+
+        assert len(events) == 1
+        assert events[0].name == "Hungama Queer Night"
+        assert events[0].url == "https://www.moonlightexperiences.com/event/hungama"
+
+
+class TestPlatformParseDispatch:
+    """Test the process-pool parse entry point"""
+
+    def test_dispatches_on_platform(self):
+        """Test that page HTML is parsed by the named platform's parser"""
+        events = parse_platform_html("eventbrite", EVENTBRITE_HTML)
+        assert [e.name for e in events] == ["BBZ Night"]
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_text_survives(self):
+        """Test that titles and venues without a <meta charset> are not garbled"""
+        html = EVENTBRITE_HTML.replace("BBZ Night", "Café — Pride").replace("Phoenix Bar", "Ünity Hall")
+        events = await ScraperAgent()._parse("eventbrite", html)
+
+        assert events[0].name == "Café — Pride"
+        assert events[0].venue == "Ünity Hall"
+
+    @pytest.mark.asyncio
+    async def test_parses_in_process_pool(self):
+        """Test that parsing through a worker process returns events intact"""
+        scraper = ScraperAgent(parse_workers=1)
+        scraper._parse_pool = ProcessPoolExecutor(max_workers=1)
+        try:
+            events = await scraper._parse("eventbrite", EVENTBRITE_HTML)
+        finally:
+            scraper._parse_pool.shutdown()
+
+        assert events[0].url == "https://www.eventbrite.co.uk/e/bbz-night-123"
+
+
+class TestPagePool:
+    """Test reuse of browser pages between scrapes"""
+
+    @staticmethod
+    def _scraper(max_pages: int):
+        scraper = ScraperAgent(max_pages=max_pages)
+        scraper.context = MagicMock()
+        scraper.context.new_page = AsyncMock(side_effect=lambda: MagicMock(
+            is_closed=MagicMock(return_value=False), goto=AsyncMock(), close=AsyncMock(),
+        ))
+        return scraper
+
+    @pytest.mark.asyncio
+    async def test_pages_are_reused(self):
+        """Test that sequential and concurrent scrapes never open more than max_pages"""
+        scraper = self._scraper(max_pages=2)
+
+        async def scrape():
+            async with scraper._page():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(scrape() for _ in range(6)))
+
+        assert scraper.context.new_page.await_count == 2
+        assert len(scraper._idle_pages) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_page_is_closed_not_pooled(self):
+        """Test that a page whose scrape raised is discarded"""
+        scraper = self._scraper(max_pages=1)
+
+        with pytest.raises(ValueError):
+            async with scraper._page() as page:
+                raise ValueError("navigation failed")
+
+        page.close.assert_awaited_once()
+        assert scraper._idle_pages == []
@@ -4,7 +4,7 @@ Test suite for search result filtering and deduplication
 
 import pytest
 from typing import List, Set
-from src.search import SearchResult
+from src.search import SearchResult, canonical_url
 from tests.fixtures.sample_search_results import (
     get_sample_event_search_results,
     get_sample_news_search_results,
@@ -473,3 +473,46 @@ class TestBatchFiltering:
         filtered_titles = [r.title for r in filtered]
 
         assert filtered_titles == original_titles
+
+
+class TestMultiSearchStream:
+    """Test per-query streaming of search results"""
+
+    @pytest.mark.asyncio
+    async def test_yields_new_results_per_query(self, monkeypatch):
+        """Test that each query's batch is yielded with already-seen URLs removed"""
+        from src.search import SearchAgent
+
+        pages = {
+            "q1": [SearchResult("A", "https://a.com", "", "A"), SearchResult("B", "https://b.com", "", "B")],
+            "q2": [SearchResult("B", "https://b.com", "", "B")],
+            "q3": [SearchResult("C", "https://c.com", "", "C")],
+        }
+
+        async def fake_search(query, region, time_range):
+            return pages[query]
+
+        async def no_sleep(_):
+            pass
+
+        agent = SearchAgent()
+        monkeypatch.setattr(agent, "search", fake_search)
+        monkeypatch.setattr("src.search.asyncio.sleep", no_sleep)
+
+        batches = [
+            [r.url for r in batch]
+            async for batch in agent.multi_search_stream(["q1", "q2", "q3"])
+        ]
+
+        assert batches == [["https://a.com", "https://b.com"], ["https://c.com"]]
+        assert [r.url for r in await agent.multi_search(["q1", "q2", "q3"])] == [
+            "https://a.com", "https://b.com", "https://c.com",
+        ]
+
+    def test_canonical_url_ignores_tracking_variants(self):
+        """Test that the dedup key ignores scheme, www., fragments and tracking params"""
+        key = canonical_url("https://example.com/news/story?id=7")
+
+        assert canonical_url("http://www.Example.com/news/story/?utm_medium=social&id=7#comments") == key
+        assert canonical_url("https://example.com/news/story?id=7&fbclid=abc") == key
+        assert canonical_url("https://example.com/news/story?id=8") != key
@@ -0,0 +1,42 @@
+"""
+Test suite for environment settings validation
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from src.settings import Settings
+
+REQUIRED = {
+    "GROQ_API_KEY": "gsk_test",
+    "SUPABASE_URL": "https://example.supabase.co",
+    "SUPABASE_SERVICE_ROLE_KEY": "service-role",
+}
+
+
+class TestSettings:
+    """Test validation of required environment variables"""
+
+    @pytest.fixture(autouse=True)
+    def required_env(self, monkeypatch):
+        for name, value in REQUIRED.items():
+            monkeypatch.setenv(name, value)
+
+    def test_complete_environment_validates(self):
+        """Test that the required variables are read from the environment"""
+        settings = Settings(_env_file=None)
+        assert settings.groq_api_key == "gsk_test"
+        assert settings.supabase_service_role_key == "service-role"
+
+    @pytest.mark.parametrize("name", ["GROQ_API_KEY", "SUPABASE_SERVICE_ROLE_KEY"])
+    def test_empty_key_is_rejected(self, monkeypatch, name):
+        """Test that a key set to an empty string fails like a missing one"""
+        monkeypatch.setenv(name, "")
+        with pytest.raises(ValidationError):
+            Settings(_env_file=None)
+
+    def test_malformed_url_is_rejected(self, monkeypatch):
+        """Test that SUPABASE_URL must be a URL"""
+        monkeypatch.setenv("SUPABASE_URL", "not a url")
+        with pytest.raises(ValidationError):
+            Settings(_env_file=None)